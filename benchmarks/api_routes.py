@@ -0,0 +1,616 @@
+"""Benchmark every HTTP route and Socket.IO event over a synthetic dataset.
+
+Seeds users with friends, meals with recipes, categories, mealplans, outlines
+and shared shoppinglists, then drives each route through Flask's test client
+and each Socket.IO event through the Socket.IO test client. The JSON report
+holds latency percentiles, SQL statement counts and allocations per endpoint,
+with keys sorted so reports from two commits diff cleanly; --compare prints
+the change against an earlier report.
+
+DATABASE_URL defaults to an in-memory SQLite database, so a run needs no
+server. To benchmark Postgres, point it at a scratch database: its tables are
+dropped and recreated.
+
+Usage: python benchmarks/api_routes.py [--users N] [--friends N] [--meals N]
+       [--mealplans N] [--repeat N] [--routes PREFIX...] [--output FILE]
+       [--compare FILE]
+"""
+import argparse
+import base64
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("AUTH_USERNAME", "benchmark")
+os.environ.setdefault("AUTH_PASSWORD", "benchmark")
+os.environ.setdefault("NPLUSONE_MODE", "off")
+
+import app as backend
+from sqlalchemy import event
+from whatsfordinner import models
+from whatsfordinner.extensions import db, bcrypt
+from whatsfordinner.meal_search import refresh_meal_search
+from whatsfordinner.blueprints.mealplans import create_mealplan
+
+PASSWORD = "benchmark-password"
+CATEGORIES = ["Produce", "Dairy", "Meat", "Bakery", "Pantry", None]
+UNITS = ["cup", "cups", "tbsp", "tsp", "lb", "oz", None]
+WORDS = ["chicken", "rice", "beans", "tomato", "basil", "garlic", "onion", "pasta", "cheese", "lemon", "pepper", "salmon", "tofu", "curry", "soup"]
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+# Writes the synthetic dataset straight through the ORM so seeding does not
+# depend on the routes being measured. Fresh rows for destructive routes are
+# made the same way, outside the timed request.
+class Dataset:
+    def __init__(self, options):
+        self.options = options
+        self.rng = random.Random(options.seed)
+        self.counter = 0
+        self.session = db.session
+        self.password = bcrypt.generate_password_hash(PASSWORD).decode("utf-8")
+        self.ip = bcrypt.generate_password_hash("127.0.0.1").decode("utf-8")
+        self.users = []
+
+    def unique(self, prefix):
+        self.counter += 1
+        return f"{prefix}{self.counter}"
+
+    def words(self, count):
+        return " ".join(self.rng.choice(WORDS) for _ in range(count))
+
+    def add_user(self):
+        username = self.unique("user")
+        user = models.User(username, self.password, f"{username}@example.com")
+        self.session.add(user)
+        self.session.flush()
+        settings = models.Settings(None, False, 1, "week", "arbitrary", False, 1, "week", True, True, user.id)
+        self.session.add(settings)
+        self.session.flush()
+        record = {"id": user.id, "username": username, "settings_id": settings.id, "friends": [], "meals": [], "categories": [], "mealplans": [], "outlines": [], "notifications": []}
+        record["token"] = self.add_session(record)
+        return record
+
+    def add_session(self, user):
+        token = self.unique("token")
+        self.session.add(models.Session(token, self.ip, user["id"]))
+        self.session.flush()
+        return token
+
+    def add_friendship(self, user, friend):
+        self.session.execute(models.friends_table.insert(), [{"user_id": user["id"], "friend_id": friend["id"]}, {"user_id": friend["id"], "friend_id": user["id"]}])
+        user["friends"].append(friend)
+        friend["friends"].append(user)
+
+    def add_friend_request(self, user, friend):
+        self.session.execute(models.outgoing_friend_requests_table.insert(), [{"user_id": user["id"], "friend_id": friend["id"]}])
+        self.session.execute(models.incoming_friend_requests_table.insert(), [{"user_id": friend["id"], "friend_id": user["id"]}])
+
+    def add_meal(self, user, recipe=True):
+        meal = models.Meal(self.unique(self.words(2).title() + " "), self.words(8), "", self.rng.randint(1, 5), user["username"], user["username"], user["id"])
+        self.session.add(meal)
+        self.session.flush()
+        record = {"id": meal.id, "user": user}
+        if recipe:
+            self.add_recipe(record)
+        return record
+
+    def add_recipe(self, meal):
+        recipe = models.Recipe(meal["id"])
+        self.session.add(recipe)
+        self.session.flush()
+        stepsection = models.Stepsection("Steps", recipe.id)
+        ingredientsection = models.Ingredientsection("Ingredients", recipe.id)
+        self.session.add_all([stepsection, ingredientsection])
+        self.session.flush()
+        self.session.add_all([models.Ingredient(self.words(1), str(self.rng.randint(1, 4)), self.rng.choice(UNITS), self.rng.choice(CATEGORIES), recipe.id, ingredientsection.id) for _ in range(self.options.ingredients)])
+        self.session.add_all([models.Step(number, self.words(12), recipe.id, stepsection.id) for number in range(1, self.options.steps + 1)])
+        self.session.flush()
+        meal.update(recipe_id=recipe.id, stepsection_id=stepsection.id, ingredientsection_id=ingredientsection.id)
+        return recipe.id
+
+    def add_category(self, user):
+        category = models.Category(self.unique("Category "), user["id"])
+        self.session.add(category)
+        self.session.flush()
+        return category.id
+
+    def attach_category(self, category_id, meal_id):
+        self.session.execute(models.categories_table.insert(), [{"meal_id": meal_id, "category_id": category_id}])
+
+    def add_notification(self, user):
+        notification = models.Notification("friend", self.rng.choice(self.users or [user])["username"], None, user["id"])
+        self.session.add(notification)
+        self.session.flush()
+        return notification.id
+
+    def add_mealplan(self, user, created_on=None):
+        meal_ids = [meal["id"] for meal in self.rng.sample(user["meals"], min(self.options.meals_per_plan, len(user["meals"])))]
+        mealplan = create_mealplan(self.unique("Mealplan "), created_on or datetime.utcnow(), user["username"], user["id"], meal_ids, {})
+        return {"id": mealplan.id, "shoppinglist_id": mealplan.shoppinglists[0].id, "meal_ids": meal_ids}
+
+    def add_outline(self, user):
+        outline = models.Mealplanoutline(self.unique("Outline "), self.options.meals_per_plan, user["id"])
+        self.session.add(outline)
+        self.session.flush()
+        rule = models.Rule("difficulty", "at most", 2, "3", None, outline.id)
+        self.session.add(rule)
+        self.session.flush()
+        return {"id": outline.id, "rule_id": rule.id}
+
+    def share(self, table, column, record_id, user):
+        self.session.execute(table.insert(), [{"user_id": user["id"], column: record_id}])
+
+    def add_shoppingingredient(self, shoppinglist_id):
+        record = models.Shoppingingredient(self.words(1), "1", self.rng.choice(UNITS), self.rng.choice(CATEGORIES), 1, None, shoppinglist_id, None)
+        self.session.add(record)
+        self.session.flush()
+        return record.id
+
+    def first_shoppingingredient(self, shoppinglist_id):
+        return self.session.query(models.Shoppingingredient.id).filter(models.Shoppingingredient.shoppinglist_id == shoppinglist_id).order_by(models.Shoppingingredient.id).first()[0]
+
+    def seed(self):
+        options = self.options
+        for _ in range(options.users):
+            self.users.append(self.add_user())
+        for index, user in enumerate(self.users):
+            for offset in range(1, options.friends + 1):
+                friend = self.users[(index + offset) % len(self.users)]
+                if friend is not user and friend not in user["friends"]:
+                    self.add_friendship(user, friend)
+        self.session.commit()
+
+        for user in self.users:
+            user["categories"] = [self.add_category(user) for _ in range(options.categories)]
+            user["meals"] = [self.add_meal(user) for _ in range(options.meals)]
+            for meal in user["meals"]:
+                for category_id in self.rng.sample(user["categories"], min(2, len(user["categories"]))):
+                    self.attach_category(category_id, meal["id"])
+            user["outlines"] = [self.add_outline(user)]
+            user["notifications"] = [self.add_notification(user) for _ in range(options.notifications)]
+            self.session.commit()
+
+            start = datetime.utcnow() - timedelta(weeks=options.mealplans)
+            user["mealplans"] = [self.add_mealplan(user, start + timedelta(weeks=week)) for week in range(options.mealplans)]
+            for mealplan in user["mealplans"][:options.shared]:
+                for friend in user["friends"]:
+                    self.share(models.shared_mealplans_table, "mealplan_id", mealplan["id"], friend)
+                    self.share(models.shared_shoppinglists_table, "shoppinglist_id", mealplan["shoppinglist_id"], friend)
+            for meal in user["meals"][:options.shared]:
+                for friend in user["friends"]:
+                    self.share(models.shared_meals_table, "meal_id", meal["id"], friend)
+            self.session.commit()
+
+        refresh_meal_search(*[meal["id"] for user in self.users for meal in user["meals"]])
+        self.session.commit()
+
+    def user(self):
+        return self.rng.choice(self.users)
+
+    def friend_pair(self):
+        user = self.rng.choice([user for user in self.users if len(user["friends"]) > 0])
+        return user, self.rng.choice(user["friends"])
+
+    def meal(self, user=None):
+        return self.rng.choice((user or self.user())["meals"])
+
+    def mealplan(self, user=None):
+        return self.rng.choice((user or self.user())["mealplans"])
+
+
+# One entry per route variant: (method, rule, label, build). build runs
+# untimed and returns (path, json body or None); destructive routes get fresh
+# rows from the Dataset each time.
+def route_specs(data):
+    rng = data.rng
+
+    def fresh_meal_owner():
+        user = data.user()
+        return user, data.add_meal(user)
+
+    def shared_meal():
+        user, friend = data.friend_pair()
+        meal = data.add_meal(user)
+        data.share(models.shared_meals_table, "meal_id", meal["id"], friend)
+        return meal, friend
+
+    def fresh_mealplan():
+        user, friend = data.friend_pair()
+        return user, friend, data.add_mealplan(user)
+
+    def shared_mealplan():
+        user, friend, mealplan = fresh_mealplan()
+        data.share(models.shared_mealplans_table, "mealplan_id", mealplan["id"], friend)
+        data.share(models.shared_shoppinglists_table, "shoppinglist_id", mealplan["shoppinglist_id"], friend)
+        return mealplan, friend
+
+    def shared_shoppinglist():
+        user, friend, mealplan = fresh_mealplan()
+        data.share(models.shared_shoppinglists_table, "shoppinglist_id", mealplan["shoppinglist_id"], friend)
+        return mealplan, friend
+
+    def friend_request(reverse=False):
+        user, friend = data.add_user(), data.add_user()
+        if reverse:
+            data.add_friend_request(friend, user)
+        else:
+            data.add_friend_request(user, friend)
+        return f"{user['id']}/{friend['id']}"
+
+    def friendship():
+        user, friend = data.add_user(), data.add_user()
+        data.add_friendship(user, friend)
+        return f"{user['id']}/{friend['id']}"
+
+    def attached_category():
+        user = data.user()
+        category_id = data.add_category(user)
+        meal = data.meal(user)
+        data.attach_category(category_id, meal["id"])
+        return {"category_id": category_id, "meal_id": meal["id"]}
+
+    def user_with_notifications():
+        user = data.add_user()
+        for _ in range(data.options.notifications):
+            data.add_notification(user)
+        return user
+
+    def meal_body(user):
+        return {"name": data.unique("Meal "), "description": data.words(8), "image_url": "", "difficulty": rng.randint(1, 5), "owner_username": user["username"], "user_id": user["id"]}
+
+    def ingredient_body(meal):
+        return {"name": data.words(1), "amount": "2", "unit": rng.choice(UNITS), "category": rng.choice(CATEGORIES), "recipe_id": meal["recipe_id"], "ingredientsection_id": meal["ingredientsection_id"]}
+
+    def shoppingingredient_body():
+        return {"name": data.words(1), "amount": "1", "unit": rng.choice(UNITS), "category": rng.choice(CATEGORIES), "multiplier": 1, "meal_name": None, "shoppinglist_id": data.mealplan()["shoppinglist_id"], "ingredient_id": None}
+
+    return [
+        ("POST", "/user/add", "", lambda: ("/user/add", {"username": data.unique("newuser"), "password": PASSWORD, "email": "new@example.com"})),
+        ("POST", "/user/login", "", lambda: ("/user/login", {"username": data.user()["username"], "password": PASSWORD})),
+        ("POST", "/user/friend/request", "", lambda: ("/user/friend/request", {"user_id": data.user()["id"], "friend_username": data.add_user()["username"]})),
+        ("GET", "/user/get", "", lambda: ("/user/get", None)),
+        ("GET", "/user/get/id/<id>", "", lambda: (f"/user/get/id/{data.user()['id']}", None)),
+        ("GET", "/user/get/token/<token>", "", lambda: (f"/user/get/token/{data.user()['token']}", None)),
+        ("PUT", "/user/update/<id>", "", lambda: (f"/user/update/{data.user()['id']}", {"email": f"{data.unique('email')}@example.com"})),
+        ("DELETE", "/user/delete/<id>", "", lambda: (f"/user/delete/{data.add_user()['id']}", None)),
+        ("DELETE", "/user/logout/single/<token>", "", lambda: (f"/user/logout/single/{data.add_session(data.user())}", None)),
+        ("DELETE", "/user/logout/all/<id>", "", lambda: (f"/user/logout/all/{data.add_user()['id']}", None)),
+        ("DELETE", "/user/friend/cancel/<id>/<friend_id>", "", lambda: (f"/user/friend/cancel/{friend_request()}", None)),
+        ("DELETE", "/user/friend/accept/<id>/<friend_id>", "", lambda: (f"/user/friend/accept/{friend_request(reverse=True)}", None)),
+        ("DELETE", "/user/friend/reject/<id>/<friend_id>", "", lambda: (f"/user/friend/reject/{friend_request(reverse=True)}", None)),
+        ("DELETE", "/user/friend/delete/<id>/<friend_id>", "", lambda: (f"/user/friend/delete/{friendship()}", None)),
+
+        ("GET", "/settings/get", "", lambda: ("/settings/get", None)),
+        ("GET", "/settings/get/<id>", "", lambda: (f"/settings/get/{data.user()['settings_id']}", None)),
+        ("PUT", "/settings/update/<id>", "", lambda: (f"/settings/update/{data.user()['settings_id']}", {"default_shoppinglist_sort": rng.choice(["arbitrary", "category", "alphabetical"])})),
+
+        ("POST", "/notification/add", "", lambda: ("/notification/add", {"category": "friend", "username": data.user()["username"], "name": None, "user_id": data.user()["id"]})),
+        ("GET", "/notification/get", "", lambda: ("/notification/get", None)),
+        ("GET", "/notification/get/<id>", "", lambda: (f"/notification/get/{rng.choice(data.user()['notifications'])}", None)),
+        ("DELETE", "/notification/delete/single/<id>", "", lambda: (f"/notification/delete/single/{data.add_notification(data.user())}", None)),
+        ("DELETE", "/notification/delete/all/<user_id>", "", lambda: (f"/notification/delete/all/{user_with_notifications()['id']}", None)),
+
+        ("POST", "/meal/add", "", lambda: ("/meal/add", meal_body(data.user()))),
+        ("POST", "/meal/share", "", lambda: (lambda pair: ("/meal/share", {"meal_id": data.add_meal(pair[0])["id"], "username": pair[1]["username"]}))(data.friend_pair())),
+        ("GET", "/meal/get", "", lambda: ("/meal/get", None)),
+        ("GET", "/meal/get", "?user_id", lambda: (f"/meal/get?user_id={data.user()['id']}", None)),
+        ("GET", "/meal/get/category", "", lambda: (lambda user: (f"/meal/get/category?user_id={user['id']}&any={','.join(str(category_id) for category_id in user['categories'][:2])}", None))(data.user())),
+        ("GET", "/meal/get/recency", "", lambda: (f"/meal/get/recency?user_id={data.user()['id']}&limit=20", None)),
+        ("GET", "/search", "", lambda: (f"/search?user_id={data.user()['id']}&q={rng.choice(WORDS)}", None)),
+        ("GET", "/meal/get/<id>", "", lambda: (f"/meal/get/{data.meal()['id']}", None)),
+        ("PUT", "/meal/update/<id>", "", lambda: (lambda meal: (f"/meal/update/{meal['id']}", {"name": data.unique("Meal "), "description": data.words(8), "difficulty": rng.randint(1, 5), "image_url": "", "sleep_until": None}))(data.meal())),
+        ("DELETE", "/meal/delete/<id>", "", lambda: (f"/meal/delete/{fresh_meal_owner()[1]['id']}", None)),
+        ("DELETE", "/meal/unshare/<id>/<user_id>", "", lambda: (lambda pair: (f"/meal/unshare/{pair[0]['id']}/{pair[1]['id']}", None))(shared_meal())),
+
+        ("POST", "/category/add", "", lambda: ("/category/add", {"name": data.unique("Category "), "user_id": data.user()["id"]})),
+        ("POST", "/category/add/multiple", "", lambda: (lambda user: ("/category/add/multiple", [{"name": data.unique("Category "), "user_id": user["id"]} for _ in range(3)]))(data.user())),
+        ("POST", "/category/attach", "", lambda: (lambda user: ("/category/attach", {"category_id": data.add_category(user), "meal_id": data.meal(user)["id"]}))(data.user())),
+        ("POST", "/category/attach/multiple", "", lambda: (lambda user: ("/category/attach/multiple", [{"category_id": data.add_category(user), "meal_id": data.meal(user)["id"]} for _ in range(3)]))(data.user())),
+        ("GET", "/category/get", "", lambda: ("/category/get", None)),
+        ("GET", "/category/get/<id>", "", lambda: (f"/category/get/{rng.choice(data.user()['categories'])}", None)),
+        ("PUT", "/category/update/<id>", "", lambda: (f"/category/update/{rng.choice(data.user()['categories'])}", {"name": data.unique("Category ")})),
+        ("DELETE", "/category/unattach", "", lambda: ("/category/unattach", attached_category())),
+        ("DELETE", "/category/unattach/multiple", "", lambda: ("/category/unattach/multiple", [attached_category() for _ in range(3)])),
+        ("DELETE", "/category/delete/<id>", "", lambda: (f"/category/delete/{data.add_category(data.user())}", None)),
+
+        ("POST", "/recipe/add", "", lambda: ("/recipe/add", {"meal_id": data.add_meal(data.user(), recipe=False)["id"]})),
+        ("GET", "/recipe/get", "", lambda: ("/recipe/get", None)),
+        ("GET", "/recipe/get/<id>", "", lambda: (f"/recipe/get/{data.meal()['recipe_id']}", None)),
+        ("DELETE", "/recipe/delete/<id>", "", lambda: (f"/recipe/delete/{fresh_meal_owner()[1]['recipe_id']}", None)),
+
+        ("POST", "/stepsection/add", "", lambda: ("/stepsection/add", {"title": data.words(2), "recipe_id": data.meal()["recipe_id"]})),
+        ("POST", "/stepsection/add/multiple", "", lambda: (lambda meal: ("/stepsection/add/multiple", [{"title": data.words(2), "recipe_id": meal["recipe_id"]} for _ in range(3)]))(data.meal())),
+        ("GET", "/stepsection/get", "", lambda: ("/stepsection/get", None)),
+        ("GET", "/stepsection/get/<id>", "", lambda: (f"/stepsection/get/{data.meal()['stepsection_id']}", None)),
+        ("PUT", "/stepsection/update/<id>", "", lambda: (f"/stepsection/update/{data.meal()['stepsection_id']}", {"title": data.words(2)})),
+        ("DELETE", "/stepsection/delete/<id>", "", lambda: (f"/stepsection/delete/{fresh_meal_owner()[1]['stepsection_id']}", None)),
+
+        ("POST", "/step/add", "", lambda: (lambda meal: ("/step/add", {"number": data.options.steps + 1, "text": data.words(12), "recipe_id": meal["recipe_id"], "stepsection_id": meal["stepsection_id"]}))(data.meal())),
+        ("POST", "/step/add/multiple", "", lambda: (lambda meal: ("/step/add/multiple", [{"number": number, "text": data.words(12), "recipe_id": meal["recipe_id"], "stepsection_id": meal["stepsection_id"]} for number in range(1, 4)]))(data.meal())),
+        ("GET", "/step/get", "", lambda: ("/step/get", None)),
+        ("GET", "/step/get/<id>", "", lambda: (f"/step/get/{data.session.query(models.Step.id).filter(models.Step.recipe_id == data.meal()['recipe_id']).first()[0]}", None)),
+        ("PUT", "/step/update/<id>", "", lambda: (f"/step/update/{data.session.query(models.Step.id).filter(models.Step.recipe_id == data.meal()['recipe_id']).first()[0]}", {"number": 1, "text": data.words(12)})),
+        ("DELETE", "/step/delete/<id>", "", lambda: (f"/step/delete/{data.session.query(models.Step.id).filter(models.Step.recipe_id == fresh_meal_owner()[1]['recipe_id']).first()[0]}", None)),
+
+        ("POST", "/ingredientsection/add", "", lambda: ("/ingredientsection/add", {"title": data.words(2), "recipe_id": data.meal()["recipe_id"]})),
+        ("POST", "/ingredientsection/add/multiple", "", lambda: (lambda meal: ("/ingredientsection/add/multiple", [{"title": data.words(2), "recipe_id": meal["recipe_id"]} for _ in range(3)]))(data.meal())),
+        ("GET", "/ingredientsection/get", "", lambda: ("/ingredientsection/get", None)),
+        ("GET", "/ingredientsection/get/<id>", "", lambda: (f"/ingredientsection/get/{data.meal()['ingredientsection_id']}", None)),
+        ("PUT", "/ingredientsection/update/<id>", "", lambda: (f"/ingredientsection/update/{data.meal()['ingredientsection_id']}", {"title": data.words(2)})),
+        ("DELETE", "/ingredientsection/delete/<id>", "", lambda: (f"/ingredientsection/delete/{fresh_meal_owner()[1]['ingredientsection_id']}", None)),
+
+        ("POST", "/ingredient/add", "", lambda: ("/ingredient/add", ingredient_body(data.meal()))),
+        ("POST", "/ingredient/add/multiple", "", lambda: (lambda meal: ("/ingredient/add/multiple", [ingredient_body(meal) for _ in range(3)]))(data.meal())),
+        ("GET", "/ingredient/get", "", lambda: ("/ingredient/get", None)),
+        ("GET", "/ingredient/get/<id>", "", lambda: (f"/ingredient/get/{data.session.query(models.Ingredient.id).filter(models.Ingredient.recipe_id == data.meal()['recipe_id']).first()[0]}", None)),
+        ("PUT", "/ingredient/update/<id>", "", lambda: (f"/ingredient/update/{data.session.query(models.Ingredient.id).filter(models.Ingredient.recipe_id == data.meal()['recipe_id']).first()[0]}", {"name": data.words(1), "amount": "3", "unit": rng.choice(UNITS), "category": rng.choice(CATEGORIES)})),
+        ("DELETE", "/ingredient/delete/<id>", "", lambda: (f"/ingredient/delete/{data.session.query(models.Ingredient.id).filter(models.Ingredient.recipe_id == fresh_meal_owner()[1]['recipe_id']).first()[0]}", None)),
+
+        ("POST", "/mealplan/add", "", lambda: (lambda user: ("/mealplan/add", {"name": data.unique("Mealplan "), "user_username": user["username"], "user_id": user["id"], "meals": [meal["id"] for meal in rng.sample(user["meals"], min(data.options.meals_per_plan, len(user["meals"])))], "multipliers": {}}))(data.user())),
+        ("POST", "/mealplan/generate", "", lambda: ("/mealplan/generate", {"user_id": data.user()["id"], "number": data.options.meals_per_plan, "seed": rng.randint(0, 1000), "persist": False})),
+        ("POST", "/mealplan/share", "", lambda: (lambda plan: ("/mealplan/share", {"mealplan_id": plan[2]["id"], "username": plan[1]["username"]}))(fresh_mealplan())),
+        ("POST", "/mealplan/meal/add", "", lambda: (lambda plan: ("/mealplan/meal/add", {"mealplan_id": plan[2]["id"], "meal_id": data.meal(plan[0])["id"], "multiplier": 2}))(fresh_mealplan())),
+        ("GET", "/mealplan/get", "", lambda: ("/mealplan/get", None)),
+        ("GET", "/mealplan/get", "?user_id", lambda: (f"/mealplan/get?user_id={data.user()['id']}", None)),
+        ("GET", "/mealplan/get/<id>", "", lambda: (f"/mealplan/get/{data.mealplan()['id']}", None)),
+        ("PUT", "/mealplan/update/<id>", "", lambda: (f"/mealplan/update/{data.mealplan()['id']}", {"name": data.unique("Mealplan ")})),
+        ("DELETE", "/mealplan/delete/<id>", "", lambda: (f"/mealplan/delete/{fresh_mealplan()[2]['id']}", None)),
+        ("DELETE", "/mealplan/unshare/<id>/<user_id>", "", lambda: (lambda pair: (f"/mealplan/unshare/{pair[0]['id']}/{pair[1]['id']}", None))(shared_mealplan())),
+        ("DELETE", "/mealplan/meal/delete", "", lambda: (lambda plan: ("/mealplan/meal/delete", {"mealplan_id": plan[2]["id"], "meal_id": plan[2]["meal_ids"][0]}))(fresh_mealplan())),
+
+        ("POST", "/mealplanoutline/add", "", lambda: ("/mealplanoutline/add", {"name": data.unique("Outline "), "number": data.options.meals_per_plan, "user_id": data.user()["id"]})),
+        ("POST", "/mealplanoutline/instantiate/<id>", "", lambda: (f"/mealplanoutline/instantiate/{data.user()['outlines'][0]['id']}", {"seed": rng.randint(0, 1000)})),
+        ("GET", "/mealplanoutline/get", "", lambda: ("/mealplanoutline/get", None)),
+        ("GET", "/mealplanoutline/get/<id>", "", lambda: (f"/mealplanoutline/get/{data.user()['outlines'][0]['id']}", None)),
+        ("PUT", "/mealplanoutline/update/<id>", "", lambda: (f"/mealplanoutline/update/{data.user()['outlines'][0]['id']}", {"name": data.unique("Outline "), "number": data.options.meals_per_plan})),
+        ("DELETE", "/mealplanoutline/delete/<id>", "", lambda: (f"/mealplanoutline/delete/{data.add_outline(data.user())['id']}", None)),
+
+        ("POST", "/rule/add", "", lambda: ("/rule/add", {"rule_type": "difficulty", "rule": "at least", "amount": 1, "value": "2", "mealplan_id": None, "mealplanoutline_id": data.user()["outlines"][0]["id"]})),
+        ("GET", "/rule/get", "", lambda: ("/rule/get", None)),
+        ("GET", "/rule/get/<id>", "", lambda: (f"/rule/get/{data.user()['outlines'][0]['rule_id']}", None)),
+        ("PUT", "/rule/update/<id>", "", lambda: (f"/rule/update/{data.user()['outlines'][0]['rule_id']}", {"rule_type": "difficulty", "rule": "at most", "amount": 2, "value": "3"})),
+        ("DELETE", "/rule/delete/<id>", "", lambda: (f"/rule/delete/{data.add_outline(data.user())['rule_id']}", None)),
+
+        ("POST", "/shoppinglist/add", "", lambda: (lambda user: ("/shoppinglist/add", {"name": data.unique("List "), "updates_hidden": False, "is_sublist": False, "user_username": user["username"], "user_id": user["id"], "mealplan_id": None}))(data.user())),
+        ("POST", "/shoppinglist/share", "", lambda: (lambda plan: ("/shoppinglist/share", {"shoppinglist_id": plan[2]["shoppinglist_id"], "username": plan[1]["username"]}))(fresh_mealplan())),
+        ("GET", "/shoppinglist/get", "", lambda: ("/shoppinglist/get", None)),
+        ("GET", "/shoppinglist/get", "?items=false", lambda: (f"/shoppinglist/get?user_id={data.user()['id']}&items=false", None)),
+        ("GET", "/shoppinglist/summary", "", lambda: (f"/shoppinglist/summary?user_id={data.user()['id']}", None)),
+        ("GET", "/shoppinglist/get/<id>", "", lambda: (f"/shoppinglist/get/{data.mealplan()['shoppinglist_id']}", None)),
+        ("GET", "/shoppinglist/get/<id>", "?sort=category", lambda: (f"/shoppinglist/get/{data.mealplan()['shoppinglist_id']}?sort=category", None)),
+        ("GET", "/shoppinglist/consolidated/<id>", "", lambda: (f"/shoppinglist/consolidated/{data.mealplan()['shoppinglist_id']}", None)),
+        ("PUT", "/shoppinglist/update/<id>", "", lambda: (f"/shoppinglist/update/{data.mealplan()['shoppinglist_id']}", {"name": data.unique("List "), "updates_hidden": False})),
+        ("DELETE", "/shoppinglist/delete/<id>", "", lambda: (f"/shoppinglist/delete/{fresh_mealplan()[2]['shoppinglist_id']}", None)),
+        ("DELETE", "/shoppinglist/unshare/<id>/<user_id>", "", lambda: (lambda pair: (f"/shoppinglist/unshare/{pair[0]['shoppinglist_id']}/{pair[1]['id']}", None))(shared_shoppinglist())),
+
+        ("POST", "/shoppingingredient/add", "", lambda: ("/shoppingingredient/add", shoppingingredient_body())),
+        ("POST", "/shoppingingredient/add/multiple", "", lambda: ("/shoppingingredient/add/multiple", [shoppingingredient_body() for _ in range(3)])),
+        ("GET", "/shoppingingredient/get", "", lambda: ("/shoppingingredient/get", None)),
+        ("GET", "/shoppingingredient/get/<id>", "", lambda: (f"/shoppingingredient/get/{data.first_shoppingingredient(data.mealplan()['shoppinglist_id'])}", None)),
+        ("PUT", "/shoppingingredient/update/<id>", "", lambda: (f"/shoppingingredient/update/{data.first_shoppingingredient(data.mealplan()['shoppinglist_id'])}", {"obtained": rng.random() < 0.5})),
+        ("DELETE", "/shoppingingredient/delete/<id>", "", lambda: (f"/shoppingingredient/delete/{data.add_shoppingingredient(data.mealplan()['shoppinglist_id'])}", None)),
+
+        ("GET", "/socket/stats", "", lambda: ("/socket/stats", None)),
+        ("GET", "/db/stats", "", lambda: ("/db/stats", None)),
+        ("GET", "/metrics", "", lambda: ("/metrics", None)),
+        ("GET", "/autodelete/stats", "", lambda: ("/autodelete/stats", None))
+    ]
+
+
+# (event, build) pairs for the Socket.IO handlers, answered through acks.
+def socket_specs(data):
+    return [
+        ("resume", lambda: {"last_seq": 0}),
+        ("shoppingingredient:toggle", lambda: {"id": data.first_shoppingingredient(data.mealplan()["shoppinglist_id"]), "obtained": data.rng.random() < 0.5}),
+        ("shoppingingredient:update", lambda: {"id": data.first_shoppingingredient(data.mealplan()["shoppinglist_id"]), "amount": str(data.rng.randint(1, 4))}),
+        ("shoppingingredient:delete", lambda: {"id": data.add_shoppingingredient(data.mealplan()["shoppinglist_id"])})
+    ]
+
+
+class StatementCounter:
+    def __init__(self, engine):
+        self.count = 0
+        event.listen(engine, "after_cursor_execute", self.record)
+
+    def record(self, *args):
+        self.count += 1
+
+
+def measure(run, build, options, counter, commit):
+    timings = []
+    statements = []
+    failures = 0
+    for iteration in range(options.warmup + options.repeat):
+        arguments = build()
+        commit()
+        counter.count = 0
+        started = time.perf_counter()
+        ok = run(*arguments)
+        elapsed = time.perf_counter() - started
+        if iteration >= options.warmup:
+            timings.append(elapsed)
+            statements.append(counter.count)
+            failures += 0 if ok else 1
+
+    # Allocations are measured on one extra request so tracing does not skew
+    # the timings above.
+    arguments = build()
+    commit()
+    tracemalloc.start()
+    run(*arguments)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "latency_ms": {
+            "min": round(min(timings) * 1000, 3),
+            "p50": round(percentile(timings, 0.5) * 1000, 3),
+            "p90": round(percentile(timings, 0.9) * 1000, 3),
+            "p99": round(percentile(timings, 0.99) * 1000, 3),
+            "max": round(max(timings) * 1000, 3)
+        },
+        "statements": {
+            "min": min(statements),
+            "max": max(statements),
+            "mean": round(sum(statements) / len(statements), 2)
+        },
+        "allocations": {
+            "peak_bytes": peak,
+            "retained_bytes": retained
+        },
+        "failures": failures
+    }
+
+
+def is_ok(response):
+    if response.status_code != 200:
+        return False
+    body = response.get_json(silent=True)
+    return not isinstance(body, dict) or body.get("status", 200) == 200
+
+
+def get_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(options):
+    flask_app = backend.app
+    with flask_app.app_context():
+        db.drop_all(bind_key=None)
+        db.create_all(bind_key=None)
+
+        data = Dataset(options)
+        started = time.perf_counter()
+        data.seed()
+        seed_seconds = time.perf_counter() - started
+
+        auth = {"username": os.environ["AUTH_USERNAME"], "password": os.environ["AUTH_PASSWORD"]}
+        client = flask_app.test_client()
+        client.environ_base["HTTP_AUTHORIZATION"] = "Basic " + base64.b64encode(f"{auth['username']}:{auth['password']}".encode("utf-8")).decode("ascii")
+        # Passive listeners so every broadcast fans out to real connections.
+        listeners = [backend.socketio.test_client(flask_app, auth=auth) for _ in range(options.listeners)]
+        socket_client = backend.socketio.test_client(flask_app, auth=auth)
+        counter = StatementCounter(db.engine)
+
+        def commit():
+            db.session.commit()
+            for listener in listeners:
+                listener.get_received()
+
+        results = {}
+        covered = set()
+        for method, rule, label, build in route_specs(data):
+            key = f"{method} {rule}{label}"
+            if options.routes and not any(key.split(" ", 1)[1].startswith(prefix) for prefix in options.routes):
+                continue
+            covered.add((method, rule))
+            results[key] = measure(lambda path, body, method=method: is_ok(client.open(path, method=method, json=body)), build, options, counter, commit)
+            print(f"{key:55} p50 {results[key]['latency_ms']['p50']:9.3f}ms  {results[key]['statements']['mean']:7.1f} statements")
+
+        def emit(event_name, payload):
+            ack = socket_client.emit(event_name, payload, callback=True)
+            return isinstance(ack, dict) and ack.get("status") == 200
+
+        socket_results = {}
+        if not options.routes:
+            for event_name, build in socket_specs(data):
+                socket_results[event_name] = measure(emit, lambda event_name=event_name, build=build: (event_name, build()), options, counter, commit)
+                print(f"{'socket ' + event_name:55} p50 {socket_results[event_name]['latency_ms']['p50']:9.3f}ms  {socket_results[event_name]['statements']['mean']:7.1f} statements")
+
+        unbenchmarked = sorted(
+            f"{method} {rule.rule}"
+            for rule in flask_app.url_map.iter_rules() if rule.endpoint != "static"
+            for method in rule.methods - {"HEAD", "OPTIONS"}
+            if (method, rule.rule) not in covered
+        )
+
+        socket_client.disconnect()
+        for listener in listeners:
+            listener.disconnect()
+        database = db.engine.dialect.name
+
+    return {
+        "meta": {
+            "commit": get_commit(),
+            "python": platform.python_version(),
+            "database": database,
+            "dataset": {key: getattr(options, key) for key in ("seed", "users", "friends", "meals", "ingredients", "steps", "categories", "mealplans", "meals_per_plan", "shared", "notifications")},
+            "repeat": options.repeat,
+            "warmup": options.warmup,
+            "listeners": options.listeners,
+            "seed_seconds": round(seed_seconds, 3)
+        },
+        "routes": results,
+        "socket_events": socket_results,
+        "unbenchmarked": [] if options.routes else unbenchmarked
+    }
+
+
+def compare(report, previous):
+    for section in ("routes", "socket_events"):
+        for key, result in sorted(report[section].items()):
+            before = previous.get(section, {}).get(key)
+            if before is None:
+                continue
+            p50, old_p50 = result["latency_ms"]["p50"], before["latency_ms"]["p50"]
+            change = (p50 - old_p50) / old_p50 * 100 if old_p50 > 0 else 0.0
+            print(f"{key:55} p50 {old_p50:9.3f} -> {p50:9.3f}ms ({change:+6.1f}%)  statements {before['statements']['mean']:7.1f} -> {result['statements']['mean']:7.1f}")
+
+
+def add_dataset_arguments(parser):
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--friends", type=int, default=3)
+    parser.add_argument("--meals", type=int, default=30, help="meals per user")
+    parser.add_argument("--ingredients", type=int, default=8, help="ingredients per recipe")
+    parser.add_argument("--steps", type=int, default=5, help="steps per recipe")
+    parser.add_argument("--categories", type=int, default=6, help="categories per user")
+    parser.add_argument("--mealplans", type=int, default=8, help="mealplans per user, one per week")
+    parser.add_argument("--meals-per-plan", type=int, default=7)
+    parser.add_argument("--shared", type=int, default=2, help="meals and mealplans each user shares with every friend")
+    parser.add_argument("--notifications", type=int, default=5, help="notifications per user")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark every route over a synthetic dataset.")
+    add_dataset_arguments(parser)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--listeners", type=int, default=2, help="passive Socket.IO clients receiving broadcasts")
+    parser.add_argument("--routes", nargs="*", default=[], help="only run routes starting with these prefixes")
+    parser.add_argument("--output", default="benchmark-report.json")
+    parser.add_argument("--compare", help="earlier report to compare against")
+    options = parser.parse_args()
+
+    report = run(options)
+    with open(options.output, "w") as output:
+        json.dump(report, output, indent=2, sort_keys=True)
+        output.write("\n")
+    print(f"Wrote {options.output}")
+    if len(report["unbenchmarked"]) > 0:
+        print(f"Not benchmarked: {', '.join(report['unbenchmarked'])}")
+
+    if options.compare:
+        with open(options.compare) as previous:
+            compare(report, json.load(previous))
+
+
+if __name__ == "__main__":
+    main()
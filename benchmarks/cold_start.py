@@ -0,0 +1,99 @@
+"""Measure cold start: the time to import an entry point and build the app.
+
+Every run starts a fresh interpreter, imports the entry module (which builds
+the app at import time, as gunicorn and the serverless runtime do) and reports
+how long that took and how many modules it loaded. The entry points are
+app.py (gunicorn, with Socket.IO) and serverless.py (no Socket.IO). With
+--ref the same is measured for an older commit, extracted with git archive,
+so the report shows the improvement over it.
+
+No database connection is opened, but DATABASE_URL has to parse; it defaults
+to a local Postgres URL, which needs psycopg2 installed.
+
+Usage: python benchmarks/cold_start.py [--runs N] [--entry MODULE...]
+       [--ref REV] [--output FILE]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import {entry}
+elapsed = time.perf_counter() - started
+print(json.dumps({{"seconds": elapsed, "modules": len(sys.modules), "socketio": "flask_socketio" in sys.modules}}))
+"""
+
+
+def probe(tree, entry):
+    env = dict(os.environ)
+    env.setdefault("DATABASE_URL", "postgresql://benchmark@localhost/benchmark")
+    result = subprocess.run([sys.executable, "-c", PROBE.format(entry=entry)], cwd=tree, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"importing {entry} in {tree} failed:\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def measure(tree, entry, runs):
+    # One untimed run first so every timed run sees cached bytecode and warm OS
+    # caches, as a reused serverless image would.
+    probe(tree, entry)
+    samples = [probe(tree, entry) for _ in range(runs)]
+    seconds = [sample["seconds"] for sample in samples]
+    return {
+        "entry": entry,
+        "runs": runs,
+        "ms": {
+            "median": round(statistics.median(seconds) * 1000, 1),
+            "min": round(min(seconds) * 1000, 1),
+            "max": round(max(seconds) * 1000, 1)
+        },
+        "modules": samples[-1]["modules"],
+        "socketio": samples[-1]["socketio"]
+    }
+
+
+def extract(ref, directory):
+    archive = os.path.join(directory, "tree.tar")
+    subprocess.run(["git", "archive", "--output", archive, ref], cwd=ROOT, check=True)
+    with tarfile.open(archive) as tar:
+        tar.extractall(os.path.join(directory, "tree"))
+    return os.path.join(directory, "tree")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure import-time cold start of the app entry points.")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--entry", nargs="+", default=["app", "serverless"])
+    parser.add_argument("--ref", help="git revision to compare against, e.g. the commit before the app factory")
+    parser.add_argument("--output", default="cold-start-report.json")
+    options = parser.parse_args()
+
+    results = {"current": [measure(ROOT, entry, options.runs) for entry in options.entry]}
+    if options.ref:
+        with tempfile.TemporaryDirectory() as directory:
+            tree = extract(options.ref, directory)
+            results[options.ref] = [measure(tree, entry, options.runs) for entry in options.entry if os.path.exists(os.path.join(tree, f"{entry}.py"))]
+
+    baseline = results[options.ref][0] if options.ref and len(results[options.ref]) > 0 else results["current"][0]
+    for label, entries in results.items():
+        for result in entries:
+            result["vs_baseline"] = round(result["ms"]["median"] / baseline["ms"]["median"], 3)
+            print(f"{label:>12} {result['entry']:<12} median {result['ms']['median']:8.1f}ms  min {result['ms']['min']:8.1f}ms  {result['modules']:5} modules  socketio {'yes' if result['socketio'] else 'no ':<3}  x{result['vs_baseline']}")
+
+    with open(options.output, "w") as output:
+        json.dump({"baseline": f"{options.ref or 'current'}:{baseline['entry']}", "results": results}, output, indent=2, sort_keys=True)
+        output.write("\n")
+    print(f"Wrote {options.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""Measure response compression: CPU time against bytes saved.
+
+Seeds the same synthetic dataset as api_routes.py, fetches every GET route
+once uncompressed, then compresses each body with gzip and brotli (when the
+brotli package is installed) at a range of levels. For every route and
+encoding/level it reports the compressed size, the ratio, the CPU time per
+compression (median over --repeat runs) and the kilobytes saved per CPU
+millisecond. The configured levels are also run chunk by chunk, as streamed
+responses are compressed, to show what flushing every chunk costs in size.
+Bodies below COMPRESSION_MIN_SIZE are listed but not compressed by the app.
+
+Usage: python benchmarks/compression.py [dataset options] [--repeat N]
+       [--gzip-levels N...] [--brotli-levels N...] [--output FILE]
+"""
+import argparse
+import base64
+import json
+import os
+import statistics
+import time
+
+# api_routes puts the repository on sys.path and sets up the environment.
+from api_routes import backend, Dataset, route_specs, add_dataset_arguments, get_commit
+
+from whatsfordinner.compression import ENCODINGS, compress, compress_chunks
+from whatsfordinner.extensions import db
+
+
+def fetch_bodies(data, client):
+    bodies = {}
+    for method, rule, label, build in route_specs(data):
+        if method != "GET":
+            continue
+        path, body = build()
+        response = client.get(path)
+        if response.status_code == 200:
+            bodies[f"{method} {rule}{label}"] = response.get_data()
+    return bodies
+
+
+def cpu_time(function, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.thread_time()
+        result = function()
+        samples.append(time.thread_time() - started)
+    return result, statistics.median(samples)
+
+
+def summarize(size, compressed_size, seconds):
+    saved = size - compressed_size
+    return {
+        "bytes": compressed_size,
+        "ratio": round(compressed_size / size, 4) if size > 0 else 1.0,
+        "cpu_ms": round(seconds * 1000, 4),
+        "saved_kb_per_cpu_ms": round(saved / 1024 / (seconds * 1000), 2) if seconds > 0 else None
+    }
+
+
+def measure(body, levels, configured, chunk_size, repeat):
+    results = {}
+    for encoding in ENCODINGS:
+        for level in levels[encoding]:
+            compressed, seconds = cpu_time(lambda: compress(body, encoding, level), repeat)
+            results[f"{encoding}:{level}"] = summarize(len(body), len(compressed), seconds)
+
+        # Streamed responses flush after every chunk of about chunk_size bytes.
+        chunks = [body[start:start + chunk_size] for start in range(0, len(body), chunk_size)]
+        compressed, seconds = cpu_time(lambda: b"".join(compress_chunks(chunks, encoding, configured[encoding])), repeat)
+        results[f"{encoding}:{configured[encoding]}:stream"] = summarize(len(body), len(compressed), seconds)
+    return results
+
+
+def run(options):
+    flask_app = backend.app
+    with flask_app.app_context():
+        db.drop_all(bind_key=None)
+        db.create_all(bind_key=None)
+        data = Dataset(options)
+        data.seed()
+
+        client = flask_app.test_client()
+        auth = f"{os.environ['AUTH_USERNAME']}:{os.environ['AUTH_PASSWORD']}"
+        client.environ_base["HTTP_AUTHORIZATION"] = "Basic " + base64.b64encode(auth.encode("utf-8")).decode("ascii")
+        bodies = fetch_bodies(data, client)
+
+    config = flask_app.config
+    levels = {"gzip": options.gzip_levels, "br": options.brotli_levels}
+    configured = {"gzip": config["COMPRESSION_LEVEL"], "br": config["COMPRESSION_BROTLI_QUALITY"]}
+    routes = {}
+    totals = {}
+    for key, body in sorted(bodies.items()):
+        routes[key] = {"bytes": len(body), "compressed": len(body) >= config["COMPRESSION_MIN_SIZE"]}
+        if not routes[key]["compressed"]:
+            continue
+        routes[key]["encodings"] = measure(body, levels, configured, config["COMPRESSION_STREAM_CHUNK_SIZE"], options.repeat)
+        for name, result in routes[key]["encodings"].items():
+            total = totals.setdefault(name, {"input_bytes": 0, "output_bytes": 0, "cpu_ms": 0.0})
+            total["input_bytes"] += len(body)
+            total["output_bytes"] += result["bytes"]
+            total["cpu_ms"] += result["cpu_ms"]
+
+    for key, result in routes.items():
+        best = min(result.get("encodings", {}).items(), key=lambda item: item[1]["bytes"], default=None)
+        summary = f"best {best[0]:>16} {best[1]['bytes']:9} bytes ({best[1]['ratio']:.3f})" if best else "below threshold"
+        print(f"{key:55} {result['bytes']:9} bytes  {summary}")
+    print()
+    for name, total in sorted(totals.items()):
+        saved = total["input_bytes"] - total["output_bytes"]
+        print(f"{name:>16}  {total['input_bytes']:10} -> {total['output_bytes']:10} bytes ({total['output_bytes'] / total['input_bytes']:.3f})  {total['cpu_ms']:9.3f} cpu ms  {saved / 1024 / total['cpu_ms'] if total['cpu_ms'] > 0 else 0:8.1f} KB saved per cpu ms")
+
+    return {
+        "meta": {
+            "commit": get_commit(),
+            "dataset": {key: getattr(options, key) for key in ("seed", "users", "friends", "meals", "ingredients", "steps", "categories", "mealplans", "meals_per_plan", "shared", "notifications")},
+            "repeat": options.repeat,
+            "min_size": config["COMPRESSION_MIN_SIZE"],
+            "chunk_size": config["COMPRESSION_STREAM_CHUNK_SIZE"],
+            "configured_levels": configured,
+            "encodings": list(ENCODINGS)
+        },
+        "routes": routes,
+        "totals": totals
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure compression CPU cost against bytes saved for every GET route.")
+    add_dataset_arguments(parser)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--gzip-levels", nargs="+", type=int, default=[1, 6, 9])
+    parser.add_argument("--brotli-levels", nargs="+", type=int, default=[1, 4, 6, 11])
+    parser.add_argument("--output", default="compression-report.json")
+    options = parser.parse_args()
+
+    report = run(options)
+    with open(options.output, "w") as output:
+        json.dump(report, output, indent=2, sort_keys=True)
+        output.write("\n")
+    print(f"Wrote {options.output}")
+
+
+if __name__ == "__main__":
+    main()
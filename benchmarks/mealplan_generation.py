@@ -0,0 +1,65 @@
+"""Time the mealplan solver on users with thousands of meals and many rules.
+
+Usage: python benchmarks/mealplan_generation.py [meal counts...]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from whatsfordinner.mealplan_generator import build_candidate, solve_mealplan
+
+CATEGORY_COUNT = 40
+
+
+def build_candidates(meal_count, rng):
+    candidates = []
+    for meal_id in range(1, meal_count + 1):
+        categories = [(category_id, f"Category {category_id}") for category_id in rng.sample(range(1, CATEGORY_COUNT + 1), rng.randint(1, 4))]
+        candidates.append(build_candidate(meal_id, rng.randint(1, 5), categories))
+    return candidates
+
+
+def build_rules(rule_count, rng):
+    rules = []
+    for _ in range(rule_count):
+        if rng.random() < 0.75:
+            rules.append({"rule_type": "category", "rule": rng.choice(["exactly", "at least", "at most", "none"]), "amount": rng.randint(1, 2), "value": f"Category {rng.randint(1, CATEGORY_COUNT)}"})
+        else:
+            rules.append({"rule_type": "difficulty", "rule": rng.choice(["at least", "at most"]), "amount": rng.randint(1, 3), "value": str(rng.randint(1, 5))})
+    return rules
+
+
+def run(meal_count, rule_count, number, repeat=20):
+    rng = random.Random(meal_count * 31 + rule_count)
+    candidates = build_candidates(meal_count, rng)
+    rules = build_rules(rule_count, rng)
+
+    timings = []
+    unsatisfied_total = 0
+    for index in range(repeat):
+        start = time.perf_counter()
+        meal_ids, unsatisfied = solve_mealplan(candidates, rules, number, random.Random(index))
+        timings.append(time.perf_counter() - start)
+        unsatisfied_total += len(unsatisfied)
+
+    timings.sort()
+    return {
+        "meals": meal_count,
+        "rules": rule_count,
+        "number": number,
+        "p50_ms": round(timings[len(timings) // 2] * 1000, 2),
+        "max_ms": round(timings[-1] * 1000, 2),
+        "avg_unsatisfied": round(unsatisfied_total / repeat, 2)
+    }
+
+
+if __name__ == "__main__":
+    meal_counts = [int(count) for count in sys.argv[1:]] or [500, 2000, 5000, 20000]
+    print(f"{'meals':>6} {'rules':>6} {'number':>7} {'p50 ms':>8} {'max ms':>8} {'unsatisfied':>12}")
+    for meal_count in meal_counts:
+        for rule_count in (3, 10, 25):
+            result = run(meal_count, rule_count, 7)
+            print(f"{result['meals']:>6} {result['rules']:>6} {result['number']:>7} {result['p50_ms']:>8} {result['max_ms']:>8} {result['avg_unsatisfied']:>12}")
@@ -0,0 +1,255 @@
+"""Measure Socket.IO fan-out against a running server as the client count grows.
+
+Seeds a user with meals and a mealplan through the HTTP API, then for each
+client count connects that many Socket.IO clients and drives a mix of
+shoppingingredient toggles (PUT /shoppingingredient/update/<id>) and meal
+additions (POST /mealplan/meal/add). Every broadcast is timed from just
+before its mutation is sent to its arrival at each client, which gives the
+end-to-end delivery latency, deliveries per second and lost events. With
+--server-pid and psutil installed it also samples the server's CPU and
+memory.
+
+Clients run in this process, so very large counts measure this machine too.
+Needs python-socketio[client]; psutil and msgpack are optional.
+
+Usage: python benchmarks/socket_fanout.py [--url URL] [--clients N...]
+       [--mutations N] [--mix toggle,meal] [--server-pid PID] [--output FILE]
+"""
+import argparse
+import base64
+import json
+import os
+import threading
+import time
+import urllib.request
+from collections import deque
+
+import socketio
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+WATCHED_EVENTS = ["shoppingingredient-update", "shared-shoppingingredient-update"]
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+class Api:
+    def __init__(self, url, username, password):
+        self.url = url.rstrip("/")
+        self.authorization = "Basic " + base64.b64encode(f"{username}:{password}".encode("utf-8")).decode("ascii")
+
+    def call(self, method, path, body=None):
+        data = json.dumps(body).encode("utf-8") if body is not None else None
+        request = urllib.request.Request(self.url + path, data=data, method=method, headers={"Authorization": self.authorization})
+        if data is not None:
+            request.add_header("Content-Type", "application/json")
+        with urllib.request.urlopen(request) as response:
+            payload = json.loads(response.read())
+        if isinstance(payload, dict) and payload.get("status", 200) != 200:
+            raise RuntimeError(f"{method} {path}: {payload.get('message')}")
+        return payload
+
+
+# A broadcast is identified by its event name and entity. Socket.IO keeps
+# per-connection order, so the n-th arrival of a key at a client belongs to
+# the n-th mutation that produced that key.
+def event_key(event, payload):
+    data = payload.get("data", {})
+    if event == "shared-shoppingingredient-update":
+        return (event, data.get("id"), data.get("obtained"))
+    return (event, data.get("shoppinglist_id"), data.get("ingredient_id"))
+
+
+class Listener:
+    def __init__(self, options, auth):
+        self.received = {}
+        self.lock = threading.Lock()
+        self.client = socketio.Client(reconnection=False)
+        for event in WATCHED_EVENTS:
+            self.client.on(event, self.handler(event))
+        if options.serializer == "msgpack":
+            auth = dict(auth, serializer="msgpack")
+        self.client.connect(options.url, auth=auth, transports=["websocket"], wait_timeout=30)
+
+    def handler(self, event):
+        def record(payload):
+            arrived = time.perf_counter()
+            if isinstance(payload, bytes):
+                payload = msgpack.unpackb(payload, raw=False)
+            key = event_key(event, payload)
+            with self.lock:
+                self.received.setdefault(key, []).append(arrived)
+        return record
+
+    def close(self):
+        self.client.disconnect()
+
+
+class Workload:
+    def __init__(self, api, options):
+        self.api = api
+        self.options = options
+        self.sent = {}
+        self.toggles = deque()
+        self.meals = []
+        self.mealplan_id = None
+        self.shoppinglist_id = None
+
+    def seed(self):
+        suffix = str(int(time.time() * 1000))
+        user = self.api.call("POST", "/user/add", {"username": f"fanout{suffix}", "password": suffix, "email": f"fanout{suffix}@example.com"})["data"]["user"]
+        for index in range(self.options.meals):
+            meal = self.api.call("POST", "/meal/add", {"name": f"Fanout Meal {index}", "description": "", "image_url": "", "difficulty": 1, "owner_username": user["username"], "user_id": user["id"]})["data"]
+            recipe_id = meal["recipe"]["id"]
+            section = self.api.call("POST", "/ingredientsection/add", {"title": "Ingredients", "recipe_id": recipe_id})["data"]
+            ingredients = self.api.call("POST", "/ingredient/add/multiple", [{"name": f"Ingredient {index}-{number}", "amount": "1", "unit": "cup", "category": "Pantry", "recipe_id": recipe_id, "ingredientsection_id": section["id"]} for number in range(self.options.ingredients)])["data"]
+            self.meals.append((meal["id"], [ingredient["id"] for ingredient in ingredients]))
+
+        mealplan = self.api.call("POST", "/mealplan/add", {"name": f"Fanout {suffix}", "user_username": user["username"], "user_id": user["id"], "meals": [meal_id for meal_id, _ in self.meals], "multipliers": {}})["data"]
+        self.mealplan_id = mealplan["id"]
+        self.shoppinglist_id = mealplan["shoppinglist"]["id"]
+        shoppinglist = self.api.call("GET", f"/shoppinglist/get/{self.shoppinglist_id}")
+        self.toggles.extend((item["id"], item["obtained"]) for item in shoppinglist["shoppingingredients"])
+
+    def expect(self, key, started):
+        self.sent.setdefault(key, []).append(started)
+
+    def toggle(self):
+        shoppingingredient_id, obtained = self.toggles.popleft()
+        obtained = not obtained
+        self.toggles.append((shoppingingredient_id, obtained))
+        started = time.perf_counter()
+        self.expect(("shared-shoppingingredient-update", shoppingingredient_id, obtained), started)
+        self.api.call("PUT", f"/shoppingingredient/update/{shoppingingredient_id}", {"obtained": obtained})
+        return 1
+
+    def add_meal(self, index):
+        meal_id, ingredient_ids = self.meals[index % len(self.meals)]
+        started = time.perf_counter()
+        for ingredient_id in ingredient_ids:
+            self.expect(("shoppingingredient-update", self.shoppinglist_id, ingredient_id), started)
+        self.api.call("POST", "/mealplan/meal/add", {"mealplan_id": self.mealplan_id, "meal_id": meal_id, "multiplier": 1})
+        return len(ingredient_ids)
+
+
+def collect(listeners, workload):
+    latencies = []
+    delivered = 0
+    for listener in listeners:
+        with listener.lock:
+            received = {key: list(times) for key, times in listener.received.items()}
+        for key, arrivals in received.items():
+            for sent, arrived in zip(workload.sent.get(key, []), arrivals):
+                latencies.append(arrived - sent)
+                delivered += 1
+    return latencies, delivered
+
+
+def run_step(api, options, client_count):
+    auth = {"username": options.username, "password": options.password}
+    workload = Workload(api, options)
+    workload.seed()
+    listeners = [Listener(options, auth) for _ in range(client_count)]
+
+    process = psutil.Process(options.server_pid) if psutil is not None and options.server_pid else None
+    if process is not None:
+        process.cpu_percent(None)
+
+    mix = options.mix.split(",")
+    expected = 0
+    interval = 1 / options.rate if options.rate > 0 else 0
+    started = time.perf_counter()
+    for index in range(options.mutations):
+        mutation = mix[index % len(mix)]
+        expected += workload.toggle() if mutation == "toggle" else workload.add_meal(index)
+        if interval > 0:
+            time.sleep(max(0, started + (index + 1) * interval - time.perf_counter()))
+    driven = time.perf_counter() - started
+
+    expected *= client_count
+    latencies, delivered = [], 0
+    deadline = time.perf_counter() + options.timeout
+    while time.perf_counter() < deadline:
+        latencies, delivered = collect(listeners, workload)
+        if delivered >= expected:
+            break
+        time.sleep(0.05)
+    finished = max((max(times) for listener in listeners for times in listener.received.values() if len(times) > 0), default=time.perf_counter())
+
+    server = None
+    if process is not None:
+        server = {
+            "cpu_percent": process.cpu_percent(None),
+            "rss_bytes": process.memory_info().rss
+        }
+
+    for listener in listeners:
+        listener.close()
+
+    return {
+        "clients": client_count,
+        "mutations": options.mutations,
+        "mutations_per_second": round(options.mutations / driven, 2) if driven > 0 else None,
+        "expected_deliveries": expected,
+        "delivered": delivered,
+        "lost": expected - delivered,
+        "deliveries_per_second": round(delivered / (finished - started), 2) if finished > started else None,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 0.5) * 1000, 3),
+            "p90": round(percentile(latencies, 0.9) * 1000, 3),
+            "p99": round(percentile(latencies, 0.99) * 1000, 3),
+            "max": round(max(latencies) * 1000, 3)
+        } if len(latencies) > 0 else None,
+        "server": server
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure Socket.IO fan-out as the client count grows.")
+    parser.add_argument("--url", default="http://localhost:8080")
+    parser.add_argument("--username", default=os.environ.get("AUTH_USERNAME"))
+    parser.add_argument("--password", default=os.environ.get("AUTH_PASSWORD"))
+    parser.add_argument("--clients", type=int, nargs="+", default=[10, 50, 100])
+    parser.add_argument("--mutations", type=int, default=100)
+    parser.add_argument("--mix", default="toggle,toggle,toggle,meal", help="comma-separated cycle of toggle and meal mutations")
+    parser.add_argument("--rate", type=float, default=0, help="mutations per second, 0 for as fast as the server answers")
+    parser.add_argument("--meals", type=int, default=4)
+    parser.add_argument("--ingredients", type=int, default=8, help="ingredients per meal")
+    parser.add_argument("--serializer", choices=["json", "msgpack"], default="json")
+    parser.add_argument("--timeout", type=float, default=30, help="seconds to wait for outstanding deliveries")
+    parser.add_argument("--server-pid", type=int)
+    parser.add_argument("--output", default="socket-fanout-report.json")
+    options = parser.parse_args()
+
+    if options.serializer == "msgpack" and msgpack is None:
+        parser.error("--serializer msgpack needs the msgpack package")
+    if options.server_pid and psutil is None:
+        print("psutil is not installed, skipping server CPU and memory")
+
+    api = Api(options.url, options.username, options.password)
+    steps = []
+    for client_count in options.clients:
+        step = run_step(api, options, client_count)
+        steps.append(step)
+        latency = step["latency_ms"] or {}
+        print(f"{client_count:6} clients  {step['delivered']:8}/{step['expected_deliveries']} delivered  {step['deliveries_per_second'] or 0:10.1f}/s  p50 {latency.get('p50', 0):8.2f}ms  p99 {latency.get('p99', 0):8.2f}ms")
+
+    with open(options.output, "w") as output:
+        json.dump({"url": options.url, "serializer": options.serializer, "mix": options.mix, "steps": steps}, output, indent=2, sort_keys=True)
+        output.write("\n")
+    print(f"Wrote {options.output}")
+
+
+if __name__ == "__main__":
+    main()
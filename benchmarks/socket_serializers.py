@@ -0,0 +1,62 @@
+"""Compare JSON and MessagePack payloads for shoppingingredient-update-multiple.
+
+Usage: python benchmarks/socket_serializers.py [batch sizes...]
+"""
+import json
+import random
+import sys
+import timeit
+
+import msgpack
+
+CATEGORIES = ["Produce", "Dairy", "Meat", "Bakery", "Pantry", None]
+UNITS = ["cup", "cups", "tbsp", "tsp", "lb", "oz", None]
+
+
+def build_payload(size, seq=1):
+    return {
+        "data": [
+            {
+                "id": 1000 + index,
+                "name": f"Ingredient {index}",
+                "amount": random.choice(["1", "2", "1/2", "3/4", "1 1/2"]),
+                "unit": random.choice(UNITS),
+                "category": random.choice(CATEGORIES),
+                "obtained": random.random() < 0.5,
+                "multiplier": random.randint(1, 3),
+                "meal_name": f"Meal {index // 8}",
+                "shoppinglist_id": 42,
+                "ingredient_id": 5000 + index
+            }
+            for index in range(size)
+        ],
+        "type": "add",
+        "seq": seq
+    }
+
+
+def measure(size, number=200):
+    payload = build_payload(size)
+    json_bytes = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    msgpack_bytes = msgpack.packb(payload, use_bin_type=True)
+
+    json_time = timeit.timeit(lambda: json.dumps(payload, separators=(",", ":")).encode("utf-8"), number=number) / number
+    msgpack_time = timeit.timeit(lambda: msgpack.packb(payload, use_bin_type=True), number=number) / number
+
+    return {
+        "batch": size,
+        "json_bytes": len(json_bytes),
+        "msgpack_bytes": len(msgpack_bytes),
+        "size_ratio": round(len(msgpack_bytes) / len(json_bytes), 3),
+        "json_encode_us": round(json_time * 1e6, 1),
+        "msgpack_encode_us": round(msgpack_time * 1e6, 1)
+    }
+
+
+if __name__ == "__main__":
+    random.seed(0)
+    sizes = [int(size) for size in sys.argv[1:]] or [1, 10, 50, 200, 1000]
+    print(f"{'batch':>6} {'json B':>9} {'msgpack B':>10} {'ratio':>6} {'json us':>9} {'msgpack us':>11}")
+    for size in sizes:
+        result = measure(size)
+        print(f"{result['batch']:>6} {result['json_bytes']:>9} {result['msgpack_bytes']:>10} {result['size_ratio']:>6} {result['json_encode_us']:>9} {result['msgpack_encode_us']:>11}")
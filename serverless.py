@@ -0,0 +1,5 @@
+from whatsfordinner import create_app
+
+# Entry point for serverless platforms (see vercel.json). Requests are handled
+# without Socket.IO, which also keeps flask_socketio out of the cold start.
+app = create_app(socketio=False)
@@ -0,0 +1,53 @@
+import pytest
+
+import base64
+from flask import g, request_started
+
+from whatsfordinner import create_app, realtime, hot_shoppinglists, identity, db_routing, meal_indexes, meal_search
+
+AUTH = {
+    "username": "test",
+    "password": "secret"
+}
+
+# Every test gets a fresh app on an in-memory SQLite database. The caches that
+# live at module level (event log, hot shoppinglists, verified sessions,
+# replica pins, meal and search indexes) are cleared so tests cannot see each
+# other's state.
+@pytest.fixture
+def app(monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", "sqlite://")
+    monkeypatch.setenv("DATABASE_REPLICA_URLS", "")
+    monkeypatch.setenv("SECRET_KEY", "test")
+    monkeypatch.setenv("AUTH_USERNAME", AUTH["username"])
+    monkeypatch.setenv("AUTH_PASSWORD", AUTH["password"])
+    monkeypatch.setenv("AUTODELETE_INTERVAL", "0")
+    monkeypatch.setenv("NPLUSONE_MODE", "raise")
+
+    for state in [realtime.event_log_sequences, realtime.event_log_buffers, hot_shoppinglists.hot_shoppinglists, hot_shoppinglists.hot_shoppingingredient_lists, identity.verified_sessions, db_routing.primary_pins, meal_indexes.meal_indexes]:
+        state.clear()
+    monkeypatch.setitem(meal_search.meal_search_index, "index", None)
+
+    app = create_app()
+    request_started.connect(clear_request_globals, app)
+    with app.app_context():
+        yield app
+
+# The test's app context stays pushed, so requests made inside it share its g.
+# Each request starts with an empty g, as it would in its own app context.
+def clear_request_globals(sender, **extra):
+    vars(g).clear()
+
+@pytest.fixture
+def client(app):
+    client = app.test_client()
+    credentials = f"{AUTH['username']}:{AUTH['password']}"
+    client.environ_base["HTTP_AUTHORIZATION"] = "Basic " + base64.b64encode(credentials.encode("utf-8")).decode("ascii")
+    return client
+
+@pytest.fixture
+def socket_client(app):
+    socket_client = app.extensions["socketio"].test_client(app, auth=AUTH)
+    yield socket_client
+    if socket_client.is_connected():
+        socket_client.disconnect()
@@ -0,0 +1,86 @@
+import pytest
+
+from datetime import datetime, timedelta
+
+from whatsfordinner import autodelete
+from whatsfordinner.extensions import db
+from whatsfordinner.models import shared_mealplans_table, User, Settings, Mealplan, Shoppinglist, Shoppingingredient, ShoppinglistProgress
+from whatsfordinner.autodelete import run_autodelete
+
+NOW = datetime(2024, 6, 1)
+
+@pytest.fixture
+def events(monkeypatch):
+    emitted = []
+    monkeypatch.setattr(autodelete, "emit_event", lambda event, payload: emitted.append((event, payload)))
+    return emitted
+
+def add_user(username, autodelete):
+    user = User(username, "password", f"{username}@example.com")
+    db.session.add(user)
+    db.session.commit()
+    db.session.add(Settings(None, autodelete, 1, "weeks", "arbitrary", autodelete, 2, "days", True, True, user.id))
+    db.session.commit()
+    return user
+
+def add_mealplan(user, days_old):
+    mealplan = Mealplan(f"Plan {days_old}", NOW - timedelta(days=days_old), user.username, user.id)
+    db.session.add(mealplan)
+    db.session.commit()
+    return mealplan.id
+
+def add_shoppinglist(user, days_old, mealplan_id=None):
+    shoppinglist = Shoppinglist(f"List {days_old}", NOW - timedelta(days=days_old), False, False, user.username, user.id, mealplan_id)
+    db.session.add(shoppinglist)
+    db.session.commit()
+    db.session.add(Shoppingingredient("Milk", "1", "gallon", "Dairy", 1, None, shoppinglist.id, None))
+    db.session.commit()
+    return shoppinglist.id
+
+@pytest.fixture
+def plans(app):
+    owner = add_user("owner", True)
+    friend = add_user("friend", False)
+    ids = {
+        "owner_id": owner.id,
+        "friend_id": friend.id,
+        "old_mealplan": add_mealplan(owner, 10),
+        "new_mealplan": add_mealplan(owner, 1),
+        "friend_mealplan": add_mealplan(friend, 30),
+        "old_shoppinglist": add_shoppinglist(owner, 3),
+        "older_shoppinglist": add_shoppinglist(owner, 5),
+        "new_shoppinglist": add_shoppinglist(owner, 1)
+    }
+    ids["mealplan_shoppinglist"] = add_shoppinglist(owner, 0, ids["old_mealplan"])
+    db.session.execute(shared_mealplans_table.insert().values(user_id=friend.id, mealplan_id=ids["old_mealplan"]))
+    db.session.commit()
+    return ids
+
+@pytest.mark.parametrize("batch_size", [1, 500])
+def test_only_plans_and_lists_past_their_owners_cutoff_are_deleted(app, plans, events, batch_size, monkeypatch):
+    monkeypatch.setitem(app.config, "AUTODELETE_BATCH_SIZE", batch_size)
+
+    purged = run_autodelete(NOW)
+
+    assert purged == {"mealplans": 1, "shoppinglists": 3, "shoppingingredients": 3, "users": 2}
+    assert sorted(id for id, in db.session.query(Mealplan.id).all()) == [plans["new_mealplan"], plans["friend_mealplan"]]
+    assert [id for id, in db.session.query(Shoppinglist.id).all()] == [plans["new_shoppinglist"]]
+    assert db.session.query(Shoppingingredient).count() == 1
+    assert [id for id, in db.session.query(ShoppinglistProgress.shoppinglist_id).all()] == [plans["new_shoppinglist"]]
+    assert db.session.query(shared_mealplans_table).count() == 0
+
+def test_each_affected_user_gets_one_event(plans, events):
+    run_autodelete(NOW)
+
+    assert sorted((event, payload["data"]["user_id"]) for event, payload in events) == [("autodelete-update", plans["owner_id"]), ("autodelete-update", plans["friend_id"])]
+    deleted = {payload["data"]["user_id"]: payload["data"] for event, payload in events}
+    assert deleted[plans["owner_id"]]["mealplan_ids"] == [plans["old_mealplan"]]
+    assert sorted(deleted[plans["owner_id"]]["shoppinglist_ids"]) == sorted([plans["mealplan_shoppinglist"], plans["old_shoppinglist"], plans["older_shoppinglist"]])
+    assert deleted[plans["friend_id"]] == {"user_id": plans["friend_id"], "mealplan_ids": [plans["old_mealplan"]], "shoppinglist_ids": []}
+
+def test_a_second_run_finds_nothing(plans, events):
+    run_autodelete(NOW)
+    events.clear()
+
+    assert run_autodelete(NOW)["users"] == 0
+    assert events == []
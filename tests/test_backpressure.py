@@ -0,0 +1,97 @@
+import pytest
+
+import threading
+from types import SimpleNamespace
+
+from whatsfordinner import realtime
+
+@pytest.fixture(autouse=True)
+def connections(monkeypatch):
+    monkeypatch.setitem(realtime.backpressure_monitor, "running", True)
+    yield realtime.connected_sids
+    for state in [realtime.connected_sids, realtime.slow_sids, realtime.slow_queues, realtime.resync_sids]:
+        state.clear()
+
+# The monitor runs as a background task with no app context of its own, so
+# the tests run it on a separate thread too.
+def run_monitor(app):
+    thread = threading.Thread(target=realtime.monitor_backpressure, args=(app,))
+    thread.start()
+    thread.join(5)
+    assert not thread.is_alive()
+
+def test_monitor_marks_slow_connections_until_they_disconnect(app, connections, monkeypatch):
+    socketio = app.extensions["socketio"]
+    queue_sizes = iter([100, 100, 0])
+    passes = []
+    monkeypatch.setattr(socketio.server.manager, "eio_sid_from_sid", lambda sid, namespace: "eio-1")
+    monkeypatch.setitem(socketio.server.eio.sockets, "eio-1", SimpleNamespace(queue=SimpleNamespace(qsize=lambda: next(queue_sizes))))
+    def sleep(seconds):
+        passes.append(set(realtime.slow_sids))
+        if len(passes) == 3:
+            connections.discard("sid-1")
+    monkeypatch.setattr(socketio, "sleep", sleep)
+    connections.add("sid-1")
+
+    run_monitor(app)
+
+    assert passes == [{"sid-1"}, {"sid-1"}, set()]
+    assert realtime.backpressure_monitor["running"] is False
+
+def test_monitor_clears_its_flag_when_a_pass_fails(app, connections, monkeypatch):
+    errors = []
+    def fail(high_water):
+        raise RuntimeError("transport gone")
+    monkeypatch.setattr(realtime, "check_backpressure", fail)
+    monkeypatch.setattr(app.logger, "error", errors.append)
+    connections.add("sid-1")
+
+    run_monitor(app)
+
+    assert errors == ["Backpressure monitor failed: transport gone"]
+    assert realtime.backpressure_monitor["running"] is False
+
+def update(id, name):
+    realtime.emit_event("shared-shoppingingredient-update", {"data": {"id": id, "name": name}, "type": "update"})
+
+def test_slow_connections_get_only_the_latest_update_per_entity(app, socket_client, connections, monkeypatch):
+    monkeypatch.setattr(realtime, "get_transport_queue_size", lambda sid: 0)
+    sid = next(iter(connections))
+    socket_client.get_received()
+    realtime.slow_sids.add(sid)
+    collapsed = realtime.backpressure_stats["collapsed"]
+
+    update(1, "Milk")
+    update(2, "Eggs")
+    update(1, "Oat milk")
+
+    assert socket_client.get_received() == []
+    assert realtime.backpressure_stats["collapsed"] == collapsed + 1
+
+    realtime.check_backpressure(app.config["SOCKET_QUEUE_HIGH_WATER"])
+
+    assert [event["args"][0]["data"] for event in socket_client.get_received()] == [{"id": 2, "name": "Eggs"}, {"id": 1, "name": "Oat milk"}]
+    assert sid in realtime.slow_sids
+    realtime.check_backpressure(app.config["SOCKET_QUEUE_HIGH_WATER"])
+    assert sid not in realtime.slow_sids
+
+def test_overflowing_slow_connections_get_a_single_resync(app, socket_client, connections, monkeypatch):
+    monkeypatch.setitem(app.config, "SOCKET_QUEUE_MAX_PENDING", 2)
+    monkeypatch.setattr(realtime, "get_transport_queue_size", lambda sid: 0)
+    sid = next(iter(connections))
+    socket_client.get_received()
+    realtime.slow_sids.add(sid)
+    resyncs = realtime.backpressure_stats["resyncs"]
+
+    for id in range(1, 5):
+        update(id, "Milk")
+
+    assert sid in realtime.resync_sids
+    assert len(realtime.slow_queues[sid]) == 0
+    assert realtime.backpressure_stats["resyncs"] == resyncs + 1
+
+    realtime.check_backpressure(app.config["SOCKET_QUEUE_HIGH_WATER"])
+
+    received = socket_client.get_received()
+    assert [event["name"] for event in received] == ["resync"]
+    assert received[0]["args"][0]["data"] == {"room": realtime.BROADCAST_ROOM, "seq": 4}
@@ -0,0 +1,79 @@
+import pytest
+
+import gzip
+from datetime import datetime
+from werkzeug.datastructures import Accept
+from werkzeug.http import parse_accept_header
+
+from whatsfordinner.extensions import db
+from whatsfordinner.models import User, Shoppinglist, Shoppingingredient
+from whatsfordinner.compression import ENCODINGS, negotiate_encoding, compress, compress_chunks
+from whatsfordinner.instrumentation import response_bytes
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+def accept(header):
+    return parse_accept_header(header, Accept)
+
+def test_negotiate_encoding():
+    assert negotiate_encoding(accept("gzip, deflate")) == "gzip"
+    assert negotiate_encoding(accept("identity")) is None
+    assert negotiate_encoding(accept("br;q=0.5, gzip"), ("br", "gzip")) == "gzip"
+    assert negotiate_encoding(accept("br, gzip"), ("br", "gzip")) == "br"
+
+def test_compress_chunks_matches_the_whole_body():
+    sizes = []
+    chunks = iter([b'{"a":', "[1,2,3]", b"}"])
+
+    compressed = b"".join(compress_chunks(chunks, "gzip", 6, lambda *recorded: sizes.append(recorded)))
+
+    assert gzip.decompress(compressed) == b'{"a":[1,2,3]}'
+    assert gzip.decompress(compress(b'{"a":[1,2,3]}', "gzip", 6)) == b'{"a":[1,2,3]}'
+    assert sizes[0][:2] == (13, len(compressed))
+
+@pytest.fixture
+def shoppingingredients(app):
+    user = User("shopper", "password", "shopper@example.com")
+    db.session.add(user)
+    db.session.commit()
+    shoppinglist = Shoppinglist("Groceries", datetime(2024, 1, 1), False, False, user.username, user.id, None)
+    db.session.add(shoppinglist)
+    db.session.commit()
+    db.session.add_all([Shoppingingredient(f"Item {number}", "1", "cup", "Pantry", 1, None, shoppinglist.id, None) for number in range(100)])
+    db.session.commit()
+
+def decompress(data, encoding):
+    return brotli.decompress(data) if encoding == "br" else gzip.decompress(data)
+
+@pytest.mark.parametrize("encoding", ENCODINGS)
+def test_large_responses_are_compressed(app, client, shoppingingredients, encoding, monkeypatch):
+    monkeypatch.setitem(app.config, "COMPRESSION_STREAM_CHUNK_SIZE", 1024)
+    plain = client.get("/shoppingingredient/get", headers={"Accept-Encoding": "identity"})
+    response = client.get("/shoppingingredient/get", headers={"Accept-Encoding": encoding})
+
+    assert plain.headers.get("Content-Encoding") is None
+    assert response.headers["Content-Encoding"] == encoding
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert response.is_streamed
+    assert decompress(response.get_data(), encoding) == plain.get_data()
+
+def test_small_responses_are_left_alone(client):
+    response = client.get("/shoppingingredient/get", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers.get("Content-Encoding") is None
+
+@pytest.mark.parametrize("encoding", ["identity", "gzip"])
+def test_streamed_response_bytes_are_recorded(app, client, shoppingingredients, encoding, monkeypatch):
+    monkeypatch.setitem(app.config, "COMPRESSION_STREAM_CHUNK_SIZE", 1024)
+    labels = ("GET", "/shoppingingredient/get")
+    count, total = response_bytes.values.get(labels, [None, 0, 0.0])[1:]
+
+    response = client.get("/shoppingingredient/get", headers={"Accept-Encoding": encoding})
+    assert response.is_streamed
+    body = response.get_data()
+    response.close()
+
+    assert response_bytes.values[labels][1:] == [count + 1, total + len(body)]
@@ -0,0 +1,58 @@
+import pytest
+
+from sqlalchemy import create_engine, exc
+
+from whatsfordinner.db_pool import TimedQueuePool, TimedNullPool, get_engine_options, get_pool_stats
+
+CONFIG = {
+    "DB_PGBOUNCER": False,
+    "DB_POOL_SIZE": 3,
+    "DB_MAX_OVERFLOW": 2,
+    "DB_POOL_TIMEOUT": 10.0,
+    "DB_POOL_PRE_PING": True,
+    "DB_POOL_RECYCLE": 1800,
+    "DB_STATEMENT_TIMEOUT": 0
+}
+
+def test_engine_options_follow_the_config():
+    assert get_engine_options(CONFIG) == {
+        "poolclass": TimedQueuePool,
+        "pool_size": 3,
+        "max_overflow": 2,
+        "pool_timeout": 10.0,
+        "pool_pre_ping": True,
+        "pool_recycle": 1800
+    }
+    assert get_engine_options(dict(CONFIG, DB_STATEMENT_TIMEOUT=5000))["connect_args"] == {"options": "-c statement_timeout=5000"}
+    assert get_engine_options(dict(CONFIG, DB_PGBOUNCER=True)) == {"poolclass": TimedNullPool}
+
+def test_pool_stats_count_checkouts_and_timeouts():
+    engine = create_engine("sqlite://", poolclass=TimedQueuePool, pool_size=1, max_overflow=0, pool_timeout=0.01)
+    before = get_pool_stats(engine)
+
+    connection = engine.connect()
+    with pytest.raises(exc.TimeoutError):
+        engine.connect()
+    stats = get_pool_stats(engine)
+    connection.close()
+
+    assert stats["pool"] == "TimedQueuePool"
+    assert (stats["size"], stats["checked_out"], stats["idle"]) == (1, 1, 0)
+    assert stats["checkouts"] == before["checkouts"] + 1
+    assert stats["timeouts"] == before["timeouts"] + 1
+    assert stats["wait_max"] >= 0.01
+    assert get_pool_stats(engine)["checkins"] == before["checkins"] + 1
+
+def test_db_stats_reports_the_pool_and_read_routing(client):
+    before = client.get("/db/stats").get_json()["data"]
+
+    client.get("/shoppingingredient/get")
+    response = client.get("/db/stats").get_json()
+
+    assert response["status"] == 200
+    data = response["data"]
+    assert data["pool"] == "StaticPool"
+    assert data["checkouts"] > before["checkouts"]
+    assert data["wait_average"] >= 0
+    assert set(data["read_routing"]) == {"replicas", "pinned_clients", "replica_reads", "pinned", "lagging", "unavailable"}
+    assert data["read_routing"]["replicas"] == {}
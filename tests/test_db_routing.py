@@ -0,0 +1,41 @@
+import pytest
+
+from flask import g
+
+from whatsfordinner.extensions import db
+from whatsfordinner.db_routing import get_client_keys, is_pinned, pin_writer_to_primary, route_request
+
+@pytest.fixture(autouse=True)
+def replicas(app, monkeypatch):
+    monkeypatch.setitem(app.config, "SQLALCHEMY_BINDS", {"replica_0": {"url": "sqlite://"}})
+
+def write(app, user_id=None, address="10.0.0.1"):
+    with app.test_request_context("/meal/add", method="POST", environ_base={"REMOTE_ADDR": address}):
+        g.current_user_id = user_id
+        pin_writer_to_primary(db.session)
+
+def read_is_pinned(app, user_id=None, address="10.0.0.1"):
+    with app.test_request_context("/meal/get", environ_base={"REMOTE_ADDR": address}):
+        g.current_user_id = user_id
+        return any(is_pinned(client_key) for client_key in get_client_keys())
+
+@pytest.mark.parametrize("write_user_id, read_user_id", [(None, None), (1, 1), (1, None), (None, 1)])
+def test_reads_after_a_write_are_pinned_with_or_without_a_session(app, write_user_id, read_user_id):
+    write(app, write_user_id)
+
+    assert read_is_pinned(app, read_user_id)
+
+def test_a_user_is_pinned_from_another_address(app):
+    write(app, 1, "10.0.0.1")
+
+    assert read_is_pinned(app, 1, "10.0.0.2")
+    assert not read_is_pinned(app, None, "10.0.0.2")
+    assert not read_is_pinned(app, 2, "10.0.0.2")
+
+def test_pinned_reads_stay_on_the_primary(app):
+    write(app, None)
+
+    with app.test_request_context("/meal/get", environ_base={"REMOTE_ADDR": "10.0.0.1"}):
+        g.current_user_id = 1
+        route_request()
+        assert g.db_replica is None
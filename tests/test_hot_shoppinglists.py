@@ -0,0 +1,129 @@
+import pytest
+
+from datetime import datetime
+
+from whatsfordinner.extensions import db
+from whatsfordinner.models import User, Shoppinglist, Shoppingingredient
+from whatsfordinner.hot_shoppinglists import hot_shoppinglists, hot_shoppinglist_flusher, run_hot_shoppinglist_flusher, flush_hot_shoppinglists, flush_hot_shoppinglists_on_exit
+
+# The background flusher is marked as running so toggles never start a real
+# one; the tests run its loop themselves.
+@pytest.fixture(autouse=True)
+def hot_app(app, monkeypatch):
+    monkeypatch.setitem(app.config, "HOT_SHOPPINGLISTS", True)
+    monkeypatch.setitem(hot_shoppinglist_flusher, "running", True)
+    return app
+
+@pytest.fixture
+def shoppingingredient_id(app):
+    user = User("shopper", "password", "shopper@example.com")
+    db.session.add(user)
+    db.session.commit()
+    shoppinglist = Shoppinglist("Groceries", datetime.utcnow(), False, False, user.username, user.id, None)
+    db.session.add(shoppinglist)
+    db.session.commit()
+    record = Shoppingingredient("Milk", "1", "gallon", "Dairy", 1, None, shoppinglist.id, None)
+    db.session.add(record)
+    db.session.commit()
+    return record.id
+
+def get_stored(id):
+    db.session.expire_all()
+    return db.session.get(Shoppingingredient, id)
+
+def toggle(client, id, obtained):
+    return client.put(f"/shoppingingredient/update/{id}", json={"obtained": obtained}).get_json()
+
+def test_toggle_is_written_on_the_flush_interval(app, client, shoppingingredient_id, monkeypatch):
+    response = toggle(client, shoppingingredient_id, True)
+
+    assert response["data"]["obtained"] is True
+    assert get_stored(shoppingingredient_id).obtained is False
+
+    monkeypatch.setitem(app.config, "HOT_SHOPPINGLIST_FLUSH_INTERVAL", 0)
+    monkeypatch.setitem(app.config, "HOT_SHOPPINGLIST_IDLE_TIMEOUT", 0)
+    run_hot_shoppinglist_flusher(app)
+
+    assert get_stored(shoppingingredient_id).obtained is True
+    assert len(hot_shoppinglists) == 0
+    assert hot_shoppinglist_flusher["running"] is False
+
+def test_toggle_is_written_on_shutdown(app, client, shoppingingredient_id):
+    toggle(client, shoppingingredient_id, True)
+
+    flush_hot_shoppinglists_on_exit(app)
+
+    assert get_stored(shoppingingredient_id).obtained is True
+
+def test_crash_loses_only_the_unflushed_window(client, shoppingingredient_id):
+    toggle(client, shoppingingredient_id, True)
+    flush_hot_shoppinglists()
+    toggle(client, shoppingingredient_id, False)
+
+    # A killed worker never flushes: whatever is still pending is gone.
+    hot_shoppinglists.clear()
+
+    assert get_stored(shoppingingredient_id).obtained is True
+
+def test_other_requests_flush_pending_toggles_first(client, shoppingingredient_id):
+    toggle(client, shoppingingredient_id, True)
+
+    client.get(f"/shoppingingredient/get/{shoppingingredient_id}")
+
+    assert get_stored(shoppingingredient_id).obtained is True
+
+def test_socket_update_wins_over_an_older_toggle(socket_client, shoppingingredient_id):
+    socket_client.emit("shoppingingredient:toggle", {"id": shoppingingredient_id, "obtained": True}, callback=True)
+    socket_client.emit("shoppingingredient:update", {"id": shoppingingredient_id, "obtained": False}, callback=True)
+    flush_hot_shoppinglists()
+
+    assert get_stored(shoppingingredient_id).obtained is False
+    response = socket_client.emit("shoppingingredient:toggle", {"id": shoppingingredient_id}, callback=True)
+    assert response["data"]["obtained"] is True
+
+def test_socket_update_keeps_a_pending_toggle(socket_client, shoppingingredient_id):
+    socket_client.emit("shoppingingredient:toggle", {"id": shoppingingredient_id, "obtained": True}, callback=True)
+    response = socket_client.emit("shoppingingredient:update", {"id": shoppingingredient_id, "name": "Oat milk"}, callback=True)
+
+    assert response["data"]["obtained"] is True
+    record = get_stored(shoppingingredient_id)
+    assert (record.name, record.obtained) == ("Oat milk", True)
+
+def test_socket_delete_drops_the_pending_toggle(socket_client, shoppingingredient_id):
+    socket_client.emit("shoppingingredient:toggle", {"id": shoppingingredient_id, "obtained": True}, callback=True)
+    socket_client.emit("shoppingingredient:delete", {"id": shoppingingredient_id}, callback=True)
+
+    assert all(len(hot_shoppinglist["dirty"]) == 0 for hot_shoppinglist in hot_shoppinglists.values())
+    assert flush_hot_shoppinglists() == 0
+    assert get_stored(shoppingingredient_id) is None
+
+def test_non_boolean_obtained_is_rejected(client, socket_client, shoppingingredient_id):
+    assert toggle(client, shoppingingredient_id, "yes")["status"] == 400
+    assert socket_client.emit("shoppingingredient:toggle", {"id": shoppingingredient_id, "obtained": 1}, callback=True)["status"] == 400
+    assert socket_client.emit("shoppingingredient:update", {"id": shoppingingredient_id, "obtained": "no"}, callback=True)["status"] == 400
+    assert len(hot_shoppinglists) == 0
+    assert get_stored(shoppingingredient_id).obtained is False
+
+def test_unrelated_requests_leave_toggles_to_the_timer(client, shoppingingredient_id):
+    toggle(client, shoppingingredient_id, True)
+
+    client.get("/notification/get")
+
+    assert get_stored(shoppingingredient_id).obtained is False
+
+def test_a_failed_flush_keeps_the_toggle_pending(app, client, shoppingingredient_id, monkeypatch):
+    toggle(client, shoppingingredient_id, True)
+    errors = []
+    commit = db.session.commit
+    monkeypatch.setattr(app.logger, "error", errors.append)
+    def fail(*args, **kwargs):
+        raise RuntimeError("database gone")
+    monkeypatch.setattr(db.session, "commit", fail)
+
+    response = client.get(f"/shoppingingredient/get/{shoppingingredient_id}")
+
+    assert response.status_code == 200
+    assert errors == ["Hot shoppinglist flush failed: database gone"]
+    monkeypatch.setattr(db.session, "commit", commit)
+    assert flush_hot_shoppinglists() == 1
+    assert get_stored(shoppingingredient_id).obtained is True
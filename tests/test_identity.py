@@ -0,0 +1,96 @@
+import pytest
+
+from whatsfordinner.extensions import db, bcrypt
+from whatsfordinner.models import Session
+from whatsfordinner.identity import SESSION_TOKEN_HEADER, verified_sessions, get_verified_user_id, get_current_user, get_caller, get_user_settings
+
+@pytest.fixture
+def session(client):
+    data = client.post("/user/add", json={"username": "member", "password": "password", "email": "member@example.com"}).get_json()["data"]
+    return data["user"]["id"], data["token"]
+
+@pytest.fixture
+def bcrypt_checks(monkeypatch):
+    checks = []
+    check_password_hash = bcrypt.check_password_hash
+    def count_check(*args):
+        checks.append(args)
+        return check_password_hash(*args)
+    monkeypatch.setattr(bcrypt, "check_password_hash", count_check)
+    return checks
+
+def verify(app, token, address="127.0.0.1"):
+    with app.test_request_context(environ_base={"REMOTE_ADDR": address}):
+        return get_verified_user_id(token)
+
+def test_verified_sessions_are_cached(app, session, bcrypt_checks):
+    user_id, token = session
+
+    assert verify(app, token) == user_id
+    assert verify(app, token) == user_id
+    assert len(bcrypt_checks) == 1
+
+def test_sessions_are_bound_to_their_address(app, session):
+    user_id, token = session
+
+    assert verify(app, token, "10.0.0.9") is None
+    assert verify(app, "not-a-token") is None
+
+def test_a_deleted_session_stops_resolving_while_cached(app, session):
+    user_id, token = session
+    assert verify(app, token) == user_id
+
+    # Deleted without forget_sessions, as another worker would.
+    db.session.query(Session).filter(Session.token == token).delete()
+    db.session.commit()
+
+    assert verify(app, token) is None
+    assert len(verified_sessions) == 0
+
+def test_logout_forgets_the_session(app, client, session):
+    user_id, token = session
+    assert client.get("/user/get/id/1", headers={SESSION_TOKEN_HEADER: token}).status_code == 200
+    assert len(verified_sessions) == 1
+
+    client.delete(f"/user/logout/single/{token}")
+
+    assert len(verified_sessions) == 0
+    assert verify(app, token) is None
+
+@pytest.fixture
+def statements(app):
+    executed = []
+    def record(connection, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+    db.event.listen(db.engine, "before_cursor_execute", record)
+    yield executed
+    db.event.remove(db.engine, "before_cursor_execute", record)
+
+def test_requests_that_never_ask_for_the_caller_do_not_resolve_it(client, session, statements):
+    user_id, token = session
+
+    client.get("/meal/get", headers={SESSION_TOKEN_HEADER: token})
+
+    assert not any("session" in statement for statement in statements)
+
+def test_the_caller_is_resolved_once_and_reused(app, session, statements):
+    user_id, token = session
+    with app.app_context(), app.test_request_context(headers={SESSION_TOKEN_HEADER: token}, environ_base={"REMOTE_ADDR": "127.0.0.1"}):
+        user = get_caller(user_id)
+        resolved = len(statements)
+
+        assert user.id == user_id
+        assert get_current_user() is user
+        assert get_caller(str(user_id)) is user
+        assert get_user_settings(user_id) is user.settings[0]
+        assert len(statements) == resolved
+
+def test_other_users_are_not_the_caller(app, client, session):
+    user_id, token = session
+    other_id = client.post("/user/add", json={"username": "other", "password": "password", "email": "other@example.com"}).get_json()["data"]["user"]["id"]
+
+    with app.app_context(), app.test_request_context(headers={SESSION_TOKEN_HEADER: token}, environ_base={"REMOTE_ADDR": "127.0.0.1"}):
+        assert get_caller(other_id).id == other_id
+    with app.app_context(), app.test_request_context():
+        assert get_current_user() is None
+        assert get_caller(user_id).id == user_id
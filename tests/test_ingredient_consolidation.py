@@ -0,0 +1,36 @@
+import pytest
+
+from fractions import Fraction
+
+from whatsfordinner.ingredient_consolidation import parse_number, parse_ingredient, consolidate
+
+def test_parse_number():
+    assert parse_number("2") == 2
+    assert parse_number(" 1 1/2 ") == Fraction(3, 2)
+    assert parse_number(".25") == Fraction(1, 4)
+
+@pytest.mark.parametrize("text", ["1/0", "0/0", "1 1/0"])
+def test_parse_number_rejects_zero_denominators(text):
+    assert parse_number(text) is None
+
+def test_parse_ingredient_converts_units():
+    assert parse_ingredient("Eggs", "2-3", None) == ("egg", "count", 2, 3, "")
+    assert parse_ingredient("Flour", "1 ½", "Cups") == ("flour", "volume", Fraction("354.882"), Fraction("354.882"), "cup")
+
+@pytest.mark.parametrize("amount", ["1/0", "0/0 cups", "1-1/0", "some"])
+def test_parse_ingredient_leaves_bad_amounts_unparsed(amount):
+    assert parse_ingredient("Sugar", amount, "cup") == ("sugar", None, None, None, "cup")
+
+def test_consolidate_merges_parsed_and_keeps_unparsed():
+    results = consolidate([
+        {"id": 1, "name": "Milk", "amount": "1", "unit": "cup", "multiplier": 2, "obtained": True, "meal_name": "Pancakes"},
+        {"id": 2, "name": "milk", "amount": "4", "unit": "tbsp", "multiplier": 1, "obtained": False, "meal_name": "Waffles"},
+        {"id": 3, "name": "Milk", "amount": "0/0", "unit": "cup", "multiplier": 1, "obtained": False, "meal_name": None}
+    ])
+
+    assert [(result["amount"], result["unit"], result["parsed"], result["shoppingingredient_ids"]) for result in results] == [
+        ("2 1/4", "cup", True, [1, 2]),
+        ("0/0", "cup", False, [3])
+    ]
+    assert results[0]["obtained"] is False
+    assert results[0]["meal_names"] == ["Pancakes", "Waffles"]
@@ -0,0 +1,74 @@
+import pytest
+
+import random
+
+from whatsfordinner.extensions import db
+from whatsfordinner.models import User, Meal, Mealplan
+from whatsfordinner.mealplan_generator import build_candidate, normalize_rule, solve_mealplan
+
+CANDIDATES = [
+    build_candidate(1, 1, [(10, "Pasta")]),
+    build_candidate(2, 2, [(10, "Pasta")]),
+    build_candidate(3, 3, [(11, "Soup")]),
+    build_candidate(4, 3, [(11, "Soup")]),
+    build_candidate(5, 5, [])
+]
+
+def test_normalize_rule_accepts_aliases():
+    assert normalize_rule({"rule_type": "Category", "rule": ">=", "amount": "2", "value": " Pasta "}) == ("category", "at least", 2, "pasta")
+    assert normalize_rule({"rule_type": "difficulty", "rule": "max", "amount": "many", "value": 3}) == ("difficulty", "at most", 0, "3")
+
+@pytest.mark.parametrize("rule", ["category", ["category"], None, 5])
+def test_normalize_rule_rejects_non_objects(rule):
+    with pytest.raises(ValueError):
+        normalize_rule(rule)
+
+def test_solve_mealplan_meets_minimums_and_maximums():
+    rules = [
+        {"rule_type": "category", "rule": "at least", "amount": 2, "value": "pasta"},
+        {"rule_type": "difficulty", "rule": "none", "value": "5"},
+        {"rule_type": "category", "rule": "at most", "amount": 1, "value": "11"}
+    ]
+
+    for seed in range(20):
+        meal_ids, unsatisfied = solve_mealplan(CANDIDATES, rules, 3, random.Random(seed))
+        assert unsatisfied == []
+        assert sorted(meal_ids)[:2] == [1, 2]
+        assert 5 not in meal_ids
+        assert len(set(meal_ids) & {3, 4}) == 1
+
+def test_solve_mealplan_reports_impossible_rules():
+    rules = [{"rule_type": "category", "rule": "exactly", "amount": 3, "value": "soup"}]
+
+    meal_ids, unsatisfied = solve_mealplan(CANDIDATES, rules, 4, random.Random(0))
+
+    assert unsatisfied == [0]
+    assert {3, 4} <= set(meal_ids)
+    assert len(meal_ids) == 4
+
+def test_solve_mealplan_is_reproducible_with_a_seed():
+    first = solve_mealplan(CANDIDATES, [], 3, random.Random(42))
+    assert solve_mealplan(CANDIDATES, [], 3, random.Random(42)) == first
+
+@pytest.fixture
+def user_id(app):
+    user = User("planner", "password", "planner@example.com")
+    db.session.add(user)
+    db.session.commit()
+    db.session.add_all([Meal(f"Meal {number}", None, None, number, user.username, user.username, user.id) for number in range(1, 4)])
+    db.session.commit()
+    return user.id
+
+@pytest.mark.parametrize("rules", [["category"], [None], {"rule_type": "category"}])
+def test_generate_rejects_malformed_rules(client, user_id, rules):
+    response = client.post("/mealplan/generate", json={"user_id": user_id, "number": 2, "rules": rules}).get_json()
+
+    assert response["status"] == 400
+
+def test_generate_persists_without_a_name(client, user_id):
+    response = client.post("/mealplan/generate", json={"user_id": user_id, "number": 2, "persist": True, "seed": 1}).get_json()
+
+    assert response["status"] == 200
+    assert len(response["data"]["meals"]) == 2
+    assert response["data"]["mealplan"]["name"] == "Generated Mealplan"
+    assert db.session.query(Mealplan.name).scalar() == "Generated Mealplan"
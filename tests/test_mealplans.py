@@ -0,0 +1,87 @@
+import pytest
+
+from whatsfordinner.extensions import db
+from whatsfordinner.models import shared_meals_table, User, Meal, Recipe, Ingredient, Mealplan, Mealplanoutline, Rule
+
+def add_user(username):
+    user = User(username, "password", f"{username}@example.com")
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+def add_meal(user, name, difficulty):
+    meal = Meal(name, None, None, difficulty, user.username, user.username, user.id)
+    db.session.add(meal)
+    db.session.commit()
+    recipe = Recipe(meal.id)
+    db.session.add(recipe)
+    db.session.commit()
+    db.session.add(Ingredient(f"{name} ingredient", "1", "cup", "Pantry", recipe.id, None))
+    db.session.commit()
+    return meal.id
+
+@pytest.fixture
+def planner(app):
+    user = add_user("planner")
+    other = add_user("other")
+    meal_ids = [add_meal(user, f"Meal {difficulty}", difficulty) for difficulty in (1, 2, 2)]
+    outline = Mealplanoutline("Weeknights", 2, user.id)
+    db.session.add(outline)
+    db.session.commit()
+    db.session.add(Rule("difficulty", "exactly", 2, "2", None, outline.id))
+    db.session.commit()
+    return {
+        "outline_id": outline.id,
+        "user_id": user.id,
+        "other_id": other.id,
+        "meal_ids": meal_ids,
+        "other_meal_id": add_meal(other, "Other meal", 1)
+    }
+
+def instantiate(client, outline_id, **data):
+    return client.post(f"/mealplanoutline/instantiate/{outline_id}", json=data).get_json()
+
+def test_instantiate_generates_a_mealplan_from_the_outline(client, planner):
+    response = instantiate(client, planner["outline_id"], seed=1)
+
+    assert response["status"] == 200
+    mealplan = response["data"]["mealplan"]
+    assert mealplan["name"] == "Weeknights"
+    assert sorted(meal["id"] for meal in mealplan["meals"]) == planner["meal_ids"][1:]
+    assert [(rule["rule_type"], rule["rule"], rule["amount"], rule["value"]) for rule in mealplan["rules"]] == [("difficulty", "exactly", 2, "2")]
+    assert sorted(item["name"] for item in mealplan["shoppinglist"]["shoppingingredients"]) == ["Meal 2 ingredient", "Meal 2 ingredient"]
+    assert response["data"]["unsatisfied_rules"] == []
+
+def test_instantiate_reports_rules_it_cannot_satisfy(client, planner):
+    db.session.add(Rule("difficulty", "at least", 1, "5", None, planner["outline_id"]))
+    db.session.commit()
+
+    response = instantiate(client, planner["outline_id"], seed=1)
+
+    assert response["status"] == 200
+    assert [(rule["rule"], rule["value"]) for rule in response["data"]["unsatisfied_rules"]] == [("at least", "5")]
+    assert len(response["data"]["mealplan"]["meals"]) == 2
+
+def test_instantiate_uses_the_meals_given(client, planner):
+    response = instantiate(client, planner["outline_id"], meals=planner["meal_ids"][:1], name="Just one")
+
+    assert response["status"] == 200
+    assert response["data"]["mealplan"]["name"] == "Just one"
+    assert [meal["id"] for meal in response["data"]["mealplan"]["meals"]] == planner["meal_ids"][:1]
+
+def test_instantiate_accepts_meals_shared_with_the_outline_user(client, planner):
+    db.session.execute(shared_meals_table.insert().values(user_id=planner["user_id"], meal_id=planner["other_meal_id"]))
+    db.session.commit()
+
+    response = instantiate(client, planner["outline_id"], meals=[planner["other_meal_id"]])
+
+    assert response["status"] == 200
+
+@pytest.mark.parametrize("meals", [["other"], [999], ["soup"], 5])
+def test_instantiate_rejects_meals_the_user_cannot_plan(client, planner, meals):
+    meals = [planner["other_meal_id"]] if meals == ["other"] else meals
+
+    response = instantiate(client, planner["outline_id"], meals=meals)
+
+    assert response["status"] == 400
+    assert db.session.query(Mealplan).count() == 0
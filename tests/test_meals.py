@@ -0,0 +1,68 @@
+import pytest
+
+from whatsfordinner.extensions import db
+from whatsfordinner.models import User, Meal, Category
+
+@pytest.fixture
+def user_id(app):
+    user = User("cook", "password", "cook@example.com")
+    db.session.add(user)
+    db.session.commit()
+    pasta = Category("Pasta", user.id)
+    meals = [Meal(name, None, None, 1, user.username, user.username, user.id) for name in ("Spaghetti", "Lasagna", "Chili")]
+    meals[0].categories.append(pasta)
+    meals[1].categories.append(pasta)
+    db.session.add_all(meals)
+    db.session.commit()
+    return user.id
+
+def test_get_meals_by_category(client, user_id):
+    category_id = db.session.query(Category.id).scalar()
+
+    response = client.get(f"/meal/get/category?user_id={user_id}&none={category_id}").get_json()
+
+    assert response["status"] == 200
+    assert response["data"]["meal_ids"] == [db.session.query(Meal.id).filter(Meal.name == "Chili").scalar()]
+
+@pytest.mark.parametrize("query", ["all=abc", "any=1,x", "none=1.5"])
+def test_get_meals_by_category_rejects_bad_ids(client, user_id, query):
+    response = client.get(f"/meal/get/category?user_id={user_id}&{query}").get_json()
+
+    assert response["status"] == 400
+
+@pytest.mark.parametrize("user_id", ["abc", "1.5", ""])
+def test_get_meals_by_category_rejects_bad_user_ids(client, user_id):
+    response = client.get(f"/meal/get/category?user_id={user_id}").get_json()
+
+    assert response == {"status": 400, "message": "Error: user_id must be a number.", "data": {}}
+
+def test_get_meals_by_recency(client, user_id):
+    response = client.get(f"/meal/get/recency?user_id={user_id}&limit=2").get_json()
+
+    assert response["status"] == 200
+    assert [meal["name"] for meal in response["data"]["meals"]] == ["Spaghetti", "Lasagna"]
+
+def test_get_meals_by_recency_clamps_negative_limits(client, user_id):
+    response = client.get(f"/meal/get/recency?user_id={user_id}&limit=-5").get_json()
+
+    assert response["status"] == 200
+    assert response["data"]["meals"] == []
+
+@pytest.mark.parametrize("limit", ["ten", "1.5", ""])
+def test_get_meals_by_recency_rejects_bad_limits(client, user_id, limit):
+    response = client.get(f"/meal/get/recency?user_id={user_id}&limit={limit}").get_json()
+
+    assert response["status"] == 400
+
+def test_search_meals_pages_results(client, user_id):
+    response = client.get(f"/search?user_id={user_id}&q=lasagna&per_page=500").get_json()
+
+    assert response["status"] == 200
+    assert [result["name"] for result in response["data"]["results"]] == ["Lasagna"]
+    assert (response["data"]["page"], response["data"]["per_page"], response["data"]["has_more"]) == (1, 100, False)
+
+@pytest.mark.parametrize("query", ["page=two", "per_page=", "per_page=2.5"])
+def test_search_meals_rejects_bad_paging(client, user_id, query):
+    response = client.get(f"/search?user_id={user_id}&q=lasagna&{query}").get_json()
+
+    assert response["status"] == 400
@@ -0,0 +1,57 @@
+import pytest
+
+import re
+
+from whatsfordinner.metrics import Counter, Histogram, render_metrics
+
+def test_histograms_render_cumulative_buckets():
+    histogram = Histogram("test_seconds", "Test latency.", ("route",), (0.1, 1))
+    for value in [0.05, 0.5, 0.5, 3]:
+        histogram.observe(("/a",), value)
+    counter = Counter("test_total", "Test count.")
+    counter.inc(amount=2)
+
+    assert render_metrics([histogram, counter]).splitlines() == [
+        "# HELP test_seconds Test latency.",
+        "# TYPE test_seconds histogram",
+        'test_seconds_bucket{route="/a",le="0.1"} 1',
+        'test_seconds_bucket{route="/a",le="1"} 3',
+        'test_seconds_bucket{route="/a",le="+Inf"} 4',
+        'test_seconds_count{route="/a"} 4',
+        'test_seconds_sum{route="/a"} 4.05',
+        "# HELP test_total Test count.",
+        "# TYPE test_total counter",
+        "test_total 2"
+    ]
+
+def get_sample(text, name, labels):
+    match = re.search(rf"^{name}{re.escape(labels)} (\S+)$", text, re.MULTILINE)
+    return float(match.group(1)) if match is not None else 0
+
+def test_metrics_record_each_request_by_route(client):
+    before = client.get("/metrics").get_data(as_text=True)
+
+    client.get("/shoppingingredient/get")
+    client.get("/shoppingingredient/get")
+    response = client.get("/metrics")
+
+    assert response.mimetype == "text/plain"
+    text = response.get_data(as_text=True)
+    labels = '{method="GET",route="/shoppingingredient/get"}'
+    assert get_sample(text, "whatsfordinner_http_request_duration_seconds_count", '{method="GET",route="/shoppingingredient/get",status="200"}') == get_sample(before, "whatsfordinner_http_request_duration_seconds_count", '{method="GET",route="/shoppingingredient/get",status="200"}') + 2
+    assert get_sample(text, "whatsfordinner_http_request_sql_statements_count", labels) == get_sample(before, "whatsfordinner_http_request_sql_statements_count", labels) + 2
+    assert get_sample(text, "whatsfordinner_http_request_sql_statements_sum", labels) >= get_sample(before, "whatsfordinner_http_request_sql_statements_sum", labels) + 2
+    assert get_sample(text, "whatsfordinner_http_response_size_bytes_sum", labels) == get_sample(before, "whatsfordinner_http_response_size_bytes_sum", labels) + 2 * len(client.get("/shoppingingredient/get").get_data())
+    for phase in ["db", "serialization", "socket_emit"]:
+        assert f'whatsfordinner_http_request_phase_seconds_count{{route="/shoppingingredient/get",phase="{phase}"}}' in text
+
+def test_metrics_need_the_api_credentials(app, client):
+    assert client.get("/metrics", environ_base={"HTTP_AUTHORIZATION": ""}).get_json()["status"] == 403
+    assert client.get("/metrics").status_code == 200
+
+def test_metrics_token_replaces_the_api_credentials(app, client, monkeypatch):
+    monkeypatch.setitem(app.config, "METRICS_TOKEN", "scrape")
+
+    assert client.get("/metrics").get_json()["status"] == 403
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).get_json()["status"] == 403
+    assert client.get("/metrics", headers={"Authorization": "Bearer scrape"}).mimetype == "text/plain"
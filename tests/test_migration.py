@@ -0,0 +1,69 @@
+import pytest
+
+from datetime import date, datetime
+
+from whatsfordinner import create_app
+from whatsfordinner.extensions import db
+from whatsfordinner.models import Meal, Mealplan, Mealplanoutline, Shoppinglist
+
+# The tables as they were before dates, times and outline sizes were typed.
+OLD_TABLES = [
+    "CREATE TABLE meal (id INTEGER PRIMARY KEY, name VARCHAR NOT NULL, sleep_until VARCHAR)",
+    "CREATE TABLE mealplan (id INTEGER PRIMARY KEY, name VARCHAR NOT NULL, created_on VARCHAR NOT NULL)",
+    "CREATE TABLE mealplanoutline (id INTEGER PRIMARY KEY, name VARCHAR NOT NULL, number VARCHAR NOT NULL)",
+    "CREATE TABLE shoppinglist (id INTEGER PRIMARY KEY, name VARCHAR NOT NULL, created_on VARCHAR NOT NULL)"
+]
+
+OLD_ROWS = {
+    "meal": ("sleep_until", ["2024-03-05", "Tue Mar 05 2024", None, "someday"]),
+    "mealplan": ("created_on", ["2024-03-05T10:00:00Z", "Tue Mar 05 2024 12:00:00 GMT+0200", "3/5/2024, 10:00:00 AM", "soon"]),
+    "mealplanoutline": ("number", ["3", "2.0", "7", "many"]),
+    "shoppinglist": ("created_on", ["2024-03-05T10:00:00Z", "3/5/2024", "Tue Mar 05 2024", ""])
+}
+
+@pytest.fixture
+def old_app(app, tmp_path, monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'old.db'}")
+    old_app = create_app()
+    with old_app.app_context():
+        with db.engine.begin() as connection:
+            for statement in OLD_TABLES:
+                connection.execute(db.text(statement))
+            for table_name, (column_name, values) in OLD_ROWS.items():
+                connection.execute(db.text(f"INSERT INTO {table_name} (id, name, {column_name}) VALUES (:id, 'Old', :value)"), [{"id": id, "value": value} for id, value in enumerate(values, 1)])
+        yield old_app
+
+def migrate(old_app):
+    result = old_app.test_cli_runner().invoke(args=["migrate-schema"])
+    assert result.exit_code == 0, result.output
+    return result.output
+
+def get_values(column):
+    return [value for id, value in db.session.execute(db.select(column.class_.id, column).order_by(column.class_.id)).all()]
+
+def test_string_columns_are_converted_to_typed_columns(old_app):
+    started = datetime.utcnow()
+
+    output = migrate(old_app)
+
+    columns = {table_name: {column["name"]: column["type"] for column in db.inspect(db.engine).get_columns(table_name)} for table_name in OLD_ROWS}
+    assert all(not isinstance(columns[table_name][column_name], db.String) for table_name, (column_name, values) in OLD_ROWS.items())
+    assert "user_id" in columns["mealplan"]
+    assert "meal.sleep_until: converted 4 rows, 1 unparseable" in output
+    assert "shoppinglist.created_on: converted 4 rows, 0 unparseable" in output
+
+    assert get_values(Meal.sleep_until) == [date(2024, 3, 5), date(2024, 3, 5), None, date.max]
+    mealplan_dates = get_values(Mealplan.created_on)
+    assert mealplan_dates[:3] == [datetime(2024, 3, 5, 10), datetime(2024, 3, 5, 10), datetime(2024, 3, 5, 10)]
+    assert mealplan_dates[3] >= started
+    assert get_values(Mealplanoutline.number) == [3, 2, 7, 0]
+    shoppinglist_dates = get_values(Shoppinglist.created_on)
+    assert shoppinglist_dates[:3] == [datetime(2024, 3, 5, 10), datetime(2024, 3, 5), datetime(2024, 3, 5)]
+    assert shoppinglist_dates[3] >= started
+
+def test_migrating_again_changes_nothing(old_app):
+    migrate(old_app)
+    before = get_values(Mealplan.created_on)
+
+    assert "converted" not in migrate(old_app)
+    assert get_values(Mealplan.created_on) == before
@@ -0,0 +1,41 @@
+import pytest
+
+from flask import jsonify
+
+from whatsfordinner.extensions import db
+from whatsfordinner.models import User
+from whatsfordinner.query_tracker import NPlusOneError, QueryTracker
+
+def test_tracker_reports_statements_repeated_with_different_parameters():
+    tracker = QueryTracker(3)
+
+    assert [tracker.record("SELECT meal", (id,), "User.meals") for id in [1, 2, 2, 3, 4]] == [False, False, False, True, False]
+    assert tracker.record("SELECT user", (1,)) is False
+    assert tracker.repeated() == [{
+        "statement": "SELECT meal",
+        "count": 5,
+        "distinct_parameters": 4,
+        "relationships": ["User.meals"]
+    }]
+
+# The suite runs with NPLUSONE_MODE=raise (see conftest.py), so a route that
+# lazy loads inside a loop fails its test.
+@pytest.fixture
+def users(app, monkeypatch):
+    monkeypatch.setitem(app.config, "TESTING", True)
+    db.session.add_all([User(f"user{number}", "password", f"user{number}@example.com") for number in range(3)])
+    db.session.commit()
+
+    @app.route("/test/meal-counts/<loading>")
+    def get_meal_counts(loading):
+        query = db.session.query(User)
+        if loading == "batched":
+            query = query.options(db.selectinload(User.meals))
+        return jsonify({user.username: len(user.meals) for user in query.all()})
+
+def test_lazy_loads_in_a_loop_raise(client, users):
+    with pytest.raises(NPlusOneError, match="User.meals"):
+        client.get("/test/meal-counts/lazy")
+
+def test_batched_loads_pass(client, users):
+    assert client.get("/test/meal-counts/batched").get_json() == {"user0": 0, "user1": 0, "user2": 0}
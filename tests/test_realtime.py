@@ -0,0 +1,111 @@
+import pytest
+
+import msgpack
+from flask import jsonify, request
+
+from whatsfordinner import realtime
+from whatsfordinner.extensions import db
+from whatsfordinner.models import User, EventLog
+from whatsfordinner.realtime import BROADCAST_ROOM, emit_event, event_log_sequences, event_log_buffers, msgpack_sids
+
+def test_emit_event_leaves_the_session_alone(app):
+    db.session.add(User("pending", "password", "pending@example.com"))
+
+    emit_event("test-update", {"data": {}, "type": "update"})
+    db.session.rollback()
+
+    assert db.session.query(User).count() == 0
+    assert [(record.room, record.seq) for record in db.session.query(EventLog).all()] == [(BROADCAST_ROOM, 1)]
+
+def test_resume_replays_missed_events(socket_client):
+    emit_event("test-update", {"data": {"id": 1}, "type": "update"})
+    emit_event("test-update", {"data": {"id": 2}, "type": "update"})
+    socket_client.get_received()
+
+    response = socket_client.emit("resume", {"last_seq": 1}, callback=True)
+
+    assert response["status"] == 200
+    assert response["data"] == {"room": BROADCAST_ROOM, "seq": 2, "replayed": 1, "resync": False}
+    assert [(event["name"], event["args"][0]["seq"]) for event in socket_client.get_received()] == [("test-update", 2)]
+
+def test_resume_reads_evicted_events_from_the_table(socket_client):
+    emit_event("test-update", {"data": {"id": 1}, "type": "update"})
+    emit_event("test-update", {"data": {"id": 2}, "type": "update"})
+    event_log_buffers[BROADCAST_ROOM].clear()
+
+    response = socket_client.emit("resume", {"last_seq": "0"}, callback=True)
+
+    assert response["data"]["replayed"] == 2
+
+def test_resume_rejects_bad_last_seq(socket_client):
+    for last_seq in ["abc", [1], {}]:
+        response = socket_client.emit("resume", {"last_seq": last_seq}, callback=True)
+        assert response["status"] == 400
+
+def test_resume_rejects_unknown_rooms(socket_client):
+    for room in ["someone-else", 5]:
+        response = socket_client.emit("resume", {"room": room, "last_seq": 0}, callback=True)
+        assert response["status"] == 400
+    assert "someone-else" not in event_log_sequences
+
+def test_resume_requires_authorization(app):
+    socket_client = app.extensions["socketio"].test_client(app, auth={"username": "test", "password": "wrong"})
+
+    response = socket_client.emit("resume", {"last_seq": 0}, callback=True)
+
+    assert response["status"] == 403
+    socket_client.disconnect()
+
+def test_msgpack_connections_get_packed_payloads(app, socket_client):
+    msgpack_client = app.extensions["socketio"].test_client(app, auth={"username": "test", "password": "secret", "serializer": "msgpack"})
+    assert msgpack_client.get_received()[0]["args"][0]["data"] == {"serializer": "msgpack"}
+    assert socket_client.get_received()[0]["args"][0]["data"] == {"serializer": "json"}
+
+    emit_event("test-update", {"data": {"id": 1}, "type": "update"})
+
+    packed = msgpack_client.get_received()[0]["args"][0]
+    assert isinstance(packed, bytes)
+    assert msgpack.unpackb(packed, raw=False) == {"data": {"id": 1}, "type": "update", "seq": 1}
+    assert socket_client.get_received()[0]["args"][0] == {"data": {"id": 1}, "type": "update", "seq": 1}
+
+    sid = next(iter(msgpack_sids))
+    msgpack_client.disconnect()
+    assert sid not in msgpack_sids
+
+@pytest.fixture
+def emit_route(app, monkeypatch):
+    monkeypatch.setitem(app.config, "TESTING", True)
+
+    @app.route("/test/emit/<int:count>")
+    def emit_events(count):
+        for id in range(count):
+            emit_event("test-update", {"data": {"id": id}, "type": "update"})
+        if request.args.get("fail"):
+            raise RuntimeError("handler failed")
+        return jsonify({"status": 200})
+
+def test_request_events_are_logged_in_one_insert_before_they_are_sent(client, emit_route, monkeypatch):
+    inserts = []
+    sent = []
+    def record_insert(connection, cursor, statement, parameters, context, executemany):
+        if statement.startswith("INSERT INTO event_log"):
+            inserts.append(statement)
+    monkeypatch.setattr(realtime, "send_event", lambda event, payload, room=None: sent.append((payload["seq"], db.session.query(EventLog).count())))
+    db.event.listen(db.engine, "before_cursor_execute", record_insert)
+    try:
+        client.get("/test/emit/3")
+    finally:
+        db.event.remove(db.engine, "before_cursor_execute", record_insert)
+
+    assert len(inserts) == 1
+    assert sent == [(1, 3), (2, 3), (3, 3)]
+
+def test_failed_requests_log_and_send_no_events(client, socket_client, emit_route):
+    socket_client.get_received()
+
+    with pytest.raises(RuntimeError):
+        client.get("/test/emit/2?fail=1")
+    client.get("/test/emit/1")
+
+    assert db.session.query(EventLog.seq).all() == [(1,)]
+    assert [event["args"][0]["data"] for event in socket_client.get_received()] == [{"id": 0}]
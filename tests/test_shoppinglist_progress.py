@@ -0,0 +1,57 @@
+import pytest
+
+from datetime import datetime
+
+from whatsfordinner.extensions import db
+from whatsfordinner.models import User, Shoppinglist
+from whatsfordinner.hot_shoppinglists import hot_shoppinglist_flusher, flush_hot_shoppinglists
+
+@pytest.fixture
+def shoppinglist(app):
+    user = User("shopper", "password", "shopper@example.com")
+    db.session.add(user)
+    db.session.commit()
+    shoppinglist = Shoppinglist("Groceries", datetime(2024, 1, 1), False, False, user.username, user.id, None)
+    db.session.add(shoppinglist)
+    db.session.commit()
+    return shoppinglist
+
+def add(client, shoppinglist, name, category):
+    return client.post("/shoppingingredient/add", json={"name": name, "amount": "1", "unit": None, "category": category, "shoppinglist_id": shoppinglist.id}).get_json()["data"]["id"]
+
+def get_progress(client, shoppinglist):
+    return client.get(f"/shoppinglist/summary?user_id={shoppinglist.user_id}").get_json()["data"][0]["progress"]
+
+def counts(total, obtained, **categories):
+    return {
+        "total": total,
+        "obtained": obtained,
+        "categories": {category: {"total": category_total, "obtained": category_obtained} for category, (category_total, category_obtained) in categories.items()}
+    }
+
+def test_progress_follows_adds_updates_toggles_and_deletes(app, client, shoppinglist, monkeypatch):
+    milk = add(client, shoppinglist, "Milk", "Dairy")
+    add(client, shoppinglist, "Butter", "Dairy")
+    bread = add(client, shoppinglist, "Bread", "Produce")
+    assert get_progress(client, shoppinglist) == counts(3, 0, Dairy=(2, 0), Produce=(1, 0))
+
+    client.put(f"/shoppingingredient/update/{milk}", json={"obtained": True})
+    assert get_progress(client, shoppinglist) == counts(3, 1, Dairy=(2, 1), Produce=(1, 0))
+
+    client.put(f"/shoppingingredient/update/{bread}", json={"category": "Bakery"})
+    assert get_progress(client, shoppinglist) == counts(3, 1, Dairy=(2, 1), Bakery=(1, 0))
+
+    monkeypatch.setitem(app.config, "HOT_SHOPPINGLISTS", True)
+    monkeypatch.setitem(hot_shoppinglist_flusher, "running", True)
+    client.put(f"/shoppingingredient/update/{bread}", json={"obtained": True})
+    flush_hot_shoppinglists()
+    assert get_progress(client, shoppinglist) == counts(3, 2, Dairy=(2, 1), Bakery=(1, 1))
+
+    client.delete(f"/shoppingingredient/delete/{milk}")
+    assert get_progress(client, shoppinglist) == counts(2, 1, Dairy=(1, 0), Bakery=(1, 1))
+
+    assert app.test_cli_runner().invoke(args=["rebuild-shoppinglist-progress"]).exit_code == 0
+    assert get_progress(client, shoppinglist) == counts(2, 1, Dairy=(1, 0), Bakery=(1, 1))
+
+def test_lists_without_items_have_no_progress(client, shoppinglist):
+    assert get_progress(client, shoppinglist) == counts(0, 0)
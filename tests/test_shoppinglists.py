@@ -0,0 +1,53 @@
+import pytest
+
+from datetime import datetime
+
+from whatsfordinner.extensions import db
+from whatsfordinner.models import User, Shoppinglist, Shoppingingredient
+
+@pytest.fixture
+def shoppinglist_id(app):
+    user = User("shopper", "password", "shopper@example.com")
+    db.session.add(user)
+    db.session.commit()
+    shoppinglist = Shoppinglist("Groceries", datetime(2024, 1, 1), False, False, user.username, user.id, None)
+    db.session.add(shoppinglist)
+    db.session.commit()
+    db.session.add_all([Shoppingingredient(name, "1", None, category, 1, None, shoppinglist.id, None) for name, category in (("Milk", "Dairy"), ("Apples", "Produce"), ("Butter", "Dairy"))])
+    db.session.commit()
+    return shoppinglist.id
+
+def test_sorted_shoppinglist_loads_its_items_once(app, client, shoppinglist_id):
+    statements = []
+    def record_statement(connection, cursor, statement, parameters, context, executemany):
+        if "FROM shoppingingredient" in statement:
+            statements.append(statement)
+    db.event.listen(db.engine, "before_cursor_execute", record_statement)
+    try:
+        data = client.get(f"/shoppinglist/get/{shoppinglist_id}?sort=name").get_json()
+    finally:
+        db.event.remove(db.engine, "before_cursor_execute", record_statement)
+
+    assert [item["name"] for item in data["shoppingingredients"]] == ["Apples", "Butter", "Milk"]
+    assert "progress" not in data
+    assert len(statements) == 1
+
+def test_sorted_shoppinglist_matches_the_unsorted_one(client, shoppinglist_id):
+    unsorted = client.get(f"/shoppinglist/get/{shoppinglist_id}").get_json()
+    data = client.get(f"/shoppinglist/get/{shoppinglist_id}?sort=category").get_json()
+
+    assert [item["name"] for item in data["shoppingingredients"]] == ["Butter", "Milk", "Apples"]
+    assert sorted(data["shoppingingredients"], key=lambda item: item["id"]) == sorted(unsorted["shoppingingredients"], key=lambda item: item["id"])
+    assert dict(data, shoppingingredients=None) == dict(unsorted, shoppingingredients=None)
+
+def test_consolidated_shoppinglist(client, shoppinglist_id):
+    response = client.get(f"/shoppinglist/consolidated/{shoppinglist_id}").get_json()
+
+    assert response["status"] == 200
+    assert response["data"]["shoppinglist_id"] == shoppinglist_id
+    assert sorted(item["name"] for item in response["data"]["shoppingingredients"]) == ["Apples", "Butter", "Milk"]
+
+def test_consolidated_shoppinglist_rejects_bad_ids(client):
+    response = client.get("/shoppinglist/consolidated/abc").get_json()
+
+    assert response == {"status": 400, "message": "Error: Shoppinglist id must be a number.", "data": {}}
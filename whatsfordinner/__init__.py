@@ -0,0 +1,80 @@
+from flask import Flask
+from flask_cors import CORS
+from werkzeug.middleware.proxy_fix import ProxyFix
+
+import atexit
+
+from whatsfordinner.db_pool import configure_sqlite, make_psycopg2_green
+from whatsfordinner.config import configure
+from whatsfordinner.extensions import db, ma, bcrypt
+
+# Application Factory
+# Everything below the extensions is imported inside create_app, so importing
+# the package stays cheap. The blueprints split the routes by domain. With
+# socketio=False (serverless.py) flask_socketio is never imported, the socket
+# event handlers are not registered, broadcasts are skipped and the background
+# tasks that need Socket.IO (hot shoppinglists and the autodelete scheduler)
+# stay off.
+def create_app(socketio=True):
+    app = Flask(__name__)
+    configure(app)
+
+    if socketio:
+        from flask_socketio import SocketIO
+        socketio = SocketIO(app, cors_allowed_origins="*")
+        if socketio.async_mode == "eventlet" and app.config["SQLALCHEMY_DATABASE_URI"].startswith("postgresql://"):
+            make_psycopg2_green()
+    else:
+        app.config["HOT_SHOPPINGLISTS"] = False
+    app.wsgi_app = ProxyFix(app.wsgi_app)
+
+    db.init_app(app)
+    ma.init_app(app)
+    bcrypt.init_app(app)
+    CORS(app)
+
+    from whatsfordinner.instrumentation import TimedJSONProvider, start_request_metrics, record_request_metrics, start_query_tracker, report_repeated_queries
+    from whatsfordinner.compression import compress_response
+    from whatsfordinner.auth import before_request
+    from whatsfordinner.db_routing import route_request
+    from whatsfordinner.realtime import start_pending_events, publish_pending_events
+    from whatsfordinner.meal_search import rebuild_search
+    from whatsfordinner.meal_recency import rebuild_meal_recency
+    from whatsfordinner.migration import migrate_schema
+    from whatsfordinner.shoppinglist_progress import rebuild_shoppinglist_progress
+    from whatsfordinner.autodelete import autodelete
+    from whatsfordinner.blueprints import users, notifications, meals, recipes, mealplans, shoppinglists, stats
+
+    app.json = TimedJSONProvider(app)
+    app.before_request(start_request_metrics)
+    app.before_request(start_query_tracker)
+    app.before_request(before_request)
+    app.before_request(route_request)
+    app.before_request(start_pending_events)
+    app.after_request(record_request_metrics)
+    app.after_request(report_repeated_queries)
+    app.after_request(publish_pending_events)
+    # Registered last so it runs first: /metrics then sees the bytes sent.
+    app.after_request(compress_response)
+
+    for blueprint in [users.bp, notifications.bp, meals.bp, recipes.bp, mealplans.bp, shoppinglists.bp, stats.bp]:
+        app.register_blueprint(blueprint)
+    for command in [rebuild_search, rebuild_meal_recency, migrate_schema, rebuild_shoppinglist_progress, autodelete]:
+        app.cli.add_command(command)
+
+    # An in-memory SQLite database starts empty in every process, so it gets
+    # its tables here; file databases are set up with `flask migrate-schema`.
+    with app.app_context():
+        for engine in db.engines.values():
+            if engine.dialect.name == "sqlite":
+                configure_sqlite(engine)
+        if db.engine.dialect.name == "sqlite" and db.engine.url.database in (None, "", ":memory:"):
+            db.create_all(bind_key=None)
+
+    if socketio:
+        from whatsfordinner.socket_events import register_socket_events
+        from whatsfordinner.hot_shoppinglists import flush_hot_shoppinglists_on_exit
+        register_socket_events(socketio)
+        atexit.register(flush_hot_shoppinglists_on_exit, app)
+
+    return app
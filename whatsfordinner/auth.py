@@ -0,0 +1,32 @@
+from flask import current_app, request, jsonify
+
+from whatsfordinner.hot_shoppinglists import SHOPPINGLIST_BLUEPRINTS, hot_shoppinglists, flush_hot_shoppinglists, is_hot_toggle
+from whatsfordinner.autodelete import start_autodelete_scheduler
+
+# Authorization
+def check_authorization(auth):
+    return auth is not None and auth.get("username") == current_app.config["AUTH_USERNAME"] and auth.get("password") == current_app.config["AUTH_PASSWORD"]
+
+def check_metrics_authorization():
+    if current_app.config["METRICS_TOKEN"]:
+        return request.headers.get("Authorization") == f"Bearer {current_app.config['METRICS_TOKEN']}"
+    return check_authorization(request.authorization)
+
+def before_request():
+    if request.endpoint == "stats.get_metrics":
+        return
+
+    if not check_authorization(request.authorization):
+        return jsonify({
+            "status": 403,
+            "message": "Unauthorized",
+            "data": {}
+        })
+
+    if len(hot_shoppinglists) > 0 and request.blueprint in SHOPPINGLIST_BLUEPRINTS and not (request.endpoint == "shoppinglists.update_shoppingingredient" and is_hot_toggle(request.get_json(silent=True))):
+        try:
+            flush_hot_shoppinglists()
+        except Exception as error:
+            current_app.logger.error(f"Hot shoppinglist flush failed: {error}")
+
+    start_autodelete_scheduler()
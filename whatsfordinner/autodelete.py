@@ -0,0 +1,155 @@
+from flask import current_app
+from flask.cli import with_appcontext
+import click
+
+import time
+from datetime import datetime, timedelta
+
+from whatsfordinner.extensions import db
+from whatsfordinner.models import mealplans_table, shared_mealplans_table, shared_shoppinglists_table, Settings, Mealplan, Rule, Shoppinglist, Shoppingingredient, ShoppinglistProgress
+from whatsfordinner.realtime import get_socketio, emit_event
+from whatsfordinner.meal_recency import refresh_meal_recency
+from whatsfordinner.hot_shoppinglists import hot_shoppinglist_lock, hot_shoppinglists, hot_shoppingingredient_lists
+
+# Autodelete
+# Enforces the autodelete_mealplans / autodelete_shoppinglists settings. Every
+# AUTODELETE_INTERVAL seconds the scheduler finds plans and lists created
+# before each user's cutoff, AUTODELETE_BATCH_SIZE at a time, and deletes them
+# and their children with one statement per table. Each affected owner or
+# shared user then gets a single autodelete-update event listing the deleted
+# ids. The scheduler needs Socket.IO's background tasks, so serverless
+# deployments run it from a cron job with `flask autodelete` instead.
+AUTODELETE_UNIT_DAYS = {
+    "day": 1,
+    "week": 7,
+    "month": 30,
+    "year": 365
+}
+
+autodelete_scheduler = {
+    "running": False
+}
+autodelete_stats = {
+    "runs": 0,
+    "last_run_at": None,
+    "last_duration": None,
+    "last_purged": {},
+    "total_purged": {}
+}
+
+def get_autodelete_cutoffs(enabled, number, unit, now):
+    cutoffs = []
+    for schedule_number, schedule_unit in db.session.query(number, unit).filter(enabled == True).distinct().all():
+        days = AUTODELETE_UNIT_DAYS.get(str(schedule_unit or "").strip().lower().rstrip("s"))
+        if days is not None and schedule_number is not None and schedule_number > 0:
+            cutoffs.append((schedule_number, schedule_unit, now - timedelta(days=schedule_number * days)))
+    return cutoffs
+
+def get_expired_ids(model, enabled, number, unit, cutoffs, limit):
+    rows = []
+    for schedule_number, schedule_unit, cutoff in cutoffs:
+        rows += db.session.query(model.id, model.user_id).join(Settings, Settings.user_id == model.user_id).filter(enabled == True, number == schedule_number, unit == schedule_unit, model.created_on < cutoff).limit(limit - len(rows)).all()
+        if len(rows) >= limit:
+            break
+    return rows
+
+def add_autodelete_users(affected, key, rows, shared_table, shared_column):
+    ids = [id for id, user_id in rows]
+    shared_rows = db.session.execute(db.select(shared_table.c.user_id, shared_column).where(shared_column.in_(ids))).all()
+    for id, user_id in list(rows) + [(id, user_id) for user_id, id in shared_rows]:
+        deleted = affected.setdefault(user_id, {"mealplan_ids": [], "shoppinglist_ids": []})[key]
+        if id not in deleted:
+            deleted.append(id)
+    db.session.execute(shared_table.delete().where(shared_column.in_(ids)))
+
+def delete_expired_shoppinglists(rows, purged, affected):
+    ids = [id for id, user_id in rows]
+    add_autodelete_users(affected, "shoppinglist_ids", rows, shared_shoppinglists_table, shared_shoppinglists_table.c.shoppinglist_id)
+    purged["shoppingingredients"] += db.session.query(Shoppingingredient).filter(Shoppingingredient.shoppinglist_id.in_(ids)).delete(synchronize_session=False)
+    db.session.query(ShoppinglistProgress).filter(ShoppinglistProgress.shoppinglist_id.in_(ids)).delete(synchronize_session=False)
+    purged["shoppinglists"] += db.session.query(Shoppinglist).filter(Shoppinglist.id.in_(ids)).delete(synchronize_session=False)
+
+    with hot_shoppinglist_lock:
+        for id in ids:
+            hot_shoppinglist = hot_shoppinglists.pop(id, None)
+            for shoppingingredient_id in (hot_shoppinglist or {}).get("items") or {}:
+                hot_shoppingingredient_lists.pop(shoppingingredient_id, None)
+
+def delete_expired_mealplans(rows, purged, affected):
+    ids = [id for id, user_id in rows]
+    add_autodelete_users(affected, "mealplan_ids", rows, shared_mealplans_table, shared_mealplans_table.c.mealplan_id)
+    shoppinglists = db.session.query(Shoppinglist.id, Shoppinglist.user_id).filter(Shoppinglist.mealplan_id.in_(ids)).all()
+    if len(shoppinglists) > 0:
+        delete_expired_shoppinglists(shoppinglists, purged, affected)
+    db.session.query(Rule).filter(Rule.mealplan_id.in_(ids)).delete(synchronize_session=False)
+    meal_ids = [meal_id for meal_id, in db.session.execute(db.select(mealplans_table.c.meal_id).where(mealplans_table.c.mealplan_id.in_(ids))).all()]
+    db.session.execute(mealplans_table.delete().where(mealplans_table.c.mealplan_id.in_(ids)))
+    purged["mealplans"] += db.session.query(Mealplan).filter(Mealplan.id.in_(ids)).delete(synchronize_session=False)
+    refresh_meal_recency(meal_ids)
+
+def run_autodelete(now=None):
+    started = time.time()
+    now = now or datetime.utcnow()
+    batch_size = current_app.config["AUTODELETE_BATCH_SIZE"]
+    purged = {
+        "mealplans": 0,
+        "shoppinglists": 0,
+        "shoppingingredients": 0
+    }
+    affected = {}
+
+    passes = [
+        (Mealplan, Settings.autodelete_mealplans, Settings.autodelete_mealplans_schedule_number, Settings.autodelete_mealplans_schedule_unit, delete_expired_mealplans),
+        (Shoppinglist, Settings.autodelete_shoppinglists, Settings.autodelete_shoppinglists_schedule_number, Settings.autodelete_shoppinglists_schedule_unit, delete_expired_shoppinglists)
+    ]
+    for model, enabled, number, unit, delete_expired in passes:
+        cutoffs = get_autodelete_cutoffs(enabled, number, unit, now)
+        while len(cutoffs) > 0:
+            rows = get_expired_ids(model, enabled, number, unit, cutoffs, batch_size)
+            if len(rows) == 0:
+                break
+            delete_expired(rows, purged, affected)
+            db.session.commit()
+
+    db.session.expire_all()
+    for user_id, deleted in affected.items():
+        emit_event("autodelete-update", {
+            "data": {
+                "user_id": user_id,
+                **deleted
+            },
+            "type": "delete"
+        })
+
+    duration = time.time() - started
+    autodelete_stats["runs"] += 1
+    autodelete_stats["last_run_at"] = now.isoformat()
+    autodelete_stats["last_duration"] = duration
+    autodelete_stats["last_purged"] = dict(purged, users=len(affected))
+    for key, count in purged.items():
+        autodelete_stats["total_purged"][key] = autodelete_stats["total_purged"].get(key, 0) + count
+    current_app.logger.info(f"Autodelete purged {purged['mealplans']} mealplans, {purged['shoppinglists']} shoppinglists and {purged['shoppingingredients']} shoppingingredients for {len(affected)} users in {duration:.3f}s")
+    return autodelete_stats["last_purged"]
+
+def run_autodelete_scheduler(app):
+    socketio = app.extensions["socketio"]
+    while True:
+        socketio.sleep(app.config["AUTODELETE_INTERVAL"])
+        with app.app_context():
+            try:
+                run_autodelete()
+            except Exception as error:
+                db.session.rollback()
+                app.logger.error(f"Autodelete failed: {error}")
+
+def start_autodelete_scheduler():
+    socketio = get_socketio()
+    if socketio is not None and current_app.config["AUTODELETE_INTERVAL"] > 0 and not autodelete_scheduler["running"]:
+        autodelete_scheduler["running"] = True
+        socketio.start_background_task(run_autodelete_scheduler, current_app._get_current_object())
+
+@click.command("autodelete")
+@with_appcontext
+def autodelete():
+    purged = run_autodelete()
+    print(f"Purged {purged['mealplans']} mealplans, {purged['shoppinglists']} shoppinglists and {purged['shoppingingredients']} shoppingingredients for {purged['users']} users in {autodelete_stats['last_duration']:.3f}s")
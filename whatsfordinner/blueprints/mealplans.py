@@ -0,0 +1,716 @@
+from flask import Blueprint, request, jsonify
+
+import random
+from datetime import datetime
+
+from whatsfordinner.mealplan_generator import build_candidate, solve_mealplan
+from whatsfordinner.date_parsing import parse_timestamp
+from whatsfordinner.extensions import db
+from whatsfordinner.models import shared_meals_table, User, Notification, Meal, Category, Recipe, Mealplan, Mealplanoutline, Rule, Shoppinglist, Shoppingingredient
+from whatsfordinner.schemas import shoppingingredient_schema, rule_schema, multiple_rule_schema, mealplanoutline_schema, multiple_mealplanoutline_schema, meal_schema, mealplan_schema, multiple_mealplan_schema, notification_schema, user_schema
+from whatsfordinner.compression import stream_json
+from whatsfordinner.realtime import emit_event
+from whatsfordinner.meal_indexes import get_meal_index
+from whatsfordinner.meal_recency import record_meals_planned, refresh_meal_recency
+from whatsfordinner.shoppinglist_progress import add_progress_delta, apply_progress_deltas
+from whatsfordinner.filters import filter_by_created_on
+from whatsfordinner.identity import get_user, get_caller
+
+bp = Blueprint("mealplans", __name__)
+
+@bp.route("/mealplan/add", methods=["POST"])
+def add_mealplan():
+    if request.content_type != "application/json":
+        return jsonify({
+            "status": 400,
+            "message": "Error: Data must be sent as JSON.",
+            "data": {}
+        })
+
+    data = request.get_json()
+    name = data.get("name")
+    user_username = data.get("user_username")
+    user_id = data.get("user_id")
+    meals = data.get("meals")
+    multipliers = data.get("multipliers", {})
+
+    try:
+        created_on = parse_timestamp(data.get("created_on")) or datetime.utcnow()
+    except ValueError:
+        return jsonify({
+            "status": 400,
+            "message": "Error: created_on must be a date.",
+            "data": {}
+        })
+
+    record = create_mealplan(name, created_on, user_username, user_id, meals, multipliers)
+
+    return jsonify({
+        "status": 200,
+        "message": "Mealplan Added",
+        "data": mealplan_schema.dump(record)
+    })
+
+# Creates the mealplan, its rules, its shoppinglist and every
+# shoppingingredient in one transaction. Meals and their ingredients are
+# loaded in two queries and the shoppingingredients are inserted in bulk.
+def create_mealplan(name, created_on, user_username, user_id, meals, multipliers, rules=()):
+    record = Mealplan(name, created_on, user_username, user_id)
+    db.session.add(record)
+    db.session.flush()
+
+    shoppinglist = Shoppinglist(f"{name} Mealplan", created_on, False, False, user_username, user_id, record.id)
+    db.session.add(shoppinglist)
+    db.session.add_all([Rule(rule.get("rule_type"), rule.get("rule"), rule.get("amount"), rule.get("value"), record.id, None) for rule in rules])
+    db.session.flush()
+
+    meal_ids = [int(meal_id) for meal_id in meals]
+    meals_by_id = {meal.id: meal for meal in db.session.query(Meal).filter(Meal.id.in_(meal_ids)).options(db.selectinload(Meal.recipe).selectinload(Recipe.ingredients)).all()} if len(meal_ids) > 0 else {}
+
+    shoppingingredients = []
+    for meal_id in meal_ids:
+        meal = meals_by_id[meal_id]
+        record.meals.append(meal)
+        for ingredient in meal.recipe[0].ingredients if len(meal.recipe) > 0 else []:
+            shoppingingredients.append({
+                "name": ingredient.name,
+                "amount": ingredient.amount,
+                "unit": ingredient.unit,
+                "category": ingredient.category,
+                "obtained": False,
+                "multiplier": multipliers.get(str(meal.id), 1),
+                "meal_name": meal.name,
+                "shoppinglist_id": shoppinglist.id,
+                "ingredient_id": ingredient.id
+            })
+
+    db.session.bulk_insert_mappings(Shoppingingredient, shoppingingredients)
+    deltas = {}
+    for shoppingingredient in shoppingingredients:
+        add_progress_delta(deltas, shoppinglist.id, shoppingingredient["category"], 1, 0)
+    apply_progress_deltas(db.session.connection(), deltas)
+    record_meals_planned(meal_ids, created_on)
+    db.session.commit()
+
+    return record
+
+def get_mealplan_candidates(user_id, exclude=()):
+    if user_id is None:
+        return []
+
+    index = get_meal_index(user_id)
+    awake = index.query()
+    awake_ids = set(index.meal_ids_from_bits(awake)) - set(exclude)
+    category_names = dict(db.session.query(Category.id, Category.name).filter(Category.user_id == user_id).all())
+
+    categories = {}
+    for category_id, bits in index.categories.items():
+        for meal_id in index.meal_ids_from_bits(bits & awake):
+            categories.setdefault(meal_id, []).append((category_id, category_names.get(category_id)))
+
+    meals = db.session.query(Meal.id, Meal.difficulty).filter(Meal.user_id == user_id).all()
+    return [build_candidate(meal.id, meal.difficulty, categories.get(meal.id, [])) for meal in meals if meal.id in awake_ids]
+
+@bp.route("/mealplan/generate", methods=["POST"])
+def generate_mealplan():
+    if request.content_type != "application/json":
+        return jsonify({
+            "status": 400,
+            "message": "Error: Data must be sent as JSON.",
+            "data": {}
+        })
+
+    data = request.get_json()
+    user_id = data.get("user_id")
+    mealplanoutline_id = data.get("mealplanoutline_id")
+    rules = data.get("rules")
+    number = data.get("number")
+    exclude = data.get("exclude", [])
+    seed = data.get("seed")
+    persist = data.get("persist", False)
+    name = data.get("name")
+
+    try:
+        created_on = parse_timestamp(data.get("created_on")) or datetime.utcnow()
+    except ValueError:
+        return jsonify({
+            "status": 400,
+            "message": "Error: created_on must be a date.",
+            "data": {}
+        })
+
+    if mealplanoutline_id is not None:
+        outline = db.session.query(Mealplanoutline).filter(Mealplanoutline.id == mealplanoutline_id).first()
+        if outline is None:
+            return jsonify({
+                "status": 400,
+                "message": "Error: Mealplanoutline does not exist.",
+                "data": {}
+            })
+        user_id = outline.user_id
+        name = name or outline.name
+        if rules is None:
+            rules = multiple_rule_schema.dump(outline.rules)
+        if number is None:
+            number = outline.number
+
+    try:
+        number = int(number)
+    except (TypeError, ValueError):
+        return jsonify({
+            "status": 400,
+            "message": "Error: Number of meals is required.",
+            "data": {}
+        })
+
+    rules = rules or []
+    if not isinstance(rules, list):
+        return jsonify({
+            "status": 400,
+            "message": "Error: Rules must be a list.",
+            "data": {}
+        })
+
+    candidates = get_mealplan_candidates(user_id, exclude)
+    try:
+        meal_ids, unsatisfied = solve_mealplan(candidates, rules, number, random.Random(seed))
+    except ValueError as error:
+        return jsonify({
+            "status": 400,
+            "message": f"Error: {error}.",
+            "data": {}
+        })
+
+    meals = db.session.query(Meal.id, Meal.name, Meal.difficulty, Meal.image_url).filter(Meal.id.in_(meal_ids)).all() if len(meal_ids) > 0 else []
+    meals_by_id = {meal.id: meal for meal in meals}
+
+    mealplan = None
+    if persist:
+        user = get_caller(user_id)
+        if user is None:
+            return jsonify({
+                "status": 400,
+                "message": "User doesn't exist.",
+                "data": {}
+            })
+
+        record = create_mealplan(name or "Generated Mealplan", created_on, user.username, user_id, meal_ids, data.get("multipliers", {}), rules)
+        mealplan = mealplan_schema.dump(record)
+
+    return jsonify({
+        "status": 200,
+        "message": "Mealplan Generated",
+        "data": {
+            "meals": [{
+                "id": meal_id,
+                "name": meals_by_id[meal_id].name,
+                "difficulty": meals_by_id[meal_id].difficulty,
+                "image_url": meals_by_id[meal_id].image_url
+            } for meal_id in meal_ids],
+            "unsatisfied_rules": [rules[index] for index in unsatisfied],
+            "mealplan": mealplan
+        }
+    })
+
+@bp.route("/mealplan/share", methods=["POST"])
+def share_mealplan():
+    if request.content_type != "application/json":
+        return jsonify({
+            "status": 400,
+            "message": "Error: Data must be sent as JSON.",
+            "data": {}
+        })
+
+    data = request.get_json()
+    mealplan_id = data.get("mealplan_id")
+    username = data.get("username")
+
+    shared_mealplan = db.session.query(Mealplan).filter(Mealplan.id == mealplan_id).first()
+    shared_user = db.session.query(User).filter(User.username == username).first()
+    user = get_caller(shared_mealplan.user_id)
+
+    if shared_user is None:
+        return jsonify({
+            "status": 400,
+            "message": "User doesn't exist.",
+            "data": {}
+        })
+
+    if not shared_user.settings[0].allow_nonfriend_sharing and not user in shared_user.friends:
+        return jsonify({
+            "status": 400,
+            "message": f"Sorry, {shared_user.username} is only accepting shares from friends.",
+            "data": {}
+        })
+
+    shared_user.shared_mealplans.append(shared_mealplan)
+    db.session.commit()
+
+    if len(shared_mealplan.shoppinglists) > 0:
+        shared_mealplan_schema = mealplan_schema.dump(shared_mealplan)
+        shoppinglist = db.session.query(Shoppinglist).filter(Shoppinglist.id == shared_mealplan_schema["shoppinglist"]["id"]).first()
+        shared_user.shared_shoppinglists.append(shoppinglist)
+        if len(shared_mealplan.shoppinglists) > 1:
+            sub_shoppinglist = db.session.query(Shoppinglist).filter(Shoppinglist.id == shared_mealplan_schema["sub_shoppinglist"]["id"]).first()
+            shared_user.shared_shoppinglists.append(sub_shoppinglist)
+            db.session.commit()
+
+    notification = Notification("mealplan", shared_mealplan.user_username, shared_mealplan.name, shared_user.id)
+    db.session.add(notification)
+    db.session.commit()
+
+    emit_event("mealplan-share-update", {
+        "data": {
+            "mealplan": mealplan_schema.dump(shared_mealplan),
+            "user": user_schema.dump(shared_user),
+            "notification": notification_schema.dump(notification)
+        },
+        "type": "add"
+    })
+
+    return jsonify({
+        "status": 200,
+        "message": "Mealplan Shared",
+        "data": {
+            "mealplan": mealplan_schema.dump(shared_mealplan),
+            "user": user_schema.dump(shared_user)
+        }
+    })
+
+@bp.route("/mealplan/meal/add", methods=["POST"])
+def add_meal_to_mealplan():
+    if request.content_type != "application/json":
+        return jsonify({
+            "status": 400,
+            "message": "Error: Data must be sent as JSON.",
+            "data": {}
+        })
+
+    data = request.get_json()
+    mealplan_id = data.get("mealplan_id")
+    meal_id = data.get("meal_id")
+    multiplier = data.get("multiplier", 1)
+
+    record = db.session.query(Mealplan).filter(Mealplan.id == mealplan_id).first()
+    meal = db.session.query(Meal).filter(Meal.id == meal_id).first()
+    
+    record.meals.append(meal)
+    record_meals_planned([meal.id], record.created_on)
+    db.session.commit()
+
+    shoppinglist = mealplan_schema.dump(record)["shoppinglist"]
+    for ingredient in meal.recipe[0].ingredients:
+        shoppingingredient = Shoppingingredient(ingredient.name, ingredient.amount, ingredient.unit, ingredient.category, multiplier, meal.name, shoppinglist["id"], ingredient.id)
+        db.session.add(shoppingingredient)
+        db.session.commit()
+        emit_event("shoppingingredient-update", {
+            "data": shoppingingredient_schema.dump(shoppingingredient),
+            "type": "add"
+        })
+
+    return jsonify({
+        "status": 200,
+        "message": "Meal added to mealplan",
+        "data": {
+            "mealplan": mealplan_schema.dump(record),
+            "meal": meal_schema.dump(meal)
+        }
+    })
+
+@bp.route("/mealplan/get", methods=["GET"])
+def get_all_mealplans():
+    try:
+        query = filter_by_created_on(db.session.query(Mealplan), Mealplan)
+    except ValueError:
+        return jsonify({
+            "status": 400,
+            "message": "Error: from and to must be dates.",
+            "data": {}
+        })
+
+    records = query.all()
+    return stream_json(multiple_mealplan_schema.dump(records))
+
+@bp.route("/mealplan/get/<id>", methods=["GET"])
+def get_mealplan_by_id(id):
+    record = db.session.query(Mealplan).filter(Mealplan.id == id).first()
+    return jsonify(mealplan_schema.dump(record))
+
+@bp.route("/mealplan/update/<id>", methods=["PUT"])
+def update_mealplan(id):
+    if request.content_type != "application/json":
+        return jsonify({
+            "status": 400,
+            "message": "Error: Data must be sent as JSON.",
+            "data": {}
+        })
+
+    data = request.get_json()
+    name = data.get("name")
+
+    record = db.session.query(Mealplan).filter(Mealplan.id == id).first()
+    if name is not None:
+        record.name = name
+        for shoppinglist in record.shoppinglists:
+            shoppinglist.name = f"{name} Mealplan"
+
+    db.session.commit()
+
+    return jsonify({
+        "status": 200,
+        "message": "Mealplan Updated",
+        "data": mealplan_schema.dump(record)
+    })
+
+@bp.route("/mealplan/delete/<id>", methods=["DELETE"])
+def delete_mealplan(id):
+    record = db.session.query(Mealplan).filter(Mealplan.id == id).first()
+    for user in record.shared_users:
+        user.shared_mealplans.remove(record)
+        db.session.commit()
+    meal_ids = [meal.id for meal in record.meals]
+    db.session.delete(record)
+    db.session.commit()
+
+    refresh_meal_recency(meal_ids)
+    db.session.commit()
+
+    shoppinglist = mealplan_schema.dump(record)["shoppinglist"]
+    for meal in record.meals:
+        for ingredient in meal.recipe[0].ingredients:
+            for shoppingingredient in ingredient.shoppingingredients:
+                if shoppingingredient.shoppinglist_id == shoppinglist["id"]:
+                    db.session.delete(shoppingingredient)
+                    db.session.commit()
+                    emit_event("shoppingingredient-update", {
+                        "data": shoppingingredient_schema.dump(shoppingingredient),
+                        "type": "delete"
+                    })
+
+    return jsonify({
+        "status": 200,
+        "message": "Mealplan Deleted",
+        "data": mealplan_schema.dump(record)
+    })
+
+@bp.route("/mealplan/unshare/<id>/<user_id>", methods=["DELETE"])
+def unshare_mealplan(id, user_id):
+    record = db.session.query(Mealplan).filter(Mealplan.id == id).first()
+    shared_user = get_user(user_id)
+
+    if shared_user.shared_mealplans.count(record) == 0:
+        return jsonify({
+                "status": 400,
+                "message": "Error: Shared mealplan does not exist.",
+                "data": {}
+            })
+
+    shared_user.shared_mealplans.remove(record)
+    db.session.commit()
+
+    if len(record.shoppinglists) > 0:
+        for shoppinglist in record.shoppinglists:
+            shared_user.shared_shoppinglists.remove(shoppinglist)
+            db.session.commit()
+
+    return jsonify({
+        "status": 200,
+        "message": "Mealplan Share Deleted",
+        "data":{
+            "mealplan": mealplan_schema.dump(record),
+            "user": user_schema.dump(shared_user)
+        }
+    })
+
+@bp.route("/mealplan/meal/delete", methods=["DELETE"])
+def delete_meal_from_mealplan():
+    if request.content_type != "application/json":
+        return jsonify({
+            "status": 400,
+            "message": "Error: Data must be sent as JSON.",
+            "data": {}
+        })
+
+    data = request.get_json()
+    mealplan_id = data.get("mealplan_id")
+    meal_id = data.get("meal_id")
+
+    record = db.session.query(Mealplan).filter(Mealplan.id == mealplan_id).first()
+    meal = db.session.query(Meal).filter(Meal.id == meal_id).first()
+    
+    record.meals.remove(meal)
+    db.session.commit()
+
+    refresh_meal_recency([meal.id])
+    db.session.commit()
+
+    shoppinglist = mealplan_schema.dump(record)["shoppinglist"]
+    for ingredient in meal.recipe[0].ingredients:
+        for shoppingingredient in ingredient.shoppingingredients:
+            if shoppingingredient.shoppinglist_id == shoppinglist["id"]:
+                db.session.delete(shoppingingredient)
+                db.session.commit()
+                emit_event("shoppingingredient-update", {
+                    "data": shoppingingredient_schema.dump(shoppingingredient),
+                    "type": "delete"
+                })
+
+    return jsonify({
+        "status": 200,
+        "message": "Meal deleted from mealplan",
+        "data": {
+            "mealplan": mealplan_schema.dump(record),
+            "meal": meal_schema.dump(meal)
+        }
+    })
+
+
+@bp.route("/mealplanoutline/add", methods=["POST"])
+def add_mealplanoutline():
+    if request.content_type != "application/json":
+        return jsonify({
+            "status": 400,
+            "message": "Error: Data must be sent as JSON.",
+            "data": {}
+        })
+
+    data = request.get_json()
+    name = data.get("name")
+    number = data.get("number")
+    user_id = data.get("user_id")
+
+    try:
+        number = int(number)
+    except (TypeError, ValueError):
+        return jsonify({
+            "status": 400,
+            "message": "Error: number must be an integer.",
+            "data": {}
+        })
+
+    record = Mealplanoutline(name, number, user_id)
+    db.session.add(record)
+    db.session.commit()
+
+    return jsonify({
+        "status": 200,
+        "message": "Mealplanoutline Added",
+        "data": mealplanoutline_schema.dump(record)
+    })
+
+@bp.route("/mealplanoutline/instantiate/<id>", methods=["POST"])
+def instantiate_mealplanoutline(id):
+    if request.content_type != "application/json":
+        return jsonify({
+            "status": 400,
+            "message": "Error: Data must be sent as JSON.",
+            "data": {}
+        })
+
+    data = request.get_json()
+    meals = data.get("meals")
+    multipliers = data.get("multipliers", {})
+    exclude = data.get("exclude", [])
+    seed = data.get("seed")
+
+    try:
+        created_on = parse_timestamp(data.get("created_on")) or datetime.utcnow()
+    except ValueError:
+        return jsonify({
+            "status": 400,
+            "message": "Error: created_on must be a date.",
+            "data": {}
+        })
+
+    outline = db.session.query(Mealplanoutline).filter(Mealplanoutline.id == id).first()
+    if outline is None:
+        return jsonify({
+            "status": 400,
+            "message": "Error: Mealplanoutline does not exist.",
+            "data": {}
+        })
+    user = get_caller(outline.user_id)
+    rules = multiple_rule_schema.dump(outline.rules)
+
+    unsatisfied = []
+    if meals is None:
+        try:
+            meals, unsatisfied = solve_mealplan(get_mealplan_candidates(user.id, exclude), rules, outline.number, random.Random(seed))
+        except ValueError as error:
+            return jsonify({
+                "status": 400,
+                "message": f"Error: {error}.",
+                "data": {}
+            })
+    else:
+        try:
+            meals = [int(meal_id) for meal_id in meals]
+        except (TypeError, ValueError):
+            return jsonify({
+                "status": 400,
+                "message": "Error: Meals must be a list of meal ids.",
+                "data": {}
+            })
+        if db.session.query(Meal.id).filter(Meal.id.in_(meals)).count() != len(set(meals)):
+            return jsonify({
+                "status": 400,
+                "message": "Error: Meal does not exist.",
+                "data": {}
+            })
+        shared_ids = db.select(shared_meals_table.c.meal_id).where(shared_meals_table.c.user_id == user.id)
+        if db.session.query(Meal.id).filter(Meal.id.in_(meals), db.or_(Meal.user_id == user.id, Meal.id.in_(shared_ids))).count() != len(set(meals)):
+            return jsonify({
+                "status": 400,
+                "message": "Error: Meals must belong to or be shared with the outline's user.",
+                "data": {}
+            })
+
+    record = create_mealplan(data.get("name") or outline.name, created_on, user.username, user.id, meals, multipliers, rules)
+
+    return jsonify({
+        "status": 200,
+        "message": "Mealplan Added",
+        "data": {
+            "mealplan": mealplan_schema.dump(record),
+            "unsatisfied_rules": [rules[index] for index in unsatisfied]
+        }
+    })
+
+@bp.route("/mealplanoutline/get", methods=["GET"])
+def get_all_mealplanoutlines():
+    records = db.session.query(Mealplanoutline).all()
+    return stream_json(multiple_mealplanoutline_schema.dump(records))
+
+@bp.route("/mealplanoutline/get/<id>", methods=["GET"])
+def get_mealplanoutline_by_id(id):
+    record = db.session.query(Mealplanoutline).filter(Mealplanoutline.id == id).first()
+    return jsonify(mealplanoutline_schema.dump(record))
+
+@bp.route("/mealplanoutline/update/<id>", methods=["PUT"])
+def update_mealplanoutline(id):
+    if request.content_type != "application/json":
+        return jsonify({
+            "status": 400,
+            "message": "Error: Data must be sent as JSON.",
+            "data": {}
+        })
+
+    data = request.get_json()
+    name = data.get("name")
+    number = data.get("number")
+
+    try:
+        number = int(number) if number is not None else None
+    except (TypeError, ValueError):
+        return jsonify({
+            "status": 400,
+            "message": "Error: number must be an integer.",
+            "data": {}
+        })
+
+    record = db.session.query(Mealplanoutline).filter(Mealplanoutline.id == id).first()
+    if name is not None:
+        record.name = name
+    if number is not None:
+        record.number = number
+
+    db.session.commit()
+
+    return jsonify({
+        "status": 200,
+        "message": "Mealplanoutline Updated",
+        "data": mealplanoutline_schema.dump(record)
+    })
+
+@bp.route("/mealplanoutline/delete/<id>", methods=["DELETE"])
+def delete_mealplanoutline(id):
+    record = db.session.query(Mealplanoutline).filter(Mealplanoutline.id == id).first()
+    db.session.delete(record)
+    db.session.commit()
+    return jsonify({
+        "status": 200,
+        "message": "Mealplanoutline Deleted",
+        "data": mealplanoutline_schema.dump(record)
+    })
+
+
+@bp.route("/rule/add", methods=["POST"])
+def add_rule():
+    if request.content_type != "application/json":
+        return jsonify({
+            "status": 400,
+            "message": "Error: Data must be sent as JSON.",
+            "data": {}
+        })
+
+    data = request.get_json()
+    rule_type = data.get("rule_type")
+    rule = data.get("rule")
+    amount = data.get("amount")
+    value = data.get("value")
+    mealplan_id = data.get("mealplan_id")
+    mealplanoutline_id = data.get("mealplanoutline_id")
+
+    record = Rule(rule_type, rule, amount, value, mealplan_id, mealplanoutline_id)
+    db.session.add(record)
+    db.session.commit()
+
+    return jsonify({
+        "status": 200,
+        "message": "Rule Added",
+        "data": rule_schema.dump(record)
+    })
+
+@bp.route("/rule/get", methods=["GET"])
+def get_all_rules():
+    records = db.session.query(Rule).all()
+    return stream_json(multiple_rule_schema.dump(records))
+
+@bp.route("/rule/get/<id>", methods=["GET"])
+def get_rule_by_id(id):
+    record = db.session.query(Rule).filter(Rule.id == id).first()
+    return jsonify(rule_schema.dump(record))
+
+@bp.route("/rule/update/<id>", methods=["PUT"])
+def update_rule(id):
+    if request.content_type != "application/json":
+        return jsonify({
+            "status": 400,
+            "message": "Error: Data must be sent as JSON.",
+            "data": {}
+        })
+
+    data = request.get_json()
+    rule_type = data.get("rule_type")
+    rule = data.get("rule")
+    amount = data.get("amount")
+    value = data.get("value")
+
+    record = db.session.query(Rule).filter(Rule.id == id).first()
+    if rule_type is not None:
+        record.rule_type = rule_type
+    if rule is not None:
+        record.rule = rule
+    if amount is not None:
+        record.amount = amount
+    if value is not None:
+        record.value = value
+
+    db.session.commit()
+
+    return jsonify({
+        "status": 200,
+        "message": "Rule Updated",
+        "data": rule_schema.dump(record)
+    })
+
+@bp.route("/rule/delete/<id>", methods=["DELETE"])
+def delete_rule(id):
+    record = db.session.query(Rule).filter(Rule.id == id).first()
+    db.session.delete(record)
+    db.session.commit()
+    return jsonify({
+        "status": 200,
+        "message": "Rule Deleted",
+        "data": rule_schema.dump(record)
+    })
@@ -0,0 +1,605 @@
+from flask import Blueprint, request, jsonify
+
+from datetime import date
+
+from whatsfordinner.date_parsing import parse_date
+from whatsfordinner.extensions import db
+from whatsfordinner.models import shared_meals_table, User, Notification, Meal, Category, Recipe
+from whatsfordinner.schemas import shoppingingredient_schema, category_schema, multiple_category_schema, meal_schema, multiple_meal_schema, notification_schema, user_schema
+from whatsfordinner.compression import stream_json
+from whatsfordinner.realtime import emit_event
+from whatsfordinner.meal_indexes import meal_indexes, get_meal_index, get_loaded_meal_index
+from whatsfordinner.meal_search import supports_full_text_search, get_meal_search_index, refresh_meal_search
+from whatsfordinner.identity import get_user, get_caller
+
+bp = Blueprint("meals", __name__)
+
+@bp.route("/meal/add", methods=["POST"])
+def add_meal():
+    if request.content_type != "application/json":
+        return jsonify({
+            "status": 400,
+            "message": "Error: Data must be sent as JSON.",
+            "data": {}
+        })
+
+    data = request.get_json()
+    name = data.get("name")
+    description = data.get("description")
+    image_url = data.get("image_url")
+    difficulty = data.get("difficulty", 0)
+    owner_username = data.get("owner_username")
+    user_id = data.get("user_id")
+
+    user = get_caller(user_id)
+
+    record = Meal(name, description, image_url, difficulty, user.username, owner_username, user_id)
+    db.session.add(record)
+    db.session.commit()
+
+    recipe = Recipe(record.id)
+    db.session.add(recipe)
+    db.session.commit()
+
+    index = get_loaded_meal_index(record.user_id)
+    if index is not None:
+        index.add_meal(record.id)
+
+    refresh_meal_search(record.id)
+
+    return jsonify({
+        "status": 200,
+        "message": "Meal Added",
+        "data": meal_schema.dump(record)
+    })
+
+@bp.route("/meal/share", methods=["POST"])
+def share_meal():
+    if request.content_type != "application/json":
+        return jsonify({
+            "status": 400,
+            "message": "Error: Data must be sent as JSON.",
+            "data": {}
+        })
+
+    data = request.get_json()
+    meal_id = data.get("meal_id")
+    username = data.get("username")
+
+    shared_meal = db.session.query(Meal).filter(Meal.id == meal_id).first()
+    shared_user = db.session.query(User).filter(User.username == username).first()
+    user = get_caller(shared_meal.user_id)
+
+    if shared_user is None:
+        return jsonify({
+            "status": 400,
+            "message": "User doesn't exist.",
+            "data": {}
+        })
+
+    if not shared_user.settings[0].allow_nonfriend_sharing and not user in shared_user.friends:
+        return jsonify({
+            "status": 400,
+            "message": f"Sorry, {shared_user.username} is only accepting shares from friends.",
+            "data": {}
+        })
+
+    shared_user.shared_meals.append(shared_meal)
+    db.session.commit()
+
+    notification = Notification("meal", shared_meal.user_username, shared_meal.name, shared_user.id)
+    db.session.add(notification)
+    db.session.commit()
+
+    emit_event("meal-share-update", {
+        "data": {
+            "meal": meal_schema.dump(shared_meal),
+            "user": user_schema.dump(shared_user),
+            "notification": notification_schema.dump(notification)
+        },
+        "type": "add"
+    })
+
+    return jsonify({
+        "status": 200,
+        "message": "Meal Shared",
+        "data": {
+            "meal": meal_schema.dump(shared_meal),
+            "user": user_schema.dump(shared_user)
+        }
+    })
+
+@bp.route("/meal/get", methods=["GET"])
+def get_all_meals():
+    query = db.session.query(Meal)
+    user_id = request.args.get("user_id")
+    awake = request.args.get("awake")
+    if user_id is not None:
+        query = query.filter(Meal.user_id == user_id)
+    if awake is not None:
+        awake_filter = db.or_(Meal.sleep_until == None, Meal.sleep_until <= date.today())
+        query = query.filter(awake_filter if awake.lower() == "true" else db.not_(awake_filter))
+
+    records = query.all()
+    return stream_json(multiple_meal_schema.dump(records))
+
+@bp.route("/meal/get/category", methods=["GET"])
+def get_meals_by_category():
+    user_id = request.args.get("user_id")
+    if user_id is None:
+        return jsonify({
+            "status": 400,
+            "message": "Error: user_id is required.",
+            "data": {}
+        })
+
+    try:
+        user_id = int(user_id)
+    except ValueError:
+        return jsonify({
+            "status": 400,
+            "message": "Error: user_id must be a number.",
+            "data": {}
+        })
+
+    try:
+        all_of = [int(category_id) for category_id in request.args.get("all", "").split(",") if category_id != ""]
+        any_of = [int(category_id) for category_id in request.args.get("any", "").split(",") if category_id != ""]
+        none_of = [int(category_id) for category_id in request.args.get("none", "").split(",") if category_id != ""]
+    except ValueError:
+        return jsonify({
+            "status": 400,
+            "message": "Error: Category ids must be numbers.",
+            "data": {}
+        })
+    include_sleeping = request.args.get("include_sleeping", "false").lower() == "true"
+
+    index = get_meal_index(user_id)
+    bits = index.query(all_of, any_of, none_of, awake_only=not include_sleeping)
+
+    return jsonify({
+        "status": 200,
+        "message": "Meals Filtered",
+        "data": {
+            "meal_ids": index.meal_ids_from_bits(bits)
+        }
+    })
+
+@bp.route("/meal/get/recency", methods=["GET"])
+def get_meals_by_recency():
+    user_id = request.args.get("user_id")
+    if user_id is None:
+        return jsonify({
+            "status": 400,
+            "message": "Error: user_id is required.",
+            "data": {}
+        })
+
+    limit = request.args.get("limit")
+    include_sleeping = request.args.get("include_sleeping", "false").lower() == "true"
+    if limit is not None:
+        try:
+            limit = max(0, int(limit))
+        except ValueError:
+            return jsonify({
+                "status": 400,
+                "message": "Error: limit must be a number.",
+                "data": {}
+            })
+
+    query = db.session.query(Meal.id, Meal.name, Meal.image_url, Meal.difficulty, Meal.sleep_until, Meal.last_planned_at, Meal.times_planned).filter(Meal.user_id == user_id)
+    if not include_sleeping:
+        query = query.filter(db.or_(Meal.sleep_until == None, Meal.sleep_until <= date.today()))
+    query = query.order_by(Meal.last_planned_at.nulls_first(), Meal.times_planned, Meal.id)
+    if limit is not None:
+        query = query.limit(limit)
+
+    return jsonify({
+        "status": 200,
+        "message": "Meals Ranked",
+        "data": {
+            "meals": [{
+                "id": meal.id,
+                "name": meal.name,
+                "image_url": meal.image_url,
+                "difficulty": meal.difficulty,
+                "sleep_until": meal.sleep_until.isoformat() if meal.sleep_until is not None else None,
+                "last_planned_at": meal.last_planned_at.isoformat() if meal.last_planned_at is not None else None,
+                "times_planned": meal.times_planned
+            } for meal in query.all()]
+        }
+    })
+
+@bp.route("/search", methods=["GET"])
+def search_meals():
+    user_id = request.args.get("user_id")
+    query = request.args.get("q", "").strip()
+    if user_id is None or query == "":
+        return jsonify({
+            "status": 400,
+            "message": "Error: user_id and q are required.",
+            "data": {}
+        })
+
+    try:
+        page = max(1, int(request.args.get("page", 1)))
+        per_page = min(100, max(1, int(request.args.get("per_page", 20))))
+    except ValueError:
+        return jsonify({
+            "status": 400,
+            "message": "Error: page and per_page must be numbers.",
+            "data": {}
+        })
+    visible = db.or_(Meal.user_id == user_id, Meal.id.in_(db.select(shared_meals_table.c.meal_id).where(shared_meals_table.c.user_id == user_id)))
+    columns = (Meal.id, Meal.name, Meal.description, Meal.image_url, Meal.difficulty, Meal.user_username, Meal.owner_username)
+
+    if supports_full_text_search():
+        ts_query = db.func.plainto_tsquery("english", query)
+        rank = db.func.ts_rank(Meal.search_vector, ts_query)
+        rows = db.session.query(*columns, rank).filter(visible, Meal.search_vector.op("@@")(ts_query)).order_by(rank.desc(), Meal.id).offset((page - 1) * per_page).limit(per_page + 1).all()
+        results = [dict(zip(("id", "name", "description", "image_url", "difficulty", "user_username", "owner_username", "rank"), row)) for row in rows]
+    else:
+        allowed_ids = set(meal_id for meal_id, in db.session.query(Meal.id).filter(visible).all())
+        matches = get_meal_search_index().search(query, allowed_ids)[(page - 1) * per_page:page * per_page + 1]
+        meals = {row.id: row for row in db.session.query(*columns).filter(Meal.id.in_([meal_id for meal_id, rank in matches])).all()}
+        results = [dict(zip(("id", "name", "description", "image_url", "difficulty", "user_username", "owner_username", "rank"), (*meals[meal_id], rank))) for meal_id, rank in matches if meal_id in meals]
+
+    return jsonify({
+        "status": 200,
+        "message": "Meals Found",
+        "data": {
+            "results": results[:per_page],
+            "page": page,
+            "per_page": per_page,
+            "has_more": len(results) > per_page
+        }
+    })
+
+@bp.route("/meal/get/<id>", methods=["GET"])
+def get_meal_by_id(id):
+    record = db.session.query(Meal).filter(Meal.id == id).first()
+    return jsonify(meal_schema.dump(record))
+
+@bp.route("/meal/update/<id>", methods=["PUT"])
+def update_meal(id):
+    if request.content_type != "application/json":
+        return jsonify({
+            "status": 400,
+            "message": "Error: Data must be sent as JSON.",
+            "data": {}
+        })
+
+    data = request.get_json()
+    name = data.get("name")
+    description = data.get("description")
+    difficulty = data.get("difficulty")
+    image_url = data.get("image_url", -1)
+    sleep_until = data.get("sleep_until")
+
+    try:
+        sleep_until_date = parse_date(sleep_until)
+    except ValueError:
+        return jsonify({
+            "status": 400,
+            "message": "Error: sleep_until must be a date.",
+            "data": {}
+        })
+
+    record = db.session.query(Meal).filter(Meal.id == id).first()
+    if name is not None:
+        record.name = name
+    if description is not None:
+        record.description = description
+    if image_url != -1:
+        record.image_url = image_url
+    if difficulty is not None:
+        record.difficulty = difficulty
+    if sleep_until is not None:
+        record.sleep_until = sleep_until_date
+
+    db.session.commit()
+
+    index = get_loaded_meal_index(record.user_id)
+    if index is not None and sleep_until is not None:
+        index.set_sleep_until(record.id, sleep_until_date)
+
+    if name is not None or description is not None:
+        refresh_meal_search(record.id)
+
+    return jsonify({
+        "status": 200,
+        "message": "Meal Updated",
+        "data": meal_schema.dump(record)
+    })
+
+@bp.route("/meal/delete/<id>", methods=["DELETE"])
+def delete_meal(id):
+    record = db.session.query(Meal).filter(Meal.id == id).first()
+    recipe = db.session.query(Recipe).filter(Recipe.meal_id == record.id).first()
+    for user in record.shared_users:
+        user.shared_meals.remove(record)
+        db.session.commit()
+    db.session.delete(record)
+    db.session.commit()
+
+    index = get_loaded_meal_index(record.user_id)
+    if index is not None:
+        index.remove_meal(record.id)
+
+    refresh_meal_search(record.id)
+
+    for ingredient in recipe.ingredients:
+        for shoppingingredient in ingredient.shoppingingredients:
+            db.session.delete(shoppingingredient)
+            db.session.commit()
+            emit_event("shared-shoppingingredient-update", {
+                "data": shoppingingredient_schema.dump(shoppingingredient),
+                "type": "delete"
+            })
+
+    return jsonify({
+        "status": 200,
+        "message": "Meal Deleted",
+        "data": meal_schema.dump(record)
+    })
+
+@bp.route("/meal/unshare/<id>/<user_id>", methods=["DELETE"])
+def unshare_meal(id, user_id):
+    record = db.session.query(Meal).filter(Meal.id == id).first()
+    shared_user = get_user(user_id)
+
+    if shared_user.shared_meals.count(record) == 0:
+        return jsonify({
+                "status": 400,
+                "message": "Error: Shared meal does not exist.",
+                "data": {}
+            })
+
+    shared_user.shared_meals.remove(record)
+    db.session.commit()
+
+    return jsonify({
+        "status": 200,
+        "message": "Meal Share Deleted",
+        "data":{
+            "meal": meal_schema.dump(record),
+            "user": user_schema.dump(shared_user)
+        }
+    })
+
+
+@bp.route("/category/add", methods=["POST"])
+def add_category():
+    if request.content_type != "application/json":
+        return jsonify({
+            "status": 400,
+            "message": "Error: Data must be sent as JSON.",
+            "data": {}
+        })
+
+    data = request.get_json()
+    name = data.get("name")
+    user_id = data.get("user_id")
+
+    record = Category(name, user_id)
+    db.session.add(record)
+    db.session.commit()
+
+    return jsonify({
+        "status": 200,
+        "message": "Category Added",
+        "data": category_schema.dump(record)
+    })
+
+@bp.route("/category/add/multiple", methods=["POST"])
+def add_multiple_categories():
+    if request.content_type != "application/json":
+        return jsonify({
+            "status": 400,
+            "message": "Error: Data must be sent as JSON.",
+            "data": {}
+        })
+
+    data = request.get_json()
+    records = []
+    for data in data:
+        name = data.get("name")
+        user_id = data.get("user_id")
+
+        record = Category(name, user_id)
+        db.session.add(record)
+        db.session.commit()
+
+        records.append(record)
+
+    return jsonify({
+        "status": 200,
+        "message": "Categories Added",
+        "data": multiple_category_schema.dump(records)
+    })
+
+@bp.route("/category/attach", methods=["POST"])
+def attach_category():
+    if request.content_type != "application/json":
+        return jsonify({
+            "status": 400,
+            "message": "Error: Data must be sent as JSON.",
+            "data": {}
+        })
+
+    data = request.get_json()
+    category_id = data.get("category_id")
+    meal_id = data.get("meal_id")
+
+    record = db.session.query(Category).filter(Category.id == category_id).first()
+    meal = db.session.query(Meal).filter(Meal.id == meal_id).first()
+    meal.categories.append(record)
+    db.session.commit()
+
+    index = get_loaded_meal_index(meal.user_id)
+    if index is not None:
+        index.attach(record.id, meal.id)
+
+    return jsonify({
+        "status": 200,
+        "message": "Category Attached",
+        "data": {
+            "category": category_schema.dump(record),
+            "meal": meal_schema.dump(meal)
+        }
+    })
+
+@bp.route("/category/attach/multiple", methods=["POST"])
+def attach_multiple_categories():
+    if request.content_type != "application/json":
+        return jsonify({
+            "status": 400,
+            "message": "Error: Data must be sent as JSON.",
+            "data": {}
+        })
+
+    data = request.get_json()
+
+    records = []
+    meals = []
+    for data in data:
+        category_id = data.get("category_id")
+        meal_id = data.get("meal_id")
+
+        record = db.session.query(Category).filter(Category.id == category_id).first()
+        meal = db.session.query(Meal).filter(Meal.id == meal_id).first()
+        meal.categories.append(record)
+        db.session.commit()
+
+        index = get_loaded_meal_index(meal.user_id)
+        if index is not None:
+            index.attach(record.id, meal.id)
+
+        records.append(record)
+        meals.append(meal)
+
+    return jsonify({
+        "status": 200,
+        "message": "Category Attached",
+        "data": {
+            "categories": multiple_category_schema.dump(records),
+            "meals": multiple_meal_schema.dump(meals)
+        }
+    })
+
+@bp.route("/category/get", methods=["GET"])
+def get_all_categories():
+    records = db.session.query(Category).all()
+    return stream_json(multiple_category_schema.dump(records))
+
+@bp.route("/category/get/<id>", methods=["GET"])
+def get_category_by_id(id):
+    record = db.session.query(Category).filter(Category.id == id).first()
+    return jsonify(category_schema.dump(record))
+
+@bp.route("/category/update/<id>", methods=["PUT"])
+def update_category(id):
+    if request.content_type != "application/json":
+        return jsonify({
+            "status": 400,
+            "message": "Error: Data must be sent as JSON.",
+            "data": {}
+        })
+
+    data = request.get_json()
+    name = data.get("name")
+
+    record = db.session.query(Category).filter(Category.id == id).first()
+    if name is not None:
+        record.name = name
+
+    db.session.commit()
+
+    return jsonify({
+        "status": 200,
+        "message": "Category Updated",
+        "data": category_schema.dump(record)
+    })
+
+@bp.route("/category/unattach", methods=["DELETE"])
+def unattach_category():
+    if request.content_type != "application/json":
+        return jsonify({
+            "status": 400,
+            "message": "Error: Data must be sent as JSON.",
+            "data": {}
+        })
+
+    data = request.get_json()
+    category_id = data.get("category_id")
+    meal_id = data.get("meal_id")
+
+    record = db.session.query(Category).filter(Category.id == category_id).first()
+    meal = db.session.query(Meal).filter(Meal.id == meal_id).first()
+    meal.categories.remove(record)
+    db.session.commit()
+
+    index = get_loaded_meal_index(meal.user_id)
+    if index is not None:
+        index.detach(record.id, meal.id)
+
+    return jsonify({
+        "status": 200,
+        "message": "Category Unattached",
+        "data": {
+            "category": category_schema.dump(record),
+            "meal": meal_schema.dump(meal)
+        }
+    })
+
+@bp.route("/category/unattach/multiple", methods=["DELETE"])
+def unattach_multiple_categories():
+    if request.content_type != "application/json":
+        return jsonify({
+            "status": 400,
+            "message": "Error: Data must be sent as JSON.",
+            "data": {}
+        })
+
+    data = request.get_json()
+
+    records = []
+    meals = []
+    for data in data:
+        category_id = data.get("category_id")
+        meal_id = data.get("meal_id")
+
+        record = db.session.query(Category).filter(Category.id == category_id).first()
+        meal = db.session.query(Meal).filter(Meal.id == meal_id).first()
+        meal.categories.remove(record)
+        db.session.commit()
+
+        index = get_loaded_meal_index(meal.user_id)
+        if index is not None:
+            index.detach(record.id, meal.id)
+
+        records.append(record)
+        meals.append(meal)
+
+    return jsonify({
+        "status": 200,
+        "message": "Category Unattached",
+        "data": {
+            "categories": multiple_category_schema.dump(records),
+            "meals": multiple_meal_schema.dump(meals)
+        }
+    })
+
+@bp.route("/category/delete/<id>", methods=["DELETE"])
+def delete_category(id):
+    record = db.session.query(Category).filter(Category.id == id).first()
+    db.session.delete(record)
+    db.session.commit()
+
+    for entry in meal_indexes.values():
+        entry["index"].remove_category(record.id)
+    return jsonify({
+        "status": 200,
+        "message": "Category Deleted",
+        "data": category_schema.dump(record)
+    })
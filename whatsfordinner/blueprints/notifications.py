@@ -0,0 +1,73 @@
+from flask import Blueprint, request, jsonify
+
+from whatsfordinner.extensions import db
+from whatsfordinner.models import Notification
+from whatsfordinner.schemas import notification_schema, multiple_notification_schema, user_schema
+from whatsfordinner.compression import stream_json
+from whatsfordinner.identity import get_caller
+
+bp = Blueprint("notifications", __name__)
+
+@bp.route("/notification/add", methods=["POST"])
+def add_notification():
+    if request.content_type != "application/json":
+        return jsonify({
+            "status": 400,
+            "message": "Error: Data must be sent as JSON.",
+            "data": {}
+        })
+
+    data = request.get_json()
+    category = data.get("category")
+    username = data.get("username")
+    name = data.get("name")
+    user_id = data.get("user_id")
+
+    record = Notification(category, username, name, user_id)
+    db.session.add(record)
+    db.session.commit()
+
+    return jsonify({
+        "status": 200,
+        "message": "Notification Added",
+        "data": notification_schema.dump(record)
+    })
+
+@bp.route("/notification/get", methods=["GET"])
+def get_all_notifications():
+    records = db.session.query(Notification).all()
+    return stream_json(multiple_notification_schema.dump(records))
+
+@bp.route("/notification/get/<id>", methods=["GET"])
+def get_notification_by_id(id):
+    record = db.session.query(Notification).filter(Notification.id == id).first()
+    return jsonify(notification_schema.dump(record))
+
+@bp.route("/notification/delete/single/<id>", methods=["DELETE"])
+def delete_notification(id):
+    record = db.session.query(Notification).filter(Notification.id == id).first()
+    db.session.delete(record)
+    db.session.commit()
+    return jsonify({
+        "status": 200,
+        "message": "Notification Deleted",
+        "data": notification_schema.dump(record)
+    })
+
+@bp.route("/notification/delete/all/<user_id>", methods=["DELETE"])
+def delete_all_notifications(user_id):
+    user = get_caller(user_id)
+    records = []
+    for notification in user.notifications:
+        record = db.session.query(Notification).filter(Notification.id == notification.id).first()
+        db.session.delete(record)
+        db.session.commit()
+        records.append(record)
+    return jsonify({
+        "status": 200,
+        "message": "Notifications Deleted",
+        "data": {
+            "user": user_schema.dump(user),
+            "notifications": multiple_notification_schema.dump(records)
+        }
+    })
@@ -0,0 +1,558 @@
+from flask import Blueprint, request, jsonify
+
+from functools import reduce
+
+from whatsfordinner.extensions import db
+from whatsfordinner.models import Meal, Recipe, Stepsection, Step, Ingredientsection, Ingredient, Shoppingingredient
+from whatsfordinner.schemas import shoppingingredient_schema, ingredient_schema, multiple_ingredient_schema, ingredientsection_schema, multiple_ingredientsection_schema, step_schema, multiple_step_schema, stepsection_schema, multiple_stepsection_schema, recipe_schema, multiple_recipe_schema, meal_schema, mealplan_schema
+from whatsfordinner.compression import stream_json
+from whatsfordinner.realtime import emit_event
+from whatsfordinner.meal_search import refresh_meal_search, refresh_recipe_search
+
+bp = Blueprint("recipes", __name__)
+
+@bp.route("/recipe/add", methods=["POST"])
+def add_recipe():
+    if request.content_type != "application/json":
+        return jsonify({
+            "status": 400,
+            "message": "Error: Data must be sent as JSON.",
+            "data": {}
+        })
+
+    data = request.get_json()
+    meal_id = data.get("meal_id")
+
+    recipe_check = db.session.query(Recipe).filter(Recipe.meal_id == meal_id).first()
+    if recipe_check is not None:
+        return jsonify({
+            "status": 400,
+            "message": "Error: Recipe already exists.",
+            "data": {}
+        })
+
+    record = Recipe(meal_id)
+    db.session.add(record)
+    db.session.commit()
+
+    return jsonify({
+        "status": 200,
+        "message": "Recipe Added",
+        "data": recipe_schema.dump(record)
+    })
+
+@bp.route("/recipe/get", methods=["GET"])
+def get_all_recipes():
+    records = db.session.query(Recipe).all()
+    return stream_json(multiple_recipe_schema.dump(records))
+
+@bp.route("/recipe/get/<id>", methods=["GET"])
+def get_recipe_by_id(id):
+    record = db.session.query(Recipe).filter(Recipe.id == id).first()
+    return jsonify(meal_schema.dump(record))
+
+@bp.route("/recipe/delete/<id>", methods=["DELETE"])
+def delete_recipe(id):
+    record = db.session.query(Recipe).filter(Recipe.id == id).first()
+    db.session.delete(record)
+    db.session.commit()
+
+    refresh_meal_search(record.meal_id)
+    return jsonify({
+        "status": 200,
+        "message": "Recipe Deleted",
+        "data": recipe_schema.dump(record)
+    })
+
+
+@bp.route("/stepsection/add", methods=["POST"])
+def add_stepsection():
+    if request.content_type != "application/json":
+        return jsonify({
+            "status": 400,
+            "message": "Error: Data must be sent as JSON.",
+            "data": {}
+        })
+
+    data = request.get_json()
+    title = data.get("title")
+    recipe_id = data.get("recipe_id")
+
+    record = Stepsection(title, recipe_id)
+    db.session.add(record)
+    db.session.commit()
+
+    return jsonify({
+        "status": 200,
+        "message": "Stepsection Added",
+        "data": stepsection_schema.dump(record)
+    })
+
+@bp.route("/stepsection/add/multiple", methods=["POST"])
+def add_multiple_stepsections():
+    if request.content_type != "application/json":
+        return jsonify({
+            "status": 400,
+            "message": "Error: Data must be sent as JSON.",
+            "data": {}
+        })
+
+    data = request.get_json()
+    records = []
+    for data in data:
+        title = data.get("title")
+        recipe_id = data.get("recipe_id")
+
+        record = Stepsection(title, recipe_id)
+        db.session.add(record)
+        db.session.commit()
+
+        records.append(record)
+
+    return jsonify({
+        "status": 200,
+        "message": "Stepsections Added",
+        "data": multiple_stepsection_schema.dump(records)
+    })
+
+@bp.route("/stepsection/get", methods=["GET"])
+def get_all_stepsections():
+    records = db.session.query(Stepsection).all()
+    return stream_json(multiple_stepsection_schema.dump(records))
+
+@bp.route("/stepsection/get/<id>", methods=["GET"])
+def get_stepsection_by_id(id):
+    record = db.session.query(Stepsection).filter(Stepsection.id == id).first()
+    return jsonify(stepsection_schema.dump(record))
+
+@bp.route("/stepsection/update/<id>", methods=["PUT"])
+def update_stepsection(id):
+    if request.content_type != "application/json":
+        return jsonify({
+            "status": 400,
+            "message": "Error: Data must be sent as JSON.",
+            "data": {}
+        })
+
+    data = request.get_json()
+    title = data.get("title")
+
+    record = db.session.query(Stepsection).filter(Stepsection.id == id).first()
+    if title is not None:
+        record.title = title
+
+    db.session.commit()
+
+    return jsonify({
+        "status": 200,
+        "message": "Stepsection Updated",
+        "data": stepsection_schema.dump(record)
+    })
+
+@bp.route("/stepsection/delete/<id>", methods=["DELETE"])
+def delete_stepsection(id):
+    record = db.session.query(Stepsection).filter(Stepsection.id == id).first()
+    db.session.delete(record)
+    db.session.commit()
+
+    refresh_recipe_search(record.recipe_id)
+    return jsonify({
+        "status": 200,
+        "message": "Stepsection Deleted",
+        "data": stepsection_schema.dump(record)
+    })
+
+
+@bp.route("/step/add", methods=["POST"])
+def add_step():
+    if request.content_type != "application/json":
+        return jsonify({
+            "status": 400,
+            "message": "Error: Data must be sent as JSON.",
+            "data": {}
+        })
+
+    data = request.get_json()
+    number = data.get("number")
+    text = data.get("text")
+    recipe_id = data.get("recipe_id")
+    stepsection_id = data.get("stepsection_id")
+
+    record = Step(number, text, recipe_id, stepsection_id)
+    db.session.add(record)
+    db.session.commit()
+
+    refresh_recipe_search(record.recipe_id)
+
+    return jsonify({
+        "status": 200,
+        "message": "Step Added",
+        "data": step_schema.dump(record)
+    })
+
+@bp.route("/step/add/multiple", methods=["POST"])
+def add_multiple_steps():
+    if request.content_type != "application/json":
+        return jsonify({
+            "status": 400,
+            "message": "Error: Data must be sent as JSON.",
+            "data": {}
+        })
+
+    data = request.get_json()
+    records = []
+    for data in data:
+        number = data.get("number")
+        text = data.get("text")
+        recipe_id = data.get("recipe_id")
+        stepsection_id = data.get("stepsection_id")
+
+        record = Step(number, text, recipe_id, stepsection_id)
+        db.session.add(record)
+        db.session.commit()
+
+        records.append(record)
+
+    refresh_recipe_search(*set(record.recipe_id for record in records))
+
+    return jsonify({
+        "status": 200,
+        "message": "Steps Added",
+        "data": multiple_step_schema.dump(records)
+    })
+
+@bp.route("/step/get", methods=["GET"])
+def get_all_steps():
+    records = db.session.query(Step).all()
+    return stream_json(multiple_step_schema.dump(records))
+
+@bp.route("/step/get/<id>", methods=["GET"])
+def get_step_by_id(id):
+    record = db.session.query(Step).filter(Step.id == id).first()
+    return jsonify(step_schema.dump(record))
+
+@bp.route("/step/update/<id>", methods=["PUT"])
+def update_step(id):
+    if request.content_type != "application/json":
+        return jsonify({
+            "status": 400,
+            "message": "Error: Data must be sent as JSON.",
+            "data": {}
+        })
+
+    data = request.get_json()
+    number = data.get("number")
+    text = data.get("text")
+
+    record = db.session.query(Step).filter(Step.id == id).first()
+    if number is not None:
+        record.number = number
+    if text is not None:
+        record.text = text
+
+    db.session.commit()
+
+    if text is not None:
+        refresh_recipe_search(record.recipe_id)
+
+    return jsonify({
+        "status": 200,
+        "message": "Step Updated",
+        "data": step_schema.dump(record)
+    })
+
+@bp.route("/step/delete/<id>", methods=["DELETE"])
+def delete_step(id):
+    record = db.session.query(Step).filter(Step.id == id).first()
+    db.session.delete(record)
+    db.session.commit()
+
+    refresh_recipe_search(record.recipe_id)
+    return jsonify({
+        "status": 200,
+        "message": "Step Deleted",
+        "data": step_schema.dump(record)
+    })
+
+
+@bp.route("/ingredientsection/add", methods=["POST"])
+def add_ingredientsection():
+    if request.content_type != "application/json":
+        return jsonify({
+            "status": 400,
+            "message": "Error: Data must be sent as JSON.",
+            "data": {}
+        })
+
+    data = request.get_json()
+    title = data.get("title")
+    recipe_id = data.get("recipe_id")
+
+    record = Ingredientsection(title, recipe_id)
+    db.session.add(record)
+    db.session.commit()
+
+    return jsonify({
+        "status": 200,
+        "message": "Ingredientsection Added",
+        "data": ingredientsection_schema.dump(record)
+    })
+
+@bp.route("/ingredientsection/add/multiple", methods=["POST"])
+def add_multiple_ingredientsections():
+    if request.content_type != "application/json":
+        return jsonify({
+            "status": 400,
+            "message": "Error: Data must be sent as JSON.",
+            "data": {}
+        })
+
+    data = request.get_json()
+    records = []
+    for data in data:
+        title = data.get("title")
+        recipe_id = data.get("recipe_id")
+
+        record = Ingredientsection(title, recipe_id)
+        db.session.add(record)
+        db.session.commit()
+
+        records.append(record)
+
+    return jsonify({
+        "status": 200,
+        "message": "Ingredientsections Added",
+        "data": multiple_ingredientsection_schema.dump(records)
+    })
+
+@bp.route("/ingredientsection/get", methods=["GET"])
+def get_all_ingredientsections():
+    records = db.session.query(Ingredientsection).all()
+    return stream_json(multiple_ingredientsection_schema.dump(records))
+
+@bp.route("/ingredientsection/get/<id>", methods=["GET"])
+def get_ingredientsection_by_id(id):
+    record = db.session.query(Ingredientsection).filter(Ingredientsection.id == id).first()
+    return jsonify(ingredientsection_schema.dump(record))
+
+@bp.route("/ingredientsection/update/<id>", methods=["PUT"])
+def update_ingredientsection(id):
+    if request.content_type != "application/json":
+        return jsonify({
+            "status": 400,
+            "message": "Error: Data must be sent as JSON.",
+            "data": {}
+        })
+
+    data = request.get_json()
+    title = data.get("title")
+
+    record = db.session.query(Ingredientsection).filter(Ingredientsection.id == id).first()
+    if title is not None:
+        record.title = title
+
+    db.session.commit()
+
+    return jsonify({
+        "status": 200,
+        "message": "Ingredientsection Updated",
+        "data": ingredientsection_schema.dump(record)
+    })
+
+@bp.route("/ingredientsection/delete/<id>", methods=["DELETE"])
+def delete_ingredientsection(id):
+    record = db.session.query(Ingredientsection).filter(Ingredientsection.id == id).first()
+    db.session.delete(record)
+    db.session.commit()
+
+    refresh_recipe_search(record.recipe_id)
+
+    for ingredient in record.ingredients:
+        for shoppingingredient in ingredient.shoppingingredients:
+            db.session.delete(shoppingingredient)
+            db.session.commit()
+            emit_event("shoppingingredient-update", {
+                "data": shoppingingredient_schema.dump(shoppingingredient),
+                "type": "delete"
+            })
+
+    return jsonify({
+        "status": 200,
+        "message": "Ingredientsection Deleted",
+        "data": ingredientsection_schema.dump(record)
+    })
+
+
+@bp.route("/ingredient/add", methods=["POST"])
+def add_ingredient():
+    if request.content_type != "application/json":
+        return jsonify({
+            "status": 400,
+            "message": "Error: Data must be sent as JSON.",
+            "data": {}
+        })
+
+    data = request.get_json()
+    name = data.get("name")
+    amount = data.get("amount")
+    unit = data.get("unit")
+    category = data.get("category")
+    recipe_id = data.get("recipe_id")
+    ingredientsection_id = data.get("ingredientsection_id")
+
+    record = Ingredient(name, amount, unit, category, recipe_id, ingredientsection_id)
+    db.session.add(record)
+    db.session.commit()
+
+    refresh_recipe_search(record.recipe_id)
+
+    meal = db.session.query(Meal).join(Recipe).filter(Recipe.id == record.recipe_id).first()
+    for mealplan in meal.mealplans:
+        if mealplan.shoppinglists is not None:
+            shoppinglist = mealplan_schema.dump(mealplan)["shoppinglist"]
+            multiplier =  reduce(lambda lowest, next_ingredient: lowest if lowest < next_ingredient["multiplier"] else next_ingredient["multiplier"], shoppinglist["shoppingingredients"], 1 if len(shoppinglist["shoppingingredients"]) == 0 else shoppinglist["shoppingingredients"][0]["multiplier"])
+            shoppingingredient = Shoppingingredient(name, amount, unit, category, multiplier, meal.name, shoppinglist["id"], record.id)
+            db.session.add(shoppingingredient)
+            db.session.commit()
+            emit_event("shared-shoppingingredient-update", {
+                "data": shoppingingredient_schema.dump(shoppingingredient),
+                "type": "add"
+            })
+
+    return jsonify({
+        "status": 200,
+        "message": "Ingredient Added",
+        "data": ingredient_schema.dump(record)
+    })
+
+@bp.route("/ingredient/add/multiple", methods=["POST"])
+def add_multiple_ingredients():
+    if request.content_type != "application/json":
+        return jsonify({
+            "status": 400,
+            "message": "Error: Data must be sent as JSON.",
+            "data": {}
+        })
+
+    data = request.get_json()
+    records = []
+    for data in data:
+        name = data.get("name")
+        amount = data.get("amount")
+        unit = data.get("unit")
+        category = data.get("category")
+        recipe_id = data.get("recipe_id")
+        ingredientsection_id = data.get("ingredientsection_id")
+
+        record = Ingredient(name, amount, unit, category, recipe_id, ingredientsection_id)
+        db.session.add(record)
+        db.session.commit()
+
+        records.append(record)
+
+        meal = db.session.query(Meal).join(Recipe).filter(Recipe.id == record.recipe_id).first()
+        for mealplan in meal.mealplans:
+            if mealplan.shoppinglists is not None:
+                shoppinglist = mealplan_schema.dump(mealplan)["shoppinglist"]
+                multiplier = reduce(lambda lowest, next_ingredient: lowest if lowest < next_ingredient["multiplier"] else next_ingredient["multiplier"], shoppinglist["shoppingingredients"], 1 if len(shoppinglist["shoppingingredients"]) == 0 else shoppinglist["shoppingingredients"][0]["multiplier"])
+                shoppingingredient = Shoppingingredient(name, amount, unit, category, multiplier, meal.name, shoppinglist["id"], record.id)
+                db.session.add(shoppingingredient)
+                db.session.commit()
+                emit_event("shared-shoppingingredient-update", {
+                    "data": shoppingingredient_schema.dump(shoppingingredient),
+                    "type": "add"
+                })
+
+    refresh_recipe_search(*set(record.recipe_id for record in records))
+
+    return jsonify({
+        "status": 200,
+        "message": "Ingredients Added",
+        "data": multiple_ingredient_schema.dump(records)
+    })
+
+@bp.route("/ingredient/get", methods=["GET"])
+def get_all_ingredients():
+    records = db.session.query(Ingredient).all()
+    return stream_json(multiple_ingredient_schema.dump(records))
+
+@bp.route("/ingredient/get/<id>", methods=["GET"])
+def get_ingredient_by_id(id):
+    record = db.session.query(Ingredient).filter(Ingredient.id == id).first()
+    return jsonify(ingredient_schema.dump(record))
+
+@bp.route("/ingredient/update/<id>", methods=["PUT"])
+def update_ingredient(id):
+    if request.content_type != "application/json":
+        return jsonify({
+            "status": 400,
+            "message": "Error: Data must be sent as JSON.",
+            "data": {}
+        })
+
+    data = request.get_json()
+    name = data.get("name")
+    amount = data.get("amount")
+    unit = data.get("unit")
+    category = data.get("category")
+
+    record = db.session.query(Ingredient).filter(Ingredient.id == id).first()
+    if name is not None:
+        record.name = name
+        for shoppingingredient in record.shoppingingredients:
+            shoppingingredient.name = name
+            db.session.commit()
+    if amount is not None:
+        record.amount = amount
+        for shoppingingredient in record.shoppingingredients:
+            shoppingingredient.amount = amount
+            db.session.commit()
+    if unit is not None:
+        record.unit = unit
+        for shoppingingredient in record.shoppingingredients:
+            shoppingingredient.unit = unit
+            db.session.commit()
+    if category is not None:
+        record.category = category
+        for shoppingingredient in record.shoppingingredients:
+            shoppingingredient.category = category
+            db.session.commit()
+
+    for shoppingingredient in record.shoppingingredients:
+        emit_event("shared-shoppingingredient-update", {
+            "data": shoppingingredient_schema.dump(shoppingingredient),
+            "type": "update"
+        })
+
+    db.session.commit()
+
+    if name is not None:
+        refresh_recipe_search(record.recipe_id)
+
+    return jsonify({
+        "status": 200,
+        "message": "Ingredient Updated",
+        "data": ingredient_schema.dump(record)
+    })
+
+@bp.route("/ingredient/delete/<id>", methods=["DELETE"])
+def delete_ingredient(id):
+    record = db.session.query(Ingredient).filter(Ingredient.id == id).first()
+    db.session.delete(record)
+    db.session.commit()
+
+    refresh_recipe_search(record.recipe_id)
+
+    for shoppingingredient in record.shoppingingredients:
+        db.session.delete(shoppingingredient)
+        db.session.commit()
+        emit_event("shared-shoppingingredient-update", {
+            "data": shoppingingredient_schema.dump(shoppingingredient),
+            "type": "delete"
+        })
+
+    return jsonify({
+        "status": 200,
+        "message": "Ingredient Deleted",
+        "data": ingredient_schema.dump(record)
+    })
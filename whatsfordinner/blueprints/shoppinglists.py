@@ -0,0 +1,486 @@
+from flask import Blueprint, request, jsonify
+
+from datetime import datetime
+
+from whatsfordinner.ingredient_consolidation import consolidate
+from whatsfordinner.date_parsing import parse_timestamp
+from whatsfordinner.extensions import db
+from whatsfordinner.models import shared_shoppinglists_table, User, Notification, Mealplan, Shoppinglist, Shoppingingredient
+from whatsfordinner.schemas import shoppingingredient_schema, multiple_shoppingingredient_schema, shoppinglist_schema, multiple_shoppinglist_schema, multiple_shoppinglist_summary_schema, shoppinglist_header_schema, ingredient_schema, notification_schema, user_schema
+from whatsfordinner.compression import stream_json
+from whatsfordinner.realtime import emit_event
+from whatsfordinner.hot_shoppinglists import toggle_hot_shoppingingredient, take_pending_toggle, is_hot_toggle
+from whatsfordinner.filters import filter_by_created_on
+from whatsfordinner.identity import get_user, get_caller, get_user_settings
+
+bp = Blueprint("shoppinglists", __name__)
+
+@bp.route("/shoppinglist/add", methods=["POST"])
+def add_shoppinglist():
+    if request.content_type != "application/json":
+        return jsonify({
+            "status": 400,
+            "message": "Error: Data must be sent as JSON.",
+            "data": {}
+        })
+
+    data = request.get_json()
+    name = data.get("name")
+    updates_hidden = data.get("updates_hidden")
+    is_sublist = data.get("is_sublist", False)
+    user_username = data.get("user_username")
+    user_id = data.get("user_id")
+    mealplan_id = data.get("mealplan_id")
+
+    try:
+        created_on = parse_timestamp(data.get("created_on")) or datetime.utcnow()
+    except ValueError:
+        return jsonify({
+            "status": 400,
+            "message": "Error: created_on must be a date.",
+            "data": {}
+        })
+
+    record = Shoppinglist(name, created_on, updates_hidden, is_sublist, user_username, user_id, mealplan_id)
+    db.session.add(record)
+    db.session.commit()
+
+    if mealplan_id is not None:
+        mealplan = db.session.query(Mealplan).filter(Mealplan.id == mealplan_id).first()
+        for user in mealplan.shared_users:
+            user.shared_shoppinglists.append(record)
+            db.session.commit()
+
+            emit_event("shoppinglist-share-update", {
+                "data": {
+                    "shoppinglist": shoppinglist_schema.dump(record),
+                    "user": user_schema.dump(user),
+                    "notification": {}
+                },
+                "type": "add"
+            })
+
+    return jsonify({
+        "status": 200,
+        "message": "Shoppinglist Added",
+        "data": shoppinglist_schema.dump(record)
+    })
+
+@bp.route("/shoppinglist/share", methods=["POST"])
+def share_shoppinglist():
+    if request.content_type != "application/json":
+        return jsonify({
+            "status": 400,
+            "message": "Error: Data must be sent as JSON.",
+            "data": {}
+        })
+
+    data = request.get_json()
+    shoppinglist_id = data.get("shoppinglist_id")
+    username = data.get("username")
+
+    shared_shoppinglist = db.session.query(Shoppinglist).filter(Shoppinglist.id == shoppinglist_id).first()
+    shared_user = db.session.query(User).filter(User.username == username).first()
+    user = get_caller(shared_shoppinglist.user_id)
+
+    if shared_user is None:
+        return jsonify({
+            "status": 400,
+            "message": "User doesn't exist.",
+            "data": {}
+        })
+
+    if not shared_user.settings[0].allow_nonfriend_sharing and not user in shared_user.friends:
+        return jsonify({
+            "status": 400,
+            "message": f"Sorry, {shared_user.username} is only accepting shares from friends.",
+            "data": {}
+        })
+
+    shared_user.shared_shoppinglists.append(shared_shoppinglist)
+    db.session.commit()
+
+    notification = Notification("shoppinglist", shared_shoppinglist.user_username, shared_shoppinglist.name, shared_user.id)
+    db.session.add(notification)
+    db.session.commit()
+
+    emit_event("shoppinglist-share-update", {
+        "data": {
+            "shoppinglist": shoppinglist_schema.dump(shared_shoppinglist),
+            "user": user_schema.dump(shared_user),
+            "notification": notification_schema.dump(notification)
+        },
+        "type": "add"
+    })
+
+    return jsonify({
+        "status": 200,
+        "message": "Shoppinglist Shared",
+        "data": {
+            "shoppinglist": shoppinglist_schema.dump(shared_shoppinglist),
+            "user": user_schema.dump(shared_user)
+        }
+    })
+
+@bp.route("/shoppinglist/get", methods=["GET"])
+def get_all_shoppinglists():
+    try:
+        query = filter_by_created_on(db.session.query(Shoppinglist), Shoppinglist)
+    except ValueError:
+        return jsonify({
+            "status": 400,
+            "message": "Error: from and to must be dates.",
+            "data": {}
+        })
+
+    if request.args.get("items", "true").lower() == "false":
+        records = query.options(db.selectinload(Shoppinglist.progress)).all()
+        return stream_json(multiple_shoppinglist_summary_schema.dump(records))
+
+    records = query.all()
+    return stream_json(multiple_shoppinglist_schema.dump(records))
+
+@bp.route("/shoppinglist/summary", methods=["GET"])
+def get_shoppinglist_summaries():
+    user_id = request.args.get("user_id")
+    if user_id is None:
+        return jsonify({
+            "status": 400,
+            "message": "Error: user_id is required.",
+            "data": {}
+        })
+
+    shared_ids = db.select(shared_shoppinglists_table.c.shoppinglist_id).where(shared_shoppinglists_table.c.user_id == user_id)
+    records = db.session.query(Shoppinglist).filter(db.or_(Shoppinglist.user_id == user_id, Shoppinglist.id.in_(shared_ids))).options(db.selectinload(Shoppinglist.progress)).order_by(Shoppinglist.created_on, Shoppinglist.id).all()
+
+    return jsonify({
+        "status": 200,
+        "message": "Shoppinglist Summaries",
+        "data": multiple_shoppinglist_summary_schema.dump(records)
+    })
+
+@bp.route("/shoppinglist/get/<id>", methods=["GET"])
+def get_shoppinglist_by_id(id):
+    record = db.session.query(Shoppinglist).filter(Shoppinglist.id == id).first()
+    sort = request.args.get("sort")
+    if sort is None or record is None:
+        return jsonify(shoppinglist_schema.dump(record))
+
+    settings = get_user_settings(request.args.get("user_id", record.user_id))
+    if sort == "default" and settings is not None:
+        sort = settings.default_shoppinglist_sort
+    order = get_shoppingingredient_order(sort, settings)
+    if order is None:
+        return jsonify({
+            "status": 400,
+            "message": "Error: Unknown shoppinglist sort.",
+            "data": {}
+        })
+
+    shoppingingredients = db.session.query(Shoppingingredient).filter(Shoppingingredient.shoppinglist_id == record.id).order_by(*order).all()
+    data = shoppinglist_header_schema.dump(record)
+    data["shoppingingredients"] = multiple_shoppingingredient_schema.dump(shoppingingredients)
+    return jsonify(data)
+
+# Sorts match Settings.default_shoppinglist_sort values. Category order is
+# served by the (shoppinglist_id, category, name) index; the aisle order ranks
+# categories by the user's shoppinglist_aisle_order, with unlisted categories
+# after the listed ones.
+def get_shoppingingredient_order(sort, settings=None):
+    sort = (sort or "").strip().lower()
+    if sort == "arbitrary":
+        return [Shoppingingredient.id]
+    if sort == "category":
+        return [Shoppingingredient.category.nulls_last(), Shoppingingredient.name, Shoppingingredient.id]
+    if sort == "meal":
+        return [Shoppingingredient.meal_name.nulls_last(), Shoppingingredient.name, Shoppingingredient.id]
+    if sort in ("name", "alphabetical"):
+        return [Shoppingingredient.name, Shoppingingredient.id]
+    if sort == "aisle":
+        aisle_order = settings.shoppinglist_aisle_order if settings is not None and settings.shoppinglist_aisle_order else []
+        positions = {}
+        for position, category in enumerate(aisle_order):
+            positions.setdefault(category.strip().lower(), position)
+        if len(positions) == 0:
+            return [Shoppingingredient.category.nulls_last(), Shoppingingredient.name, Shoppingingredient.id]
+        aisle = db.case(positions, value=db.func.lower(db.func.trim(Shoppingingredient.category)), else_=len(aisle_order))
+        return [aisle, Shoppingingredient.category.nulls_last(), Shoppingingredient.name, Shoppingingredient.id]
+    return None
+
+@bp.route("/shoppinglist/consolidated/<id>", methods=["GET"])
+def get_consolidated_shoppinglist(id):
+    try:
+        id = int(id)
+    except ValueError:
+        return jsonify({
+            "status": 400,
+            "message": "Error: Shoppinglist id must be a number.",
+            "data": {}
+        })
+
+    records = db.session.query(Shoppingingredient.id, Shoppingingredient.name, Shoppingingredient.amount, Shoppingingredient.unit, Shoppingingredient.category, Shoppingingredient.obtained, Shoppingingredient.multiplier, Shoppingingredient.meal_name).filter(Shoppingingredient.shoppinglist_id == id).order_by(Shoppingingredient.id).all()
+    return jsonify({
+        "status": 200,
+        "message": "Shoppinglist Consolidated",
+        "data": {
+            "shoppinglist_id": id,
+            "shoppingingredients": consolidate([record._asdict() for record in records])
+        }
+    })
+
+@bp.route("/shoppinglist/update/<id>", methods=["PUT"])
+def update_shoppinglist(id):
+    if request.content_type != "application/json":
+        return jsonify({
+            "status": 400,
+            "message": "Error: Data must be sent as JSON.",
+            "data": {}
+        })
+
+    data = request.get_json()
+    name = data.get("name")
+    updates_hidden = data.get("updates_hidden")
+
+    record = db.session.query(Shoppinglist).filter(Shoppinglist.id == id).first()
+    if name is not None:
+        record.name = name
+    if updates_hidden is not None:
+        record.updates_hidden = updates_hidden
+
+    db.session.commit()
+
+    return jsonify({
+        "status": 200,
+        "message": "Shoppinglist Updated",
+        "data": shoppinglist_schema.dump(record)
+    })
+
+@bp.route("/shoppinglist/delete/<id>", methods=["DELETE"])
+def delete_shoppinglist(id):
+    record = db.session.query(Shoppinglist).filter(Shoppinglist.id == id).first()
+    for user in record.shared_users:
+        user.shared_shoppinglists.remove(record)
+        db.session.commit()
+    db.session.delete(record)
+    db.session.commit()
+
+    if record.mealplan_id is not None:
+        mealplan = db.session.query(Mealplan).filter(Mealplan.id == record.mealplan_id).first()
+        for user in mealplan.shared_users:
+            emit_event("shoppinglist-share-update", {
+                "data": {
+                    "shoppinglist": shoppinglist_schema.dump(record),
+                    "user": user_schema.dump(user),
+                    "notification": {}
+                },
+                "type": "delete"
+            })
+
+    return jsonify({
+        "status": 200,
+        "message": "Shoppinglist Deleted",
+        "data": shoppinglist_schema.dump(record)
+    })
+
+@bp.route("/shoppinglist/unshare/<id>/<user_id>", methods=["DELETE"])
+def unshare_shoppinglist(id, user_id):
+    record = db.session.query(Shoppinglist).filter(Shoppinglist.id == id).first()
+    shared_user = get_user(user_id)
+
+    if shared_user.shared_shoppinglists.count(record) == 0:
+        return jsonify({
+                "status": 400,
+                "message": "Error: Shared shoppinglist does not exist.",
+                "data": {}
+            })
+
+    shared_user.shared_shoppinglists.remove(record)
+    db.session.commit()
+
+    return jsonify({
+        "status": 200,
+        "message": "Shoppinglist Share Deleted",
+        "data":{
+            "shoppinglist": shoppinglist_schema.dump(record),
+            "user": user_schema.dump(shared_user)
+        }
+    })
+
+
+@bp.route("/shoppingingredient/add", methods=["POST"])
+def add_shoppingingredient():
+    if request.content_type != "application/json":
+        return jsonify({
+            "status": 400,
+            "message": "Error: Data must be sent as JSON.",
+            "data": {}
+        })
+
+    data = request.get_json()
+    name = data.get("name")
+    amount = data.get("amount")
+    unit = data.get("unit")
+    category = data.get("category")
+    multiplier = data.get("multiplier", 1)
+    meal_name = data.get("meal_name")
+    shoppinglist_id = data.get("shoppinglist_id")
+    ingredient_id = data.get("ingredient_id")
+
+    record = Shoppingingredient(name, amount, unit, category, multiplier, meal_name, shoppinglist_id, ingredient_id)
+    db.session.add(record)
+    db.session.commit()
+
+    emit_event("shoppingingredient-update", {
+        "data": shoppingingredient_schema.dump(record),
+        "type": "add"
+    })
+
+    return jsonify({
+        "status": 200,
+        "message": "Shoppingingredient Added",
+        "data": shoppingingredient_schema.dump(record)
+    })
+
+@bp.route("/shoppingingredient/add/multiple", methods=["POST"])
+def add_multiple_shoppingingredients():
+    if request.content_type != "application/json":
+        return jsonify({
+            "status": 400,
+            "message": "Error: Data must be sent as JSON.",
+            "data": {}
+        })
+
+    data = request.get_json()
+    records = []
+    for data in data:
+        name = data.get("name")
+        amount = data.get("amount")
+        unit = data.get("unit")
+        category = data.get("category")
+        multiplier = data.get("multiplier", 1)
+        meal_name = data.get("meal_name")
+        shoppinglist_id = data.get("shoppinglist_id")
+        ingredient_id = data.get("ingredient_id")
+
+        record = Shoppingingredient(name, amount, unit, category, multiplier, meal_name, shoppinglist_id, ingredient_id)
+        db.session.add(record)
+        db.session.commit()
+
+        records.append(record)
+
+    emit_event("shoppingingredient-update-multiple", {
+        "data": multiple_shoppingingredient_schema.dump(records),
+        "type": "add"
+    })
+
+    return jsonify({
+        "status": 200,
+        "message": "Shoppingingredients Added",
+        "data": multiple_shoppingingredient_schema.dump(records)
+    })
+
+@bp.route("/shoppingingredient/get", methods=["GET"])
+def get_all_shoppingingredients():
+    records = db.session.query(Shoppingingredient).all()
+    return stream_json(multiple_shoppingingredient_schema.dump(records))
+
+@bp.route("/shoppingingredient/get/<id>", methods=["GET"])
+def get_shoppingingredient_by_id(id):
+    record = db.session.query(Shoppingingredient).filter(Shoppingingredient.id == id).first()
+    return jsonify(ingredient_schema.dump(record))
+
+@bp.route("/shoppingingredient/update/<id>", methods=["PUT"])
+def update_shoppingingredient(id):
+    if request.content_type != "application/json":
+        return jsonify({
+            "status": 400,
+            "message": "Error: Data must be sent as JSON.",
+            "data": {}
+        })
+
+    data = request.get_json()
+    if data.get("obtained") is not None and not isinstance(data.get("obtained"), bool):
+        return jsonify({
+            "status": 400,
+            "message": "Error: Obtained must be true or false.",
+            "data": {}
+        })
+
+    if is_hot_toggle(data) and data.get("obtained") is not None:
+        item = toggle_hot_shoppingingredient(id, data.get("obtained"))
+        if item is not None:
+            return jsonify({
+                "status": 200,
+                "message": "Shoppingingredient Updated",
+                "data": item
+            })
+
+    record = db.session.query(Shoppingingredient).filter(Shoppingingredient.id == id).first()
+    update_shoppingingredient_record(record, data)
+
+    return jsonify({
+        "status": 200,
+        "message": "Shoppingingredient Updated",
+        "data": shoppingingredient_schema.dump(record)
+    })
+
+def update_shoppingingredient_record(record, data):
+    name = data.get("name")
+    amount = data.get("amount")
+    unit = data.get("unit")
+    category = data.get("category")
+    multiplier = data.get("multiplier")
+    obtained = data.get("obtained")
+    meal_name = data.get("meal_name")
+    pending_obtained = take_pending_toggle(record.id)
+
+    if name is not None:
+        record.name = name
+    if amount is not None:
+        record.amount = amount
+    if unit is not None:
+        record.unit = unit
+    if category is not None:
+        record.category = category
+    if multiplier is not None:
+        record.multiplier = multiplier
+    if obtained is not None:
+        record.obtained = obtained
+    elif pending_obtained is not None:
+        record.obtained = pending_obtained
+    if meal_name is not None:
+        record.meal_name = meal_name
+
+    db.session.commit()
+    
+    if obtained is not None:
+        emit_event("shared-shoppingingredient-update", {
+            "data": shoppingingredient_schema.dump(record),
+            "type": "update"
+        })
+    else:
+        emit_event("shoppingingredient-update", {
+            "data": shoppingingredient_schema.dump(record),
+            "type": "update"
+        })
+
+@bp.route("/shoppingingredient/delete/<id>", methods=["DELETE"])
+def delete_shoppingingredient(id):
+    record = db.session.query(Shoppingingredient).filter(Shoppingingredient.id == id).first()
+    delete_shoppingingredient_record(record)
+
+    return jsonify({
+        "status": 200,
+        "message": "Shoppingingredient Deleted",
+        "data": shoppingingredient_schema.dump(record)
+    })
+
+def delete_shoppingingredient_record(record):
+    take_pending_toggle(record.id)
+    db.session.delete(record)
+    db.session.commit()
+
+    emit_event("shoppingingredient-update", {
+        "data": shoppingingredient_schema.dump(record),
+        "type": "delete"
+    })
@@ -0,0 +1,74 @@
+from flask import Blueprint, current_app, jsonify
+
+from whatsfordinner.db_pool import get_pool_stats
+from whatsfordinner.metrics import render_metrics
+from whatsfordinner.extensions import db
+from whatsfordinner.instrumentation import request_latency, request_statements, request_phase_seconds, response_bytes, socket_emit_seconds
+from whatsfordinner.realtime import connected_sids, slow_sids, slow_queues, resync_sids, backpressure_lock, backpressure_stats, get_transport_queue_size
+from whatsfordinner.compression import compression_input_bytes, compression_output_bytes, compression_cpu_seconds
+from whatsfordinner.autodelete import autodelete_stats
+from whatsfordinner.auth import check_metrics_authorization
+from whatsfordinner.db_routing import get_replica_stats
+
+bp = Blueprint("stats", __name__)
+
+@bp.route("/socket/stats", methods=["GET"])
+def get_socket_stats():
+    with backpressure_lock:
+        connections = {
+            sid: {
+                "transport_queue": get_transport_queue_size(sid),
+                "pending": len(slow_queues.get(sid, {})),
+                "slow": sid in slow_sids,
+                "resync": sid in resync_sids
+            }
+            for sid in connected_sids
+        }
+        stats = dict(backpressure_stats)
+
+    return jsonify({
+        "status": 200,
+        "message": "Socket Stats",
+        "data": {
+            "connections": connections,
+            "slow_connections": len(slow_sids),
+            "high_water": current_app.config["SOCKET_QUEUE_HIGH_WATER"],
+            "max_pending": current_app.config["SOCKET_QUEUE_MAX_PENDING"],
+            **stats
+        }
+    })
+
+@bp.route("/db/stats", methods=["GET"])
+def get_db_stats():
+    return jsonify({
+        "status": 200,
+        "message": "Database Stats",
+        "data": {
+            **get_pool_stats(db.engine),
+            "read_routing": get_replica_stats()
+        }
+    })
+
+@bp.route("/metrics", methods=["GET"])
+def get_metrics():
+    if not check_metrics_authorization():
+        return jsonify({
+            "status": 403,
+            "message": "Unauthorized",
+            "data": {}
+        })
+
+    metrics = render_metrics([request_latency, request_statements, request_phase_seconds, response_bytes, compression_input_bytes, compression_output_bytes, compression_cpu_seconds, socket_emit_seconds])
+    return current_app.response_class(metrics, mimetype="text/plain; version=0.0.4")
+
+@bp.route("/autodelete/stats", methods=["GET"])
+def get_autodelete_stats():
+    return jsonify({
+        "status": 200,
+        "message": "Autodelete Stats",
+        "data": {
+            "interval": current_app.config["AUTODELETE_INTERVAL"],
+            "batch_size": current_app.config["AUTODELETE_BATCH_SIZE"],
+            **autodelete_stats
+        }
+    })
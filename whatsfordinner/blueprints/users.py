@@ -0,0 +1,531 @@
+from flask import Blueprint, request, jsonify
+
+import random
+import string
+
+from whatsfordinner.extensions import db, bcrypt
+from whatsfordinner.models import User, Session, Settings, Notification
+from whatsfordinner.schemas import notification_schema, settings_schema, multiple_settings_schema, user_schema, multiple_user_schema
+from whatsfordinner.compression import stream_json
+from whatsfordinner.realtime import emit_event
+from whatsfordinner.meal_indexes import meal_indexes
+from whatsfordinner.identity import get_verified_user_id, forget_sessions, get_user, get_caller
+
+bp = Blueprint("users", __name__)
+
+@bp.route("/user/add", methods=["POST"])
+def add_user():
+    if request.content_type != "application/json":
+        return jsonify({
+            "status": 400,
+            "message": "Error: Data must be sent as JSON.",
+            "data": {}
+        })
+
+    data = request.get_json()
+    username = data.get("username")
+    password = data.get("password")
+    email = data.get("email")
+
+    username_taken_check = db.session.query(User).filter(User.username == username).first()
+    if username_taken_check is not None:
+        return jsonify({
+            "status": 400,
+            "message": "Username already taken.",
+            "data": {}
+        })
+
+    hashed_password = bcrypt.generate_password_hash(password).decode("utf-8")
+
+    record = User(username, hashed_password, email)
+    db.session.add(record)
+    db.session.commit()
+
+    settings = Settings(None, False, 1, "week", "arbitrary", False, 1, "week", True, True, record.id)
+    db.session.add(settings)
+    db.session.commit()
+
+    token = ''.join(random.SystemRandom().choice(string.ascii_uppercase + string.ascii_lowercase + string.digits) for _ in range(16))
+    while db.session.query(Session).filter(Session.token == token).first() != None:
+        token = ''.join(random.SystemRandom().choice(string.ascii_uppercase + string.ascii_lowercase + string.digits) for _ in range(16))
+
+    hashed_ip = bcrypt.generate_password_hash(request.remote_addr).decode("utf-8")
+
+    session = Session(token, hashed_ip, record.id)
+    db.session.add(session)
+    db.session.commit()
+
+    return jsonify({
+        "status": 200,
+        "message": "User Added",
+        "data": {
+            "user": user_schema.dump(record),
+            "token": token
+        }
+    })
+
+@bp.route("/user/login", methods=["POST"])
+def login_user():
+    if request.content_type != "application/json":
+        return jsonify({
+            "status": 400,
+            "message": "Error: Data must be sent as JSON.",
+            "data": {}
+        })
+
+    data = request.get_json()
+    username = data.get("username")
+    password = data.get("password")
+
+    record = db.session.query(User).filter(User.username == username).first()
+    if record is None:
+        return jsonify({
+            "status": 400,
+            "message": "Invalid username or password",
+            "data": {}
+        })
+
+    password_check = bcrypt.check_password_hash(record.password, password)
+    if password_check is False:
+        return jsonify({
+            "status": 400,
+            "message": "Invalid username or password",
+            "data": {}
+        })
+
+    token = ''.join(random.SystemRandom().choice(string.ascii_uppercase + string.ascii_lowercase + string.digits) for _ in range(16))
+    while db.session.query(Session).filter(Session.token == token).first() != None:
+        token = ''.join(random.SystemRandom().choice(string.ascii_uppercase + string.ascii_lowercase + string.digits) for _ in range(16))
+
+    hashed_ip = bcrypt.generate_password_hash(str(request.remote_addr)).decode("utf-8")
+
+    session = Session(token, hashed_ip, record.id)
+    db.session.add(session)
+    db.session.commit()
+
+    return jsonify({
+        "status": 200,
+        "message": "Valid username and password",
+        "data": {
+            "user": user_schema.dump(record),
+            "token": token
+        }
+    })
+
+@bp.route("/user/friend/request", methods=["POST"])
+def request_friend():
+    if request.content_type != "application/json":
+        return jsonify({
+            "status": 400,
+            "message": "Error: Data must be sent as JSON.",
+            "data": {}
+        })
+
+    data = request.get_json()
+    user_id = data.get("user_id")
+    friend_username = data.get("friend_username")
+
+    user = get_caller(user_id)
+    friend = db.session.query(User).filter(User.username == friend_username).first()
+
+    if friend is None:
+        return jsonify({
+            "status": 400,
+            "message": "User doesn't exist.",
+            "data": {}
+        })
+    if user.friends.count(friend) > 0:
+        return jsonify({
+            "status": 400,
+            "message": "User already friended.",
+            "data": {}
+        })
+    if user.outgoing_friend_requests.count(friend) > 0:
+        return jsonify({
+            "status": 400,
+            "message": "Friend request already sent.",
+            "data": {}
+        })
+
+    user.outgoing_friend_requests.append(friend)
+    db.session.commit()
+
+    friend.incoming_friend_requests.append(user)
+    db.session.commit()
+
+    notification = Notification("friendrequest", user.username, None, friend.id)
+    db.session.add(notification)
+    db.session.commit()
+
+    emit_event("friend-request-update", {
+        "data": {
+            "user": user_schema.dump(user),
+            "friend": user_schema.dump(friend),
+            "notification": notification_schema.dump(notification)
+        },
+        "type": "add"
+    })
+
+    return jsonify({
+        "status": 200,
+        "message": "Friend Request Added",
+        "data": {
+            "user": user_schema.dump(user),
+            "friend": user_schema.dump(friend)
+        }
+    })
+
+@bp.route("/user/get", methods=["GET"])
+def get_all_users():
+    records = db.session.query(User).all()
+    return stream_json(multiple_user_schema.dump(records))
+
+@bp.route("/user/get/id/<id>", methods=["GET"])
+def get_user_by_id(id):
+    record = get_caller(id)
+    return jsonify(user_schema.dump(record))
+
+@bp.route("/user/get/token/<token>", methods=["GET"])
+def get_user_by_token(token):
+    user_id = get_verified_user_id(token)
+    if user_id is None:
+        return jsonify({
+            "status": 403,
+            "message": "User not authenticated.",
+            "data": {}
+        })
+
+    record = get_user(user_id)
+    return jsonify({
+        "status": 200,
+        "message": "User authenticated.",
+        "data": user_schema.dump(record)
+    })
+
+@bp.route("/user/update/<id>", methods=["PUT"])
+def update_user(id):
+    if request.content_type != "application/json":
+        return jsonify({
+            "status": 400,
+            "message": "Error: Data must be sent as JSON.",
+            "data": {}
+        })
+
+    data = request.get_json()
+    username = data.get("username")
+    password = data.get("password")
+    email = data.get("email")
+
+    record = get_caller(id)
+    if username is not None:
+        username_taken_check = db.session.query(User).filter(User.username == username).first()
+        if username_taken_check is not None:
+            return jsonify({
+                "status": 400,
+                "message": "Username already taken.",
+                "data": {}
+            })
+        record.username = username
+    if password is not None:
+        hashed_password = bcrypt.generate_password_hash(password).decode("utf-8")
+        record.password = hashed_password
+    if email is not None:
+        record.email = email
+
+    db.session.commit()
+
+    return jsonify({
+        "status": 200,
+        "message": "User Updated",
+        "data": user_schema.dump(record)
+    })
+
+@bp.route("/user/delete/<id>", methods=["DELETE"])
+def delete_user(id):
+    record = get_caller(id)
+    forget_sessions([session.token for session in record.sessions])
+    for friend in record.friends:
+        friend.friends.remove(record)
+        db.session.commit()
+        friend.incoming_friend_requests.remove(record)
+        db.session.commit()
+    db.session.delete(record)
+    db.session.commit()
+    meal_indexes.pop(record.id, None)
+    return jsonify({
+        "status": 200,
+        "message": "User Deleted",
+        "data": user_schema.dump(record)
+    })
+
+@bp.route("/user/logout/single/<token>", methods=["DELETE"])
+def logout_user(token):
+    record = db.session.query(Session).filter(Session.token == token).first()
+    db.session.delete(record)
+    db.session.commit()
+    forget_sessions([token])
+    return jsonify({
+        "status": 200,
+        "message": "User Logged Out",
+        "data": {}
+    })
+
+@bp.route("/user/logout/all/<id>", methods=["DELETE"])
+def logout_user_all(id):
+    record = get_caller(id)
+    forget_sessions([session.token for session in record.sessions])
+    for session in record.sessions:
+        db.session.delete(session)
+        db.session.commit()
+    return jsonify({
+        "status": 200,
+        "message": "User Logged Out",
+        "data": {}
+    })
+
+@bp.route("/user/friend/cancel/<id>/<friend_id>", methods=["DELETE"])
+def cancel_friend_request(id, friend_id):
+    user = get_caller(id)
+    friend = get_user(friend_id)
+    
+    if user.outgoing_friend_requests.count(friend) == 0:
+        return jsonify({
+                "status": 400,
+                "message": "Error: Friend request does not exist.",
+                "data": {}
+            })
+
+    user.outgoing_friend_requests.remove(friend)
+    db.session.commit()
+
+    friend.incoming_friend_requests.remove(user)
+    db.session.commit()
+
+    notification = db.session.query(Notification).filter(Notification.category == "friendrequest").filter(Notification.username == user.username).filter(Notification.user_id == friend.id).first()
+    if notification is not None:
+        db.session.delete(notification)
+        db.session.commit()
+
+    emit_event("friend-request-update", {
+        "data": {
+            "user": user_schema.dump(user),
+            "friend": user_schema.dump(friend),
+            "notification": notification_schema.dump(notification)
+        },
+        "type": "delete"
+    })
+
+    return jsonify({
+        "status": 200,
+        "message": "Friend Request Deleted",
+        "data": {
+            "user": user_schema.dump(user),
+            "friend": user_schema.dump(friend)
+        }
+    })
+
+@bp.route("/user/friend/accept/<id>/<friend_id>", methods=["DELETE"])
+def accept_friend_request(id, friend_id):
+    user = get_caller(id)
+    friend = get_user(friend_id)
+    
+    if user.incoming_friend_requests.count(friend) == 0:
+        return jsonify({
+                "status": 400,
+                "message": "Error: Friend request does not exist.",
+                "data": {}
+            })
+
+    user.friends.append(friend)
+    db.session.commit()
+
+    friend.friends.append(user)
+    db.session.commit()
+
+    user.incoming_friend_requests.remove(friend)
+    db.session.commit()
+
+    friend.outgoing_friend_requests.remove(user)
+    db.session.commit()
+
+    if user.outgoing_friend_requests.count(friend) > 0:
+        user.outgoing_friend_requests.remove(friend)
+        db.session.commit()
+        friend.incoming_friend_requests.remove(user)
+        db.session.commit()
+
+    removed_notification = db.session.query(Notification).filter(Notification.category == "friendrequest").filter(Notification.username == user.username).filter(Notification.user_id == friend.id).first()
+    if removed_notification is not None:
+        db.session.delete(removed_notification)
+        db.session.commit()
+
+    notification = Notification("friend", user.username, None, friend.id)
+    db.session.add(notification)
+    db.session.commit()
+
+    emit_event("friend-update", {
+        "data": {
+            "user": user_schema.dump(user),
+            "friend": user_schema.dump(friend),
+            "removed_notification": notification_schema.dump(removed_notification),
+            "notification": notification_schema.dump(notification)
+        },
+        "type": "add"
+    })
+
+    return jsonify({
+        "status": 200,
+        "message": "Friend Added",
+        "data": {
+            "user": user_schema.dump(user),
+            "friend": user_schema.dump(friend)
+        }
+    })
+
+@bp.route("/user/friend/reject/<id>/<friend_id>", methods=["DELETE"])
+def reject_friend_request(id, friend_id):
+    user = get_caller(id)
+    friend = get_user(friend_id)
+    
+    if user.incoming_friend_requests.count(friend) == 0:
+        return jsonify({
+                "status": 400,
+                "message": "Error: Friend request does not exist.",
+                "data": {}
+            })
+
+    user.incoming_friend_requests.remove(friend)
+    db.session.commit()
+
+    friend.outgoing_friend_requests.remove(user)
+    db.session.commit()
+
+    emit_event("shared-friend-request-update", {
+        "data": {
+            "user": user_schema.dump(user),
+            "friend": user_schema.dump(friend)
+        },
+        "type": "delete"
+    })
+
+    return jsonify({
+        "status": 200,
+        "message": "Friend Request Deleted",
+        "data": {
+            "user": user_schema.dump(user),
+            "friend": user_schema.dump(friend)
+        }
+    })
+
+@bp.route("/user/friend/delete/<id>/<friend_id>", methods=["DELETE"])
+def delete_friend(id, friend_id):
+    user = get_caller(id)
+    friend = get_user(friend_id)
+    
+    if user.friends.count(friend) == 0:
+        return jsonify({
+                "status": 400,
+                "message": "Error: Friend does not exist.",
+                "data": {}
+            })
+
+    user.friends.remove(friend)
+    db.session.commit()
+
+    friend.friends.remove(user)
+    db.session.commit()
+
+    notification = db.session.query(Notification).filter(Notification.category == "friend").filter(Notification.username == user.username).filter(Notification.user_id == friend.id).first()
+    if notification is not None:
+        db.session.delete(notification)
+        db.session.commit()
+
+    emit_event("friend-update", {
+        "data": {
+            "user": user_schema.dump(user),
+            "friend": user_schema.dump(friend),
+            "notification": notification_schema.dump(notification)
+        },
+        "type": "delete"
+    })
+
+    return jsonify({
+        "status": 200,
+        "message": "Friend Deleted",
+        "data": {
+            "user": user_schema.dump(user),
+            "friend": user_schema.dump(friend)
+        }
+    })
+
+
+@bp.route("/settings/get", methods=["GET"])
+def get_all_settings():
+    records = db.session.query(Settings).all()
+    return stream_json(multiple_settings_schema.dump(records))
+
+@bp.route("/settings/get/<id>", methods=["GET"])
+def get_settings_by_id(id):
+    record = db.session.query(Settings).filter(Settings.id == id).first()
+    return jsonify(settings_schema.dump(record))
+
+@bp.route("/settings/update/<id>", methods=["PUT"])
+def update_settings(id):
+    if request.content_type != "application/json":
+        return jsonify({
+            "status": 400,
+            "message": "Error: Data must be sent as JSON.",
+            "data": {}
+        })
+
+    data = request.get_json()
+    default_mealplan_outline = data.get("default_mealplan_outline", -1)
+    autodelete_mealplans = data.get("autodelete_mealplans")
+    autodelete_mealplans_schedule_number = data.get("autodelete_mealplans_schedule_number")
+    autodelete_mealplans_schedule_unit = data.get("autodelete_mealplans_schedule_unit")
+    default_shoppinglist_sort = data.get("default_shoppinglist_sort")
+    autodelete_shoppinglists = data.get("autodelete_shoppinglists")
+    autodelete_shoppinglists_schedule_number = data.get("autodelete_shoppinglists_schedule_number")
+    autodelete_shoppinglists_schedule_unit = data.get("autodelete_shoppinglists_schedule_unit")
+    allow_notifications = data.get("allow_notifications")
+    allow_nonfriend_sharing = data.get("allow_nonfriend_sharing")
+    shoppinglist_aisle_order = data.get("shoppinglist_aisle_order")
+
+    if shoppinglist_aisle_order is not None and (not isinstance(shoppinglist_aisle_order, list) or not all(isinstance(category, str) for category in shoppinglist_aisle_order)):
+        return jsonify({
+            "status": 400,
+            "message": "Error: shoppinglist_aisle_order must be a list of categories.",
+            "data": {}
+        })
+
+    record = db.session.query(Settings).filter(Settings.id == id).first()
+    if default_mealplan_outline != -1:
+        record.default_mealplan_outline = default_mealplan_outline
+    if autodelete_mealplans is not None:
+        record.autodelete_mealplans = autodelete_mealplans
+    if autodelete_mealplans_schedule_number is not None:
+        record.autodelete_mealplans_schedule_number = autodelete_mealplans_schedule_number
+    if autodelete_mealplans_schedule_unit is not None:
+        record.autodelete_mealplans_schedule_unit = autodelete_mealplans_schedule_unit
+    if default_shoppinglist_sort is not None:
+        record.default_shoppinglist_sort = default_shoppinglist_sort
+    if autodelete_shoppinglists is not None:
+        record.autodelete_shoppinglists = autodelete_shoppinglists
+    if autodelete_shoppinglists_schedule_number is not None:
+        record.autodelete_shoppinglists_schedule_number = autodelete_shoppinglists_schedule_number
+    if autodelete_shoppinglists_schedule_unit is not None:
+        record.autodelete_shoppinglists_schedule_unit = autodelete_shoppinglists_schedule_unit
+    if allow_notifications is not None:
+        record.allow_notifications = allow_notifications
+    if allow_nonfriend_sharing is not None:
+        record.allow_nonfriend_sharing = allow_nonfriend_sharing
+    if shoppinglist_aisle_order is not None:
+        record.shoppinglist_aisle_order = shoppinglist_aisle_order
+
+    db.session.commit()
+
+    return jsonify({
+        "status": 200,
+        "message": "Settings Updated",
+        "data": settings_schema.dump(record)
+    })
@@ -0,0 +1,161 @@
+from flask import current_app, request
+
+import gzip
+import time
+import zlib
+from itertools import chain
+
+from whatsfordinner.metrics import Counter
+from whatsfordinner.instrumentation import get_route_label
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Response Compression
+# JSON and text responses of COMPRESSION_MIN_SIZE bytes or more are gzip or
+# brotli compressed when the client's Accept-Encoding allows it (brotli needs
+# the optional brotli package). COMPRESSION_LEVEL is the gzip level (1-9) and
+# COMPRESSION_BROTLI_QUALITY the brotli quality (0-11). Streamed responses
+# (the collection endpoints, see stream_json) are compressed chunk by chunk as
+# they are sent. Bytes in and out and the CPU time spent compressing are
+# exported on /metrics, so the level can be tuned against real traffic.
+COMPRESSIBLE_MIMETYPES = {"application/json", "text/plain", "text/html"}
+
+# Brotli is preferred when the brotli package is installed and the client
+# accepts it at least as much as gzip; otherwise gzip from the standard
+# library is used.
+ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+compression_input_bytes = Counter("whatsfordinner_http_compression_input_bytes_total", "Response bytes before compression by route and encoding.", ("route", "encoding"))
+compression_output_bytes = Counter("whatsfordinner_http_compression_output_bytes_total", "Response bytes after compression by route and encoding.", ("route", "encoding"))
+compression_cpu_seconds = Counter("whatsfordinner_http_compression_cpu_seconds_total", "CPU time spent compressing responses by route and encoding.", ("route", "encoding"))
+
+def negotiate_encoding(accept_encodings, encodings=ENCODINGS):
+    best = None
+    best_quality = 0
+    for encoding in encodings:
+        quality = accept_encodings.quality(encoding)
+        if quality > best_quality:
+            best = encoding
+            best_quality = quality
+    return best
+
+def compress(data, encoding, level):
+    if encoding == "br":
+        return brotli.compress(data, mode=brotli.MODE_TEXT, quality=level)
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+# Returns (compress_chunk, finish). Every chunk is flushed as it is
+# compressed, so the client can start decoding before the body is complete.
+def get_stream_compressor(encoding, level):
+    if encoding == "br":
+        compressor = brotli.Compressor(mode=brotli.MODE_TEXT, quality=level)
+        return (lambda chunk: compressor.process(chunk) + compressor.flush()), compressor.finish
+
+    # wbits 31 writes the gzip header and trailer around the deflate stream.
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    return (lambda chunk: compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)), compressor.flush
+
+# Compresses an iterable of str or bytes chunks lazily. record(input_bytes,
+# output_bytes, cpu_seconds) is called once the stream is finished or closed.
+def compress_chunks(chunks, encoding, level, record=None):
+    compress_chunk, finish = get_stream_compressor(encoding, level)
+    input_bytes = output_bytes = 0
+    cpu_seconds = 0.0
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode("utf-8")
+            started = time.thread_time()
+            compressed = compress_chunk(chunk)
+            cpu_seconds += time.thread_time() - started
+            input_bytes += len(chunk)
+            output_bytes += len(compressed)
+            if len(compressed) > 0:
+                yield compressed
+
+        started = time.thread_time()
+        compressed = finish()
+        cpu_seconds += time.thread_time() - started
+        output_bytes += len(compressed)
+        yield compressed
+    finally:
+        if hasattr(chunks, "close"):
+            chunks.close()
+        if record is not None:
+            record(input_bytes, output_bytes, cpu_seconds)
+
+def get_compression_level(encoding):
+    if encoding == "br":
+        return current_app.config["COMPRESSION_BROTLI_QUALITY"]
+    return current_app.config["COMPRESSION_LEVEL"]
+
+def record_compression(labels, input_bytes, output_bytes, cpu_seconds):
+    compression_input_bytes.inc(labels, input_bytes)
+    compression_output_bytes.inc(labels, output_bytes)
+    compression_cpu_seconds.inc(labels, cpu_seconds)
+
+def compress_response(response):
+    if not current_app.config["COMPRESSION_ENABLED"] or request.method == "HEAD":
+        return response
+    if response.status_code < 200 or response.status_code in (204, 304) or response.direct_passthrough:
+        return response
+    if response.mimetype not in COMPRESSIBLE_MIMETYPES or "Content-Encoding" in response.headers:
+        return response
+
+    response.vary.add("Accept-Encoding")
+    # Streamed responses usually have no length; error pages rendered by
+    # werkzeug are streamed but still carry a Content-Length.
+    length = response.headers.get("Content-Length", type=int) if response.is_streamed else response.calculate_content_length()
+    if length is not None and length < current_app.config["COMPRESSION_MIN_SIZE"]:
+        return response
+    encoding = negotiate_encoding(request.accept_encodings)
+    if encoding is None:
+        return response
+
+    labels = (get_route_label(), encoding)
+    level = get_compression_level(encoding)
+    if response.is_streamed:
+        response.response = compress_chunks(response.response, encoding, level, lambda *sizes: record_compression(labels, *sizes))
+        response.headers.pop("Content-Length", None)
+    else:
+        data = response.get_data()
+        started = time.thread_time()
+        compressed = compress(data, encoding, level)
+        record_compression(labels, len(data), len(compressed), time.thread_time() - started)
+        if len(compressed) >= len(data):
+            return response
+        response.set_data(compressed)
+    response.headers["Content-Encoding"] = encoding
+    return response
+
+# Streams a JSON array in chunks of about COMPRESSION_STREAM_CHUNK_SIZE bytes,
+# encoding the items as it goes, so neither the whole encoded body nor its
+# compressed copy is held in memory. The body is the same as jsonify's
+# (compact, with sorted keys); a list that fits in one chunk is sent as a
+# plain response, which keeps small results under the size threshold.
+def iter_json_chunks(items, json, chunk_size):
+    chunk = ["["]
+    size = 1
+    for index, item in enumerate(items):
+        encoded = json.dumps(item, separators=(",", ":"))
+        if index > 0:
+            encoded = "," + encoded
+        chunk.append(encoded)
+        size += len(encoded)
+        if size >= chunk_size:
+            yield "".join(chunk)
+            chunk = []
+            size = 0
+    chunk.append("]\n")
+    yield "".join(chunk)
+
+def stream_json(items):
+    chunks = iter_json_chunks(items, current_app.json, current_app.config["COMPRESSION_STREAM_CHUNK_SIZE"])
+    first = next(chunks)
+    second = next(chunks, None)
+    if second is None:
+        return current_app.response_class(first, mimetype="application/json")
+    return current_app.response_class(chain([first, second], chunks), mimetype="application/json")
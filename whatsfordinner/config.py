@@ -0,0 +1,61 @@
+from dotenv import load_dotenv
+
+import os
+
+from whatsfordinner.db_pool import get_engine_options
+
+# Database URLs may also be sqlite:///path/to/file.db (relative paths are
+# under the instance folder) or sqlite:// for an in-memory database, for local
+# profiling and CI runs without Postgres.
+def get_database_uri(url):
+    if url.startswith("sqlite:"):
+        return url
+    return "postgresql://" + url.partition("://")[2]
+
+def configure(app):
+    load_dotenv()
+
+    app.config['SECRET_KEY'] = os.environ.get("SECRET_KEY")
+    app.config["AUTH_USERNAME"] = os.environ.get("AUTH_USERNAME")
+    app.config["AUTH_PASSWORD"] = os.environ.get("AUTH_PASSWORD")
+    app.config["IDENTITY_CACHE_TTL"] = float(os.environ.get("IDENTITY_CACHE_TTL", 300))
+    app.config["SQLALCHEMY_DATABASE_URI"] = get_database_uri(os.environ.get("DATABASE_URL"))
+    app.config["DB_POOL_SIZE"] = int(os.environ.get("DB_POOL_SIZE", 5))
+    app.config["DB_MAX_OVERFLOW"] = int(os.environ.get("DB_MAX_OVERFLOW", 5))
+    app.config["DB_POOL_TIMEOUT"] = float(os.environ.get("DB_POOL_TIMEOUT", 10))
+    app.config["DB_POOL_PRE_PING"] = os.environ.get("DB_POOL_PRE_PING", "true").lower() == "true"
+    app.config["DB_POOL_RECYCLE"] = int(os.environ.get("DB_POOL_RECYCLE", 1800))
+    app.config["DB_STATEMENT_TIMEOUT"] = int(os.environ.get("DB_STATEMENT_TIMEOUT", 0))
+    app.config["DB_PGBOUNCER"] = os.environ.get("DB_PGBOUNCER", "false").lower() == "true"
+    if app.config["SQLALCHEMY_DATABASE_URI"].startswith("postgresql://"):
+        app.config["SQLALCHEMY_ENGINE_OPTIONS"] = get_engine_options(app.config)
+    app.config["DATABASE_REPLICA_URLS"] = [get_database_uri(url.strip()) for url in os.environ.get("DATABASE_REPLICA_URLS", "").split(",") if url.strip() != ""]
+    app.config["SQLALCHEMY_BINDS"] = {
+        f"replica_{index}": dict(get_engine_options(app.config) if url.startswith("postgresql://") else {}, url=url)
+        for index, url in enumerate(app.config["DATABASE_REPLICA_URLS"])
+    }
+    app.config["REPLICA_PIN_SECONDS"] = float(os.environ.get("REPLICA_PIN_SECONDS", 5))
+    app.config["REPLICA_MAX_LAG"] = float(os.environ.get("REPLICA_MAX_LAG", 5))
+    app.config["REPLICA_LAG_CHECK_INTERVAL"] = float(os.environ.get("REPLICA_LAG_CHECK_INTERVAL", 5))
+    app.config["EVENT_LOG_BUFFER_SIZE"] = int(os.environ.get("EVENT_LOG_BUFFER_SIZE", 500))
+    app.config["EVENT_LOG_DB_SIZE"] = int(os.environ.get("EVENT_LOG_DB_SIZE", 10000))
+    app.config["EVENT_LOG_MAX_REPLAY"] = int(os.environ.get("EVENT_LOG_MAX_REPLAY", 1000))
+    app.config["SOCKET_QUEUE_HIGH_WATER"] = int(os.environ.get("SOCKET_QUEUE_HIGH_WATER", 64))
+    app.config["SOCKET_QUEUE_MAX_PENDING"] = int(os.environ.get("SOCKET_QUEUE_MAX_PENDING", 256))
+    app.config["SOCKET_QUEUE_CHECK_INTERVAL"] = float(os.environ.get("SOCKET_QUEUE_CHECK_INTERVAL", 0.25))
+    app.config["MEAL_INDEX_TTL"] = float(os.environ.get("MEAL_INDEX_TTL", 300))
+    app.config["SEARCH_INDEX_TTL"] = float(os.environ.get("SEARCH_INDEX_TTL", 300))
+    app.config["HOT_SHOPPINGLISTS"] = os.environ.get("HOT_SHOPPINGLISTS", "false").lower() == "true"
+    app.config["HOT_SHOPPINGLIST_FLUSH_INTERVAL"] = float(os.environ.get("HOT_SHOPPINGLIST_FLUSH_INTERVAL", 2))
+    app.config["HOT_SHOPPINGLIST_FLUSH_SIZE"] = int(os.environ.get("HOT_SHOPPINGLIST_FLUSH_SIZE", 50))
+    app.config["HOT_SHOPPINGLIST_IDLE_TIMEOUT"] = float(os.environ.get("HOT_SHOPPINGLIST_IDLE_TIMEOUT", 120))
+    app.config["AUTODELETE_INTERVAL"] = float(os.environ.get("AUTODELETE_INTERVAL", 3600))
+    app.config["AUTODELETE_BATCH_SIZE"] = int(os.environ.get("AUTODELETE_BATCH_SIZE", 500))
+    app.config["COMPRESSION_ENABLED"] = os.environ.get("COMPRESSION_ENABLED", "true").lower() == "true"
+    app.config["COMPRESSION_MIN_SIZE"] = int(os.environ.get("COMPRESSION_MIN_SIZE", 1024))
+    app.config["COMPRESSION_LEVEL"] = int(os.environ.get("COMPRESSION_LEVEL", 6))
+    app.config["COMPRESSION_BROTLI_QUALITY"] = int(os.environ.get("COMPRESSION_BROTLI_QUALITY", 4))
+    app.config["COMPRESSION_STREAM_CHUNK_SIZE"] = int(os.environ.get("COMPRESSION_STREAM_CHUNK_SIZE", 65536))
+    app.config["METRICS_TOKEN"] = os.environ.get("METRICS_TOKEN")
+    app.config["NPLUSONE_MODE"] = os.environ.get("NPLUSONE_MODE", "log" if app.debug else "off").lower()
+    app.config["NPLUSONE_THRESHOLD"] = int(os.environ.get("NPLUSONE_THRESHOLD", 3))
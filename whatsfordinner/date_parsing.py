@@ -0,0 +1,72 @@
+from datetime import date, datetime, timedelta, timezone
+
+# Clients send dates as ISO strings or as whatever JavaScript's Date printed,
+# so accept the common toString/toDateString/toLocaleString shapes too.
+TIMESTAMP_FORMATS = [
+    ("%a %b %d %Y %H:%M:%S GMT%z", 33),
+    ("%m/%d/%Y, %I:%M:%S %p", 23),
+    ("%a %b %d %Y", 15),
+    ("%m/%d/%Y", 10)
+]
+
+EPOCH = datetime(1970, 1, 1)
+
+
+def to_utc(value):
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def parse_timestamp(value):
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime):
+        return to_utc(value)
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        # JavaScript timestamps are milliseconds since the epoch.
+        return EPOCH + timedelta(milliseconds=value)
+
+    text = str(value).strip()
+    try:
+        return to_utc(datetime.fromisoformat(text.replace("Z", "+00:00")))
+    except ValueError:
+        pass
+    for timestamp_format, length in TIMESTAMP_FORMATS:
+        try:
+            return to_utc(datetime.strptime(text[:length], timestamp_format))
+        except ValueError:
+            continue
+    raise ValueError(f"Unrecognized date: {value!r}")
+
+
+DATE_FORMATS = [("%Y-%m-%d", 10), ("%a %b %d %Y", 15), ("%m/%d/%Y", 10)]
+
+
+def parse_date(value):
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+
+    # Read the calendar date the client wrote rather than converting to UTC,
+    # which could move it a day.
+    text = str(value).strip()
+    for date_format, length in DATE_FORMATS:
+        try:
+            return datetime.strptime(text[:length], date_format).date()
+        except ValueError:
+            continue
+    return parse_timestamp(value).date()
+
+
+def parse_range_end(value):
+    # A date without a time component covers the whole day.
+    timestamp = parse_timestamp(value)
+    if timestamp is not None and timestamp.time() == datetime.min.time() and isinstance(value, str) and len(value.strip()) <= 15:
+        timestamp += timedelta(days=1) - timedelta(microseconds=1)
+    return timestamp
@@ -0,0 +1,143 @@
+import threading
+import time
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import NullPool, Pool, QueuePool
+
+pool_stats_lock = threading.Lock()
+pool_stats = {
+    "connects": 0,
+    "checkouts": 0,
+    "checkins": 0,
+    "invalidations": 0,
+    "timeouts": 0,
+    "wait_total": 0.0,
+    "wait_max": 0.0
+}
+
+
+def record_pool_stat(key, amount=1):
+    with pool_stats_lock:
+        pool_stats[key] += amount
+
+
+# Times how long each checkout waits for a free connection (or, without a
+# pool, for a new one), which is where pool exhaustion shows up.
+class TimedCheckoutMixin:
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            record_pool_stat("timeouts")
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            with pool_stats_lock:
+                pool_stats["wait_total"] += waited
+                pool_stats["wait_max"] = max(pool_stats["wait_max"], waited)
+
+
+class TimedQueuePool(TimedCheckoutMixin, QueuePool):
+    pass
+
+
+class TimedNullPool(TimedCheckoutMixin, NullPool):
+    pass
+
+
+@event.listens_for(Pool, "connect")
+def count_connect(dbapi_connection, connection_record):
+    record_pool_stat("connects")
+
+
+@event.listens_for(Pool, "checkout")
+def count_checkout(dbapi_connection, connection_record, connection_proxy):
+    record_pool_stat("checkouts")
+
+
+@event.listens_for(Pool, "checkin")
+def count_checkin(dbapi_connection, connection_record):
+    record_pool_stat("checkins")
+
+
+@event.listens_for(Pool, "invalidate")
+def count_invalidate(dbapi_connection, connection_record, exception):
+    record_pool_stat("invalidations")
+
+
+# PgBouncer already pools server connections and, in transaction mode, hands
+# each transaction to any of them, so keep no client-side pool and skip
+# session-level startup options it would not preserve.
+def get_engine_options(config):
+    if config["DB_PGBOUNCER"]:
+        return {
+            "poolclass": TimedNullPool
+        }
+
+    options = {
+        "poolclass": TimedQueuePool,
+        "pool_size": config["DB_POOL_SIZE"],
+        "max_overflow": config["DB_MAX_OVERFLOW"],
+        "pool_timeout": config["DB_POOL_TIMEOUT"],
+        "pool_pre_ping": config["DB_POOL_PRE_PING"],
+        "pool_recycle": config["DB_POOL_RECYCLE"]
+    }
+    if config["DB_STATEMENT_TIMEOUT"] > 0:
+        options["connect_args"] = {
+            "options": f"-c statement_timeout={config['DB_STATEMENT_TIMEOUT']}"
+        }
+    return options
+
+
+def get_pool_stats(engine):
+    with pool_stats_lock:
+        stats = dict(pool_stats)
+    pool = engine.pool
+    stats["pool"] = type(pool).__name__
+    if isinstance(pool, QueuePool):
+        stats["size"] = pool.size()
+        stats["checked_out"] = pool.checkedout()
+        stats["overflow"] = pool.overflow()
+        stats["idle"] = pool.checkedin()
+    stats["wait_average"] = stats["wait_total"] / stats["checkouts"] if stats["checkouts"] > 0 else 0.0
+    return stats
+
+
+# SQLite only enforces foreign keys when each connection asks for it, and WAL
+# lets readers run alongside the writer in a file database, so local runs
+# behave like Postgres where it matters.
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.close()
+
+
+def configure_sqlite(engine):
+    event.listen(engine, "connect", set_sqlite_pragmas)
+
+
+# Under eventlet a psycopg2 query blocks the whole hub unless libpq is driven
+# in async mode and every wait yields to the hub instead.
+def eventlet_wait_callback(connection, timeout=-1):
+    import psycopg2
+    from psycopg2 import extensions
+    from eventlet.hubs import trampoline
+
+    while True:
+        state = connection.poll()
+        if state == extensions.POLL_OK:
+            break
+        elif state == extensions.POLL_READ:
+            trampoline(connection.fileno(), read=True)
+        elif state == extensions.POLL_WRITE:
+            trampoline(connection.fileno(), write=True)
+        else:
+            raise psycopg2.OperationalError(f"Bad result from poll: {state!r}")
+
+
+def make_psycopg2_green():
+    from psycopg2 import extensions
+
+    extensions.set_wait_callback(eventlet_wait_callback)
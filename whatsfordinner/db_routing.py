@@ -0,0 +1,150 @@
+from flask import current_app, request, g, has_request_context
+from sqlalchemy import exc
+
+import time
+import itertools
+import threading
+
+from whatsfordinner.extensions import db
+from whatsfordinner.identity import get_current_user_id
+
+# Read Replicas
+# With DATABASE_REPLICA_URLS set, GET requests (none of which write) read
+# from the replicas in turn. A client that committed a write reads from the
+# primary for the next REPLICA_PIN_SECONDS, so it always sees its own writes.
+# A write pins the client's address and, when the request carries a session
+# token (see identity.py), that user too; a read is pinned if either is, so
+# clients that send the session token on some requests and not others are
+# keyed the same way for both. The pin is set after commit, when the session
+# can no longer query, so with replicas configured route_request resolves the
+# caller's id up front; without replicas nothing is resolved here.
+# Each replica's replay lag is checked at most every
+# REPLICA_LAG_CHECK_INTERVAL seconds; one that is more than REPLICA_MAX_LAG
+# seconds behind or cannot be reached is skipped, and with no usable replica
+# reads go to the primary. Pins live in the worker process, which matches the
+# single eventlet worker in the Procfile.
+REPLICA_LAG_SQL = db.text("""
+    SELECT CASE
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END
+""")
+
+replica_lock = threading.Lock()
+replica_status = {}
+replica_turn = itertools.count()
+primary_pins = {}
+replica_stats = {
+    "replica_reads": 0,
+    "pinned": 0,
+    "lagging": 0,
+    "unavailable": 0
+}
+
+def get_replica_keys():
+    return [key for key in current_app.config["SQLALCHEMY_BINDS"] if key.startswith("replica_")]
+
+def get_client_keys():
+    if g.get("current_user_id") is not None:
+        return [f"addr:{request.remote_addr}", f"user:{g.current_user_id}"]
+    return [f"addr:{request.remote_addr}"]
+
+def get_replica_lag(engine):
+    with engine.connect() as connection:
+        if engine.dialect.name != "postgresql":
+            connection.execute(db.text("SELECT 1"))
+            return 0.0
+        return float(connection.execute(REPLICA_LAG_SQL).scalar() or 0)
+
+def get_replica_status(key):
+    status = replica_status.get(key)
+    now = time.time()
+    if status is not None and now - status["checked_at"] < current_app.config["REPLICA_LAG_CHECK_INTERVAL"]:
+        return status
+
+    try:
+        status = {
+            "lag": get_replica_lag(db.engines[key]),
+            "error": None,
+            "checked_at": now
+        }
+    except exc.SQLAlchemyError as error:
+        current_app.logger.warning(f"Replica {key} unavailable: {error}")
+        status = {
+            "lag": None,
+            "error": str(error),
+            "checked_at": now
+        }
+    replica_status[key] = status
+    return status
+
+def choose_replica(keys):
+    start = next(replica_turn)
+    reason = "unavailable"
+    for offset in range(len(keys)):
+        key = keys[(start + offset) % len(keys)]
+        status = get_replica_status(key)
+        if status["error"] is not None:
+            continue
+        if status["lag"] > current_app.config["REPLICA_MAX_LAG"]:
+            reason = "lagging"
+            continue
+        return key, None
+    return None, reason
+
+def is_pinned(client_key):
+    pinned_until = primary_pins.get(client_key)
+    if pinned_until is None:
+        return False
+    if pinned_until < time.time():
+        primary_pins.pop(client_key, None)
+        return False
+    return True
+
+def route_request():
+    g.db_replica = None
+    keys = get_replica_keys()
+    if len(keys) == 0:
+        return
+
+    get_current_user_id()
+    if request.method != "GET":
+        return
+
+    if any(is_pinned(client_key) for client_key in get_client_keys()):
+        reason = "pinned"
+    else:
+        key, reason = choose_replica(keys)
+        if key is not None:
+            g.db_replica = db.engines[key]
+            reason = "replica_reads"
+    with replica_lock:
+        replica_stats[reason] += 1
+
+@db.event.listens_for(db.session, "after_commit")
+def pin_writer_to_primary(session):
+    if not has_request_context() or current_app.config["REPLICA_PIN_SECONDS"] <= 0 or len(get_replica_keys()) == 0:
+        return
+
+    now = time.time()
+    for client_key in get_client_keys():
+        primary_pins[client_key] = now + current_app.config["REPLICA_PIN_SECONDS"]
+    if len(primary_pins) > 1000:
+        for client_key, pinned_until in list(primary_pins.items()):
+            if pinned_until < now:
+                primary_pins.pop(client_key, None)
+
+def get_replica_stats():
+    with replica_lock:
+        stats = dict(replica_stats)
+    return {
+        "replicas": {
+            key: {
+                "lag": status["lag"],
+                "error": status["error"]
+            }
+            for key, status in replica_status.items()
+        },
+        "pinned_clients": len(primary_pins),
+        **stats
+    }
@@ -0,0 +1,20 @@
+from flask import g, has_request_context
+from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session
+from flask_marshmallow import Marshmallow
+from flask_bcrypt import Bcrypt
+
+# SELECTs in a request that db_routing.route_request sent to a replica run on
+# g.db_replica; flushes and every other statement stay on the primary.
+class RoutingSession(Session):
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        replica = g.get("db_replica") if has_request_context() else None
+        if replica is not None and bind is None and not self._flushing and getattr(clause, "is_select", False):
+            return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+# Socket.IO is not created here: create_app sets it up only when it is
+# enabled, and code that emits looks it up with realtime.get_socketio().
+db = SQLAlchemy(session_options={"class_": RoutingSession})
+ma = Marshmallow()
+bcrypt = Bcrypt()
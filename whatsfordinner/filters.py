@@ -0,0 +1,18 @@
+from flask import request
+
+from whatsfordinner.date_parsing import parse_range_end, parse_timestamp
+
+# Query Filters
+def filter_by_created_on(query, model):
+    user_id = request.args.get("user_id")
+    start = parse_timestamp(request.args.get("from"))
+    end = parse_range_end(request.args.get("to"))
+    if user_id is not None:
+        query = query.filter(model.user_id == user_id)
+    if start is not None:
+        query = query.filter(model.created_on >= start)
+    if end is not None:
+        query = query.filter(model.created_on <= end)
+    if user_id is not None or start is not None or end is not None:
+        query = query.order_by(model.created_on, model.id)
+    return query
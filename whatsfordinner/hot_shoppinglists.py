@@ -0,0 +1,183 @@
+from flask import current_app
+
+import time
+import threading
+
+from whatsfordinner.extensions import db
+from whatsfordinner.models import Shoppinglist, Shoppingingredient
+from whatsfordinner.schemas import shoppingingredient_schema
+from whatsfordinner.realtime import get_socketio, emit_event
+from whatsfordinner.shoppinglist_progress import add_progress_delta, apply_progress_deltas
+
+# Hot Shoppinglists
+# With HOT_SHOPPINGLISTS enabled, obtained toggles are applied to an in-memory
+# copy of the shoppinglist and broadcast straight away, and the changed rows
+# are written back in one UPDATE per value. Durability guarantees:
+#   - a toggle is acknowledged once it is applied in memory and its broadcast
+#     has been recorded in the event_log table;
+#   - pending toggles are written to the shoppingingredient table every
+#     HOT_SHOPPINGLIST_FLUSH_INTERVAL seconds, as soon as
+#     HOT_SHOPPINGLIST_FLUSH_SIZE toggles are pending, when a list has been
+#     idle for HOT_SHOPPINGLIST_IDLE_TIMEOUT seconds, before an HTTP request
+#     to a blueprint that reads or writes shoppinglists
+#     (SHOPPINGLIST_BLUEPRINTS) and when the worker exits normally; other
+#     requests leave them to the timer;
+#   - if a flush fails the toggles stay pending and are retried on the next
+#     flush, unless a newer toggle for the same row replaced them. A failed
+#     flush before a request is logged and the request goes ahead;
+#   - a worker that is killed outright loses at most one flush window of
+#     toggles from the shoppingingredient table. Clients that reconnect get
+#     the current state from the database, so every client converges on it.
+# Any other write to a shoppingingredient marks its cached list stale so the
+# next toggle reloads it, keeping pending toggles on top of the fresh rows. A
+# write that sets obtained or deletes the row drops that row's pending toggle
+# (update_shoppingingredient_record takes it first and writes it along with
+# the other changes), so an older toggle never overwrites it.
+SHOPPINGLIST_BLUEPRINTS = ("shoppinglists", "mealplans", "recipes", "users")
+
+hot_shoppinglist_lock = threading.Lock()
+hot_shoppinglists = {}
+hot_shoppingingredient_lists = {}
+hot_shoppinglist_flusher = {
+    "running": False
+}
+
+def load_hot_shoppinglist(shoppinglist_id):
+    hot_shoppinglist = hot_shoppinglists.get(shoppinglist_id)
+    if hot_shoppinglist is not None and hot_shoppinglist["items"] is not None:
+        return hot_shoppinglist
+
+    records = db.session.query(Shoppingingredient).filter(Shoppingingredient.shoppinglist_id == shoppinglist_id).all()
+    items = {record.id: shoppingingredient_schema.dump(record) for record in records}
+    if hot_shoppinglist is None:
+        hot_shoppinglist = {
+            "items": None,
+            "dirty": {},
+            "last_used": time.time()
+        }
+        hot_shoppinglists[shoppinglist_id] = hot_shoppinglist
+
+    for id, obtained in hot_shoppinglist["dirty"].items():
+        if id in items:
+            items[id]["obtained"] = obtained
+    hot_shoppinglist["items"] = items
+    for id in items:
+        hot_shoppingingredient_lists[id] = shoppinglist_id
+    return hot_shoppinglist
+
+def toggle_hot_shoppingingredient(id, obtained=None):
+    try:
+        id = int(id)
+    except (TypeError, ValueError):
+        return None
+
+    shoppinglist_id = hot_shoppingingredient_lists.get(id)
+    if shoppinglist_id is None:
+        record = db.session.query(Shoppingingredient.shoppinglist_id).filter(Shoppingingredient.id == id).first()
+        if record is None:
+            return None
+        shoppinglist_id = record.shoppinglist_id
+
+    with hot_shoppinglist_lock:
+        hot_shoppinglist = load_hot_shoppinglist(shoppinglist_id)
+        item = hot_shoppinglist["items"].get(id)
+        if item is None:
+            return None
+
+        item["obtained"] = not item["obtained"] if obtained is None else obtained
+        hot_shoppinglist["dirty"][id] = item["obtained"]
+        hot_shoppinglist["last_used"] = time.time()
+        item = dict(item)
+        flush_now = len(hot_shoppinglist["dirty"]) >= current_app.config["HOT_SHOPPINGLIST_FLUSH_SIZE"]
+
+    start_hot_shoppinglist_flusher()
+    if flush_now:
+        flush_hot_shoppinglists()
+
+    emit_event("shared-shoppingingredient-update", {
+        "data": item,
+        "type": "update"
+    })
+    return item
+
+def take_pending_toggle(id):
+    with hot_shoppinglist_lock:
+        hot_shoppinglist = hot_shoppinglists.get(hot_shoppingingredient_lists.get(id))
+        if hot_shoppinglist is None:
+            return None
+        return hot_shoppinglist["dirty"].pop(id, None)
+
+def flush_hot_shoppinglists(evict_idle=False):
+    with hot_shoppinglist_lock:
+        pending = {}
+        now = time.time()
+        for shoppinglist_id, hot_shoppinglist in list(hot_shoppinglists.items()):
+            pending.update(hot_shoppinglist["dirty"])
+            hot_shoppinglist["dirty"] = {}
+            if evict_idle and now - hot_shoppinglist["last_used"] > current_app.config["HOT_SHOPPINGLIST_IDLE_TIMEOUT"]:
+                del hot_shoppinglists[shoppinglist_id]
+                for id in hot_shoppinglist["items"] or {}:
+                    hot_shoppingingredient_lists.pop(id, None)
+
+    if len(pending) == 0:
+        return 0
+
+    try:
+        deltas = {}
+        for obtained in (True, False):
+            ids = [id for id, value in pending.items() if value is obtained]
+            if len(ids) > 0:
+                for shoppinglist_id, category in db.session.query(Shoppingingredient.shoppinglist_id, Shoppingingredient.category).filter(Shoppingingredient.id.in_(ids), Shoppingingredient.obtained != obtained).all():
+                    add_progress_delta(deltas, shoppinglist_id, category, 0, 1 if obtained else -1)
+                db.session.query(Shoppingingredient).filter(Shoppingingredient.id.in_(ids)).update({Shoppingingredient.obtained: obtained}, synchronize_session=False)
+        apply_progress_deltas(db.session.connection(), deltas)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        with hot_shoppinglist_lock:
+            for id, obtained in pending.items():
+                shoppinglist_id = hot_shoppingingredient_lists.get(id)
+                if shoppinglist_id in hot_shoppinglists:
+                    hot_shoppinglists[shoppinglist_id]["dirty"].setdefault(id, obtained)
+        raise
+
+    return len(pending)
+
+def run_hot_shoppinglist_flusher(app):
+    socketio = app.extensions["socketio"]
+    while True:
+        socketio.sleep(app.config["HOT_SHOPPINGLIST_FLUSH_INTERVAL"])
+        with app.app_context():
+            try:
+                flush_hot_shoppinglists(evict_idle=True)
+            except Exception as error:
+                app.logger.error(f"Hot shoppinglist flush failed: {error}")
+        if len(hot_shoppinglists) == 0:
+            hot_shoppinglist_flusher["running"] = False
+            return
+
+def start_hot_shoppinglist_flusher():
+    if not hot_shoppinglist_flusher["running"]:
+        hot_shoppinglist_flusher["running"] = True
+        get_socketio().start_background_task(run_hot_shoppinglist_flusher, current_app._get_current_object())
+
+def flush_hot_shoppinglists_on_exit(app):
+    if len(hot_shoppinglists) > 0:
+        with app.app_context():
+            flush_hot_shoppinglists()
+
+@db.event.listens_for(db.session, "after_flush")
+def mark_hot_shoppinglists_stale(session, flush_context):
+    if len(hot_shoppinglists) == 0:
+        return
+    for record in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(record, Shoppingingredient) and record.shoppinglist_id in hot_shoppinglists:
+            hot_shoppinglist = hot_shoppinglists[record.shoppinglist_id]
+            hot_shoppinglist["items"] = None
+            if record in session.deleted or db.inspect(record).attrs.obtained.history.has_changes():
+                hot_shoppinglist["dirty"].pop(record.id, None)
+        elif isinstance(record, Shoppinglist) and record.id in hot_shoppinglists:
+            hot_shoppinglists[record.id]["items"] = None
+
+def is_hot_toggle(data):
+    return current_app.config["HOT_SHOPPINGLISTS"] and isinstance(data, dict) and set(data.keys()) <= {"id", "obtained"} and (data.get("obtained") is None or isinstance(data.get("obtained"), bool))
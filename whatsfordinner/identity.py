@@ -0,0 +1,86 @@
+from flask import current_app, request, g
+
+import time
+
+from whatsfordinner.extensions import db, bcrypt
+from whatsfordinner.models import User, Session, Settings
+
+# Request Identity
+# A client that sends its session token in the X-Session-Token header is
+# resolved to its user the first time a handler asks for it, and the result is
+# cached on g for the rest of the request: get_current_user_id only verifies
+# the token, get_current_user also loads the user with their settings.
+# Requests that never ask pay nothing. A token is checked against the hashed
+# address it was issued to with bcrypt, which is slow, so verified (token,
+# address) pairs are remembered for IDENTITY_CACHE_TTL seconds and forgotten
+# on logout; the cache lives in the worker process, which matches the single
+# eventlet worker in the Procfile. A cached pair still checks that its session
+# row exists (one indexed lookup on the unique token), so a session deleted by
+# another worker or path stops resolving at once. get_caller returns the
+# resolved user when a handler's user id is the caller's, so the caller is not
+# loaded twice; any other user goes through get_user, which loads by id
+# through the session's identity map.
+SESSION_TOKEN_HEADER = "X-Session-Token"
+
+verified_sessions = {}
+
+def get_verified_user_id(token):
+    key = (token, str(request.remote_addr))
+    now = time.time()
+    cached = verified_sessions.get(key)
+    if cached is not None and now - cached[1] < current_app.config["IDENTITY_CACHE_TTL"]:
+        if db.session.query(db.exists().where(Session.token == token, Session.user_id == cached[0])).scalar():
+            return cached[0]
+        verified_sessions.pop(key, None)
+        return None
+
+    session = db.session.query(Session).filter(Session.token == token).first()
+    if session is None or bcrypt.check_password_hash(session.ip, key[1]) is False:
+        verified_sessions.pop(key, None)
+        return None
+
+    verified_sessions[key] = (session.user_id, now)
+    if len(verified_sessions) > 1000:
+        for verified_key, (user_id, verified_at) in list(verified_sessions.items()):
+            if now - verified_at >= current_app.config["IDENTITY_CACHE_TTL"]:
+                verified_sessions.pop(verified_key, None)
+    return session.user_id
+
+def forget_sessions(tokens):
+    tokens = set(tokens)
+    for key in list(verified_sessions):
+        if key[0] in tokens:
+            verified_sessions.pop(key, None)
+
+def get_current_user_id():
+    if "current_user_id" not in g:
+        token = request.headers.get(SESSION_TOKEN_HEADER)
+        g.current_user_id = get_verified_user_id(token) if token else None
+    return g.current_user_id
+
+def get_current_user():
+    if "current_user" not in g:
+        user_id = get_current_user_id()
+        g.current_user = db.session.get(User, user_id, options=[db.selectinload(User.settings)]) if user_id is not None else None
+    return g.current_user
+
+def get_caller(user_id):
+    user = get_current_user()
+    if user is not None and str(user.id) == str(user_id):
+        return user
+    return get_user(user_id)
+
+def get_user(user_id):
+    if user_id is None:
+        return None
+    try:
+        user_id = int(user_id)
+    except (TypeError, ValueError):
+        return None
+    return db.session.get(User, user_id)
+
+def get_user_settings(user_id):
+    user = get_current_user()
+    if user is not None and str(user.id) == str(user_id):
+        return user.settings[0] if len(user.settings) > 0 else None
+    return db.session.query(Settings).filter(Settings.user_id == user_id).first()
@@ -0,0 +1,249 @@
+import re
+from fractions import Fraction
+from functools import lru_cache
+
+UNICODE_FRACTIONS = {
+    "½": " 1/2",
+    "⅓": " 1/3",
+    "⅔": " 2/3",
+    "¼": " 1/4",
+    "¾": " 3/4",
+    "⅛": " 1/8",
+    "⅜": " 3/8",
+    "⅝": " 5/8",
+    "⅞": " 7/8",
+    "⁄": "/"
+}
+
+# Each unit maps to its family and its size in the family's base unit
+# (millilitres for volume, grams for weight).
+UNITS = {
+    "tsp": ("volume", Fraction("4.92892")),
+    "tbsp": ("volume", Fraction("14.7868")),
+    "fl oz": ("volume", Fraction("29.5735")),
+    "cup": ("volume", Fraction("236.588")),
+    "pint": ("volume", Fraction("473.176")),
+    "quart": ("volume", Fraction("946.353")),
+    "gallon": ("volume", Fraction("3785.41")),
+    "ml": ("volume", Fraction(1)),
+    "l": ("volume", Fraction(1000)),
+    "g": ("weight", Fraction(1)),
+    "kg": ("weight", Fraction(1000)),
+    "oz": ("weight", Fraction("28.3495")),
+    "lb": ("weight", Fraction("453.592")),
+    "": ("count", Fraction(1))
+}
+
+UNIT_ALIASES = {
+    "t": "tsp",
+    "teaspoon": "tsp",
+    "teaspoons": "tsp",
+    "tsps": "tsp",
+    "T": "tbsp",
+    "tablespoon": "tbsp",
+    "tablespoons": "tbsp",
+    "tbs": "tbsp",
+    "tbsps": "tbsp",
+    "tbl": "tbsp",
+    "fluid ounce": "fl oz",
+    "fluid ounces": "fl oz",
+    "fl. oz": "fl oz",
+    "c": "cup",
+    "cups": "cup",
+    "pints": "pint",
+    "pt": "pint",
+    "quarts": "quart",
+    "qt": "quart",
+    "gallons": "gallon",
+    "gal": "gallon",
+    "milliliter": "ml",
+    "milliliters": "ml",
+    "millilitre": "ml",
+    "millilitres": "ml",
+    "liter": "l",
+    "liters": "l",
+    "litre": "l",
+    "litres": "l",
+    "gram": "g",
+    "grams": "g",
+    "gr": "g",
+    "kilogram": "kg",
+    "kilograms": "kg",
+    "kgs": "kg",
+    "ounce": "oz",
+    "ounces": "oz",
+    "pound": "lb",
+    "pounds": "lb",
+    "lbs": "lb",
+    "each": "",
+    "whole": "",
+    "piece": "",
+    "pieces": ""
+}
+
+NUMBER = r"(?:\d+\s+\d+/\d+|\d+/\d+|\d*\.\d+|\d+)"
+AMOUNT_PATTERN = re.compile(rf"^\s*(?P<low>{NUMBER})(?:\s*(?:-|–|to)\s*(?P<high>{NUMBER}))?\s*(?P<rest>.*?)\s*$")
+
+
+# Returns None for amounts the pattern matches but Fraction cannot represent,
+# such as "1/0".
+def parse_number(text):
+    text = text.strip()
+    try:
+        if " " in text:
+            whole, fraction = text.split(None, 1)
+            return Fraction(whole) + Fraction(fraction)
+        return Fraction(text)
+    except (ZeroDivisionError, ValueError):
+        return None
+
+
+def normalize_unit(unit):
+    unit = (unit or "").strip().rstrip(".")
+    if unit in UNIT_ALIASES:
+        return UNIT_ALIASES[unit]
+    unit = unit.lower()
+    unit = UNIT_ALIASES.get(unit, unit)
+    if unit in UNITS:
+        return unit
+    if unit.endswith("es") and unit[:-2] in ("box", "bunch", "dash", "pinch"):
+        return unit[:-2]
+    if unit.endswith("s") and not unit.endswith("ss"):
+        return unit[:-1]
+    return unit
+
+
+def normalize_name(name):
+    words = " ".join((name or "").lower().split()).split(" ")
+    last = words[-1]
+    if len(last) > 3:
+        if last.endswith("ies"):
+            last = last[:-3] + "y"
+        elif last.endswith("oes"):
+            last = last[:-2]
+        elif last.endswith("s") and not last.endswith("ss"):
+            last = last[:-1]
+    words[-1] = last
+    return " ".join(words)
+
+
+def parse_unit_prefix(text):
+    words = text.split()
+    for length in (2, 1):
+        if len(words) >= length and normalize_unit(" ".join(words[:length])) in UNITS:
+            return normalize_unit(" ".join(words[:length]))
+    return ""
+
+
+# Parsing is cached on the raw strings, so every shoppingingredient copied from
+# the same Ingredient reuses one parsed representation and an edited
+# ingredient simply misses the cache.
+@lru_cache(maxsize=8192)
+def parse_ingredient(name, amount, unit):
+    text = str(amount or "")
+    for fraction, replacement in UNICODE_FRACTIONS.items():
+        text = text.replace(fraction, replacement)
+
+    match = AMOUNT_PATTERN.match(text)
+    low = parse_number(match.group("low")) if match is not None else None
+    high = parse_number(match.group("high")) if match is not None and match.group("high") else low
+    if low is None or high is None:
+        return normalize_name(name), None, None, None, normalize_unit(unit)
+
+    unit_key = normalize_unit(unit) if unit else parse_unit_prefix(match.group("rest"))
+    family, size = UNITS.get(unit_key, (f"unit:{unit_key}", Fraction(1)))
+    return normalize_name(name), family, low * size, high * size, unit_key
+
+
+def format_quantity(quantity):
+    whole = int(quantity)
+    remainder = quantity - whole
+    if remainder == 0:
+        return str(whole)
+
+    rounded = remainder.limit_denominator(8)
+    if abs(rounded - remainder) <= Fraction(1, 100) and rounded.denominator in (2, 3, 4, 8):
+        if rounded == 1:
+            return str(whole + 1)
+        fraction = f"{rounded.numerator}/{rounded.denominator}"
+        return f"{whole} {fraction}" if whole > 0 else fraction
+    return f"{float(quantity):.2f}".rstrip("0").rstrip(".")
+
+
+def format_amount(low, high, unit_key):
+    size = UNITS[unit_key][1] if unit_key in UNITS else Fraction(1)
+    low = low / size
+    high = high / size
+    if low == high:
+        return format_quantity(low)
+    return f"{format_quantity(low)}-{format_quantity(high)}"
+
+
+# Takes shoppingingredient dicts (name, amount, unit, category, multiplier,
+# obtained, meal_name, id) and merges the ones with the same normalized name
+# and unit family, scaling each by its multiplier. Amounts that cannot be
+# parsed are kept as their own entries.
+def consolidate(shoppingingredients):
+    groups = {}
+    order = []
+    for item in shoppingingredients:
+        normalized_name, family, low, high, unit_key = parse_ingredient(item.get("name"), item.get("amount"), item.get("unit"))
+        multiplier = item.get("multiplier") or 1
+        if family is None:
+            key = ("unparsed", item.get("id"))
+        else:
+            key = (normalized_name, family)
+
+        group = groups.get(key)
+        if group is None:
+            group = {
+                "name": item.get("name"),
+                "category": item.get("category"),
+                "family": family,
+                "low": Fraction(0),
+                "high": Fraction(0),
+                "units": {},
+                "obtained": True,
+                "meal_names": [],
+                "shoppingingredient_ids": [],
+                "raw_amount": item.get("amount"),
+                "raw_unit": item.get("unit"),
+                "multiplier": multiplier
+            }
+            groups[key] = group
+            order.append(key)
+
+        if family is not None:
+            group["low"] += low * multiplier
+            group["high"] += high * multiplier
+            group["units"][unit_key] = group["units"].get(unit_key, 0) + 1
+        if group["category"] is None:
+            group["category"] = item.get("category")
+        group["obtained"] = group["obtained"] and bool(item.get("obtained"))
+        if item.get("meal_name") is not None and item.get("meal_name") not in group["meal_names"]:
+            group["meal_names"].append(item.get("meal_name"))
+        group["shoppingingredient_ids"].append(item.get("id"))
+
+    results = []
+    for key in order:
+        group = groups[key]
+        if group["family"] is None:
+            amount = group["raw_amount"]
+            unit = group["raw_unit"]
+            if group["multiplier"] != 1:
+                amount = f"{amount} x{group['multiplier']}"
+        else:
+            unit_key = max(group["units"], key=lambda unit: (group["units"][unit], -len(unit)))
+            amount = format_amount(group["low"], group["high"], unit_key)
+            unit = unit_key or None
+        results.append({
+            "name": group["name"],
+            "amount": amount,
+            "unit": unit,
+            "category": group["category"],
+            "obtained": group["obtained"],
+            "parsed": group["family"] is not None,
+            "meal_names": group["meal_names"],
+            "shoppingingredient_ids": group["shoppingingredient_ids"]
+        })
+    return results
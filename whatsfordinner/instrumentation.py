@@ -0,0 +1,150 @@
+from flask import current_app, request, g, has_request_context
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy.engine import Engine
+
+import time
+
+from whatsfordinner.metrics import COUNT_BUCKETS, SIZE_BUCKETS, Histogram
+from whatsfordinner.query_tracker import NPlusOneError, QueryTracker, describe_repeated
+from whatsfordinner.extensions import db, ma
+
+# Metrics
+# /metrics serves Prometheus text format: per-route latency and response size,
+# SQL statements per request, and how long each request spent in the
+# database, in serialization (marshmallow dumps plus JSON encoding, minus any
+# lazy loads they trigger) and in Socket.IO emits. With METRICS_TOKEN set the
+# endpoint takes that as a bearer token instead of the API's Basic auth.
+request_latency = Histogram("whatsfordinner_http_request_duration_seconds", "HTTP request latency by route.", ("method", "route", "status"))
+request_statements = Histogram("whatsfordinner_http_request_sql_statements", "SQL statements executed per HTTP request.", ("method", "route"), COUNT_BUCKETS)
+request_phase_seconds = Histogram("whatsfordinner_http_request_phase_seconds", "Time per HTTP request spent in the database, serialization and socket emits.", ("route", "phase"))
+response_bytes = Histogram("whatsfordinner_http_response_size_bytes", "HTTP response body size by route.", ("method", "route"), SIZE_BUCKETS)
+socket_emit_seconds = Histogram("whatsfordinner_socket_emit_duration_seconds", "Time spent emitting Socket.IO events.", ("event",))
+
+REQUEST_PHASES = ("db", "serialization", "socket_emit")
+
+def get_request_metrics():
+    if has_request_context():
+        return g.get("metrics")
+    return None
+
+def add_request_time(phase, elapsed):
+    metrics = get_request_metrics()
+    if metrics is not None:
+        metrics[phase] += elapsed
+
+@db.event.listens_for(Engine, "before_cursor_execute")
+def start_statement_timer(connection, cursor, statement, parameters, context, executemany):
+    connection.info["statement_started"] = time.perf_counter()
+
+@db.event.listens_for(Engine, "after_cursor_execute")
+def record_statement(connection, cursor, statement, parameters, context, executemany):
+    metrics = get_request_metrics()
+    if metrics is not None:
+        metrics["statements"] += 1
+        metrics["db"] += time.perf_counter() - connection.info.pop("statement_started", time.perf_counter())
+        track_statement(statement, parameters)
+
+class TimedSchema(ma.Schema):
+    def dump(self, obj, *, many=None):
+        metrics = get_request_metrics()
+        if metrics is None or metrics["dumping"]:
+            return super().dump(obj, many=many)
+
+        metrics["dumping"] = True
+        started = time.perf_counter()
+        db_started = metrics["db"]
+        try:
+            return super().dump(obj, many=many)
+        finally:
+            metrics["dumping"] = False
+            metrics["serialization"] += time.perf_counter() - started - (metrics["db"] - db_started)
+
+class TimedJSONProvider(DefaultJSONProvider):
+    def dumps(self, obj, **kwargs):
+        started = time.perf_counter()
+        try:
+            return super().dumps(obj, **kwargs)
+        finally:
+            add_request_time("serialization", time.perf_counter() - started)
+
+def get_route_label():
+    return request.url_rule.rule if request.url_rule is not None else "unmatched"
+
+def start_request_metrics():
+    g.metrics = {
+        "started": time.perf_counter(),
+        "statements": 0,
+        "dumping": False,
+        **{phase: 0.0 for phase in REQUEST_PHASES}
+    }
+
+def record_request_metrics(response):
+    metrics = get_request_metrics()
+    if metrics is None:
+        return response
+
+    route = get_route_label()
+    request_latency.observe((request.method, route, str(response.status_code)), time.perf_counter() - metrics["started"])
+    request_statements.observe((request.method, route), metrics["statements"])
+    for phase in REQUEST_PHASES:
+        request_phase_seconds.observe((route, phase), metrics[phase])
+    if response.is_streamed and not response.direct_passthrough:
+        response.response = count_streamed_bytes(response.iter_encoded(), response.response, (request.method, route))
+    else:
+        response_bytes.observe((request.method, route), response.calculate_content_length() or 0)
+    return response
+
+# A streamed body's size is only known once it has been sent, so it is counted
+# as it goes out (after compression) and observed when the stream finishes or
+# is closed.
+def count_streamed_bytes(encoded, chunks, labels):
+    size = 0
+    try:
+        for chunk in encoded:
+            size += len(chunk)
+            yield chunk
+    finally:
+        if hasattr(chunks, "close"):
+            chunks.close()
+        response_bytes.observe(labels, size)
+
+# N+1 Detection
+# With NPLUSONE_MODE set to "log" (the default in debug mode) every request
+# records its statements in a QueryTracker (see query_tracker.py) and logs the
+# route and lazy-loaded relationship of each statement that ran with
+# NPLUSONE_THRESHOLD or more different parameter sets. "raise" raises
+# NPlusOneError at the statement that crosses the threshold instead, for test
+# runs; "off" skips tracking.
+def get_query_tracker():
+    if has_request_context():
+        return g.get("query_tracker")
+    return None
+
+@db.event.listens_for(db.session, "do_orm_execute")
+def label_relationship_load(orm_execute_state):
+    if get_query_tracker() is None:
+        return
+    if orm_execute_state.is_relationship_load and orm_execute_state.lazy_loaded_from is not None:
+        g.query_relationship = f"{orm_execute_state.lazy_loaded_from.class_.__name__}.{orm_execute_state.loader_strategy_path[-1].key}"
+    else:
+        g.query_relationship = None
+
+def track_statement(statement, parameters):
+    tracker = get_query_tracker()
+    if tracker is None:
+        return
+    relationship = g.pop("query_relationship", None)
+    if tracker.record(statement, parameters, relationship) and current_app.config["NPLUSONE_MODE"] == "raise":
+        repeated = next(entry for entry in tracker.repeated() if entry["statement"] == statement)
+        raise NPlusOneError(describe_repeated(get_route_label(), repeated))
+
+def start_query_tracker():
+    if current_app.config["NPLUSONE_MODE"] in ("log", "raise"):
+        g.query_tracker = QueryTracker(current_app.config["NPLUSONE_THRESHOLD"])
+
+def report_repeated_queries(response):
+    tracker = get_query_tracker()
+    if tracker is not None:
+        for repeated in tracker.repeated():
+            current_app.logger.warning(describe_repeated(get_route_label(), repeated))
+    return response
@@ -0,0 +1,93 @@
+from datetime import date
+
+from whatsfordinner.mealplan_generator import is_awake
+
+
+# Category membership for one user's meals as Python int bitsets. Every meal
+# gets a fixed ordinal (its bit position) and each category keeps the bitset
+# of its meals, so AND/OR/NOT category filters are single bitwise ops.
+class UserMealIndex:
+    def __init__(self, meals=(), links=()):
+        self.ordinals = {}
+        self.meal_ids = []
+        self.all = 0
+        self.categories = {}
+        self.sleeping = {}
+        for meal_id, sleep_until in meals:
+            self.add_meal(meal_id, sleep_until)
+        for meal_id, category_id in links:
+            self.attach(category_id, meal_id)
+
+    def add_meal(self, meal_id, sleep_until=None):
+        if meal_id in self.ordinals:
+            return
+        ordinal = len(self.meal_ids)
+        self.ordinals[meal_id] = ordinal
+        self.meal_ids.append(meal_id)
+        self.all |= 1 << ordinal
+        self.set_sleep_until(meal_id, sleep_until)
+
+    def remove_meal(self, meal_id):
+        ordinal = self.ordinals.pop(meal_id, None)
+        if ordinal is None:
+            return
+        bit = 1 << ordinal
+        self.meal_ids[ordinal] = None
+        self.all &= ~bit
+        self.sleeping.pop(ordinal, None)
+        for category_id in self.categories:
+            self.categories[category_id] &= ~bit
+
+    def set_sleep_until(self, meal_id, sleep_until):
+        ordinal = self.ordinals.get(meal_id)
+        if ordinal is None:
+            return
+        if sleep_until is None or sleep_until == "":
+            self.sleeping.pop(ordinal, None)
+        else:
+            self.sleeping[ordinal] = sleep_until
+
+    def attach(self, category_id, meal_id):
+        ordinal = self.ordinals.get(meal_id)
+        if ordinal is not None:
+            self.categories[category_id] = self.categories.get(category_id, 0) | (1 << ordinal)
+
+    def detach(self, category_id, meal_id):
+        ordinal = self.ordinals.get(meal_id)
+        if ordinal is not None and category_id in self.categories:
+            self.categories[category_id] &= ~(1 << ordinal)
+
+    def remove_category(self, category_id):
+        self.categories.pop(category_id, None)
+
+    def category_bits(self, category_id):
+        return self.categories.get(category_id, 0)
+
+    def awake_bits(self, today=None):
+        today = today or date.today()
+        asleep = 0
+        for ordinal, sleep_until in self.sleeping.items():
+            if not is_awake(sleep_until, today):
+                asleep |= 1 << ordinal
+        return self.all & ~asleep
+
+    def query(self, all_of=(), any_of=(), none_of=(), awake_only=True, today=None):
+        bits = self.awake_bits(today) if awake_only else self.all
+        for category_id in all_of:
+            bits &= self.category_bits(category_id)
+        if len(any_of) > 0:
+            any_bits = 0
+            for category_id in any_of:
+                any_bits |= self.category_bits(category_id)
+            bits &= any_bits
+        for category_id in none_of:
+            bits &= ~self.category_bits(category_id)
+        return bits
+
+    def meal_ids_from_bits(self, bits):
+        meal_ids = []
+        while bits:
+            lowest = bits & -bits
+            meal_ids.append(self.meal_ids[lowest.bit_length() - 1])
+            bits ^= lowest
+        return meal_ids
@@ -0,0 +1,33 @@
+from flask import current_app
+
+import time
+
+from whatsfordinner.meal_index import UserMealIndex
+from whatsfordinner.extensions import db
+from whatsfordinner.models import categories_table, Meal
+
+# Meal Indexes
+# Per-user category bitsets (see meal_index.py), built on first use and kept
+# current by the meal and category routes. Indexes live in the worker that
+# built them, so they are also rebuilt after MEAL_INDEX_TTL seconds to pick up
+# writes handled by other workers.
+meal_indexes = {}
+
+def get_meal_index(user_id):
+    user_id = int(user_id)
+    entry = meal_indexes.get(user_id)
+    if entry is not None and time.time() - entry["built_at"] < current_app.config["MEAL_INDEX_TTL"]:
+        return entry["index"]
+
+    meals = db.session.query(Meal.id, Meal.sleep_until).filter(Meal.user_id == user_id).order_by(Meal.id).all()
+    links = db.session.query(categories_table.c.meal_id, categories_table.c.category_id).join(Meal, Meal.id == categories_table.c.meal_id).filter(Meal.user_id == user_id).all()
+    index = UserMealIndex(meals, links)
+    meal_indexes[user_id] = {
+        "index": index,
+        "built_at": time.time()
+    }
+    return index
+
+def get_loaded_meal_index(user_id):
+    entry = meal_indexes.get(int(user_id)) if user_id is not None else None
+    return entry["index"] if entry is not None else None
@@ -0,0 +1,44 @@
+from flask.cli import with_appcontext
+import click
+
+from whatsfordinner.extensions import db
+from whatsfordinner.models import mealplans_table, Meal, Mealplan
+
+# Meal Recency
+# Meal.last_planned_at and Meal.times_planned summarize every mealplan a meal
+# is on, so recency rankings never scan historical plans. Adding a meal to a
+# plan bumps them in place; removing one recomputes them for just the affected
+# meals. `flask rebuild-meal-recency` recomputes them for every meal.
+def record_meals_planned(meal_ids, planned_at):
+    counts = {}
+    for meal_id in meal_ids:
+        counts[meal_id] = counts.get(meal_id, 0) + 1
+
+    for count in set(counts.values()):
+        db.session.query(Meal).filter(Meal.id.in_([meal_id for meal_id in counts if counts[meal_id] == count])).update({
+            Meal.times_planned: Meal.times_planned + count,
+            Meal.last_planned_at: db.case((Meal.last_planned_at == None, planned_at), (Meal.last_planned_at < planned_at, planned_at), else_=Meal.last_planned_at)
+        }, synchronize_session=False)
+
+def refresh_meal_recency(meal_ids=None):
+    query = db.session.query(mealplans_table.c.meal_id, db.func.count(), db.func.max(Mealplan.created_on)).join(Mealplan, Mealplan.id == mealplans_table.c.mealplan_id)
+    if meal_ids is not None:
+        meal_ids = set(meal_ids)
+        if len(meal_ids) == 0:
+            return
+        query = query.filter(mealplans_table.c.meal_id.in_(meal_ids))
+    else:
+        meal_ids = set(meal_id for meal_id, in db.session.query(Meal.id).all())
+
+    recency = {meal_id: (times_planned, last_planned_at) for meal_id, times_planned, last_planned_at in query.group_by(mealplans_table.c.meal_id).all()}
+    db.session.bulk_update_mappings(Meal, [{
+        "id": meal_id,
+        "times_planned": recency.get(meal_id, (0, None))[0],
+        "last_planned_at": recency.get(meal_id, (0, None))[1]
+    } for meal_id in meal_ids])
+
+@click.command("rebuild-meal-recency")
+@with_appcontext
+def rebuild_meal_recency():
+    refresh_meal_recency()
+    db.session.commit()
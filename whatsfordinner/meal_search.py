@@ -0,0 +1,88 @@
+from flask import current_app
+from flask.cli import with_appcontext
+import click
+
+import time
+
+from whatsfordinner.search_index import InvertedIndex
+from whatsfordinner.extensions import db
+from whatsfordinner.models import Meal, Recipe, Step, Ingredient
+
+# Meal Search
+# On Postgres each meal carries a weighted tsvector (name A, description B,
+# ingredient names C, step text D) behind a GIN index, refreshed with a single
+# UPDATE whenever one of those fields changes. Other databases use an
+# in-process InvertedIndex built on the first search and updated by the same
+# refresh calls.
+MEAL_SEARCH_VECTOR_SQL = """
+    setweight(to_tsvector('english', coalesce(meal.name, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce(meal.description, '')), 'B') ||
+    setweight(to_tsvector('english', coalesce((SELECT string_agg(ingredient.name, ' ') FROM ingredient JOIN recipe ON recipe.id = ingredient.recipe_id WHERE recipe.meal_id = meal.id), '')), 'C') ||
+    setweight(to_tsvector('english', coalesce((SELECT string_agg(step.text, ' ') FROM step JOIN recipe ON recipe.id = step.recipe_id WHERE recipe.meal_id = meal.id), '')), 'D')
+"""
+
+meal_search_index = {
+    "index": None,
+    "built_at": 0
+}
+
+def supports_full_text_search():
+    return db.engine.dialect.name == "postgresql"
+
+def get_meal_search_documents(meal_ids=None):
+    meals = db.session.query(Meal.id, Meal.name, Meal.description)
+    ingredients = db.session.query(Recipe.meal_id, Ingredient.name).join(Recipe, Recipe.id == Ingredient.recipe_id)
+    steps = db.session.query(Recipe.meal_id, Step.text).join(Recipe, Recipe.id == Step.recipe_id)
+    if meal_ids is not None:
+        meals = meals.filter(Meal.id.in_(meal_ids))
+        ingredients = ingredients.filter(Recipe.meal_id.in_(meal_ids))
+        steps = steps.filter(Recipe.meal_id.in_(meal_ids))
+
+    documents = {meal.id: {"A": meal.name, "B": meal.description or "", "C": "", "D": ""} for meal in meals.all()}
+    for meal_id, name in ingredients.all():
+        if meal_id in documents:
+            documents[meal_id]["C"] += f" {name}"
+    for meal_id, text in steps.all():
+        if meal_id in documents:
+            documents[meal_id]["D"] += f" {text}"
+    return documents
+
+def get_meal_search_index():
+    if meal_search_index["index"] is None or time.time() - meal_search_index["built_at"] >= current_app.config["SEARCH_INDEX_TTL"]:
+        index = InvertedIndex()
+        for meal_id, fields in get_meal_search_documents().items():
+            index.set_document(meal_id, fields)
+        meal_search_index["index"] = index
+        meal_search_index["built_at"] = time.time()
+    return meal_search_index["index"]
+
+def refresh_meal_search(*meal_ids):
+    meal_ids = [int(meal_id) for meal_id in meal_ids if meal_id is not None]
+    if len(meal_ids) == 0:
+        return
+
+    if supports_full_text_search():
+        db.session.execute(db.text(f"UPDATE meal SET search_vector = {MEAL_SEARCH_VECTOR_SQL} WHERE meal.id = ANY(:meal_ids)"), {"meal_ids": meal_ids})
+        db.session.commit()
+    elif meal_search_index["index"] is not None:
+        documents = get_meal_search_documents(meal_ids)
+        for meal_id in meal_ids:
+            if meal_id in documents:
+                meal_search_index["index"].set_document(meal_id, documents[meal_id])
+            else:
+                meal_search_index["index"].remove(meal_id)
+
+def refresh_recipe_search(*recipe_ids):
+    recipe_ids = [recipe_id for recipe_id in recipe_ids if recipe_id is not None]
+    if len(recipe_ids) > 0:
+        refresh_meal_search(*[meal_id for meal_id, in db.session.query(Recipe.meal_id).filter(Recipe.id.in_(recipe_ids)).distinct().all()])
+
+@click.command("rebuild-search")
+@with_appcontext
+def rebuild_search():
+    if supports_full_text_search():
+        db.session.execute(db.text(f"UPDATE meal SET search_vector = {MEAL_SEARCH_VECTOR_SQL}"))
+        db.session.commit()
+    else:
+        meal_search_index["index"] = None
+        get_meal_search_index()
@@ -0,0 +1,161 @@
+import random
+from datetime import date
+
+from whatsfordinner.date_parsing import parse_date
+
+# Rules are stored as free-form strings, so accept the spellings clients use.
+EXACTLY = "exactly"
+AT_LEAST = "at least"
+AT_MOST = "at most"
+NONE = "none"
+
+RULE_ALIASES = {
+    "exactly": EXACTLY,
+    "equal": EXACTLY,
+    "equals": EXACTLY,
+    "=": EXACTLY,
+    "at least": AT_LEAST,
+    "atleast": AT_LEAST,
+    "minimum": AT_LEAST,
+    "min": AT_LEAST,
+    ">=": AT_LEAST,
+    "at most": AT_MOST,
+    "atmost": AT_MOST,
+    "maximum": AT_MOST,
+    "max": AT_MOST,
+    "<=": AT_MOST,
+    "none": NONE,
+    "no": NONE,
+    "exclude": NONE
+}
+
+def parse_sleep_until(sleep_until):
+    try:
+        return parse_date(sleep_until)
+    except ValueError:
+        return date.max
+
+def is_awake(sleep_until, today=None):
+    sleep_date = parse_sleep_until(sleep_until)
+    return sleep_date is None or sleep_date <= (today or date.today())
+
+def build_candidate(id, difficulty, categories):
+    category_keys = set()
+    for category_id, category_name in categories:
+        category_keys.add(str(category_id))
+        if category_name is not None:
+            category_keys.add(category_name.strip().lower())
+    return {
+        "id": id,
+        "difficulty": difficulty,
+        "category_keys": category_keys
+    }
+
+def normalize_rule(rule):
+    if not isinstance(rule, dict):
+        raise ValueError("Rules must be objects")
+    rule_type = str(rule.get("rule_type") or "").strip().lower()
+    comparison = RULE_ALIASES.get(str(rule.get("rule") or "").strip().lower())
+    value = str(rule.get("value") if rule.get("value") is not None else "").strip().lower()
+    try:
+        amount = int(rule.get("amount") or 0)
+    except (TypeError, ValueError):
+        amount = 0
+    return rule_type, comparison, amount, value
+
+def build_rule_pools(candidates, normalized_rules):
+    category_values = set()
+    difficulty_values = set()
+    for rule_type, comparison, amount, value in normalized_rules:
+        if rule_type == "category":
+            category_values.add(value)
+        elif rule_type == "difficulty" and value.lstrip("-").isdigit():
+            difficulty_values.add(int(value))
+
+    categories = {value: [] for value in category_values}
+    difficulties = {value: [] for value in difficulty_values}
+    for candidate in candidates:
+        for category_key in candidate["category_keys"] & category_values:
+            categories[category_key].append(candidate["id"])
+        if candidate["difficulty"] in difficulties:
+            difficulties[candidate["difficulty"]].append(candidate["id"])
+
+    pools = []
+    for rule_type, comparison, amount, value in normalized_rules:
+        if comparison is None or rule_type not in ("category", "difficulty"):
+            pools.append([])
+        elif rule_type == "category":
+            pools.append(categories[value])
+        else:
+            pools.append(difficulties.get(int(value), []) if value.lstrip("-").isdigit() else [])
+    return pools
+
+def random_order(items, rng):
+    items = list(items)
+    for index in range(len(items) - 1, -1, -1):
+        swap = rng.randint(0, index)
+        items[index], items[swap] = items[swap], items[index]
+        yield items[index]
+
+# Picks up to number meal ids satisfying rules and returns them with the
+# indexes of any rules the best attempt could not satisfy. Each attempt fills
+# the most constrained minimums first and never adds a meal that would push a
+# maximum over its limit.
+def solve_mealplan(candidates, rules, number, rng=None, attempts=20):
+    rng = rng or random.Random()
+    candidate_ids = [candidate["id"] for candidate in candidates]
+    number = max(0, min(number, len(candidate_ids)))
+
+    normalized_rules = [normalize_rule(rule) for rule in rules]
+    pools = build_rule_pools(candidates, normalized_rules)
+    minimums = []
+    maximums = []
+    rules_by_meal = {}
+    for index, (rule_type, comparison, amount, value) in enumerate(normalized_rules):
+        if len(pools[index]) == 0 and comparison not in (EXACTLY, AT_LEAST):
+            comparison = None
+        minimums.append(amount if comparison in (EXACTLY, AT_LEAST) else 0)
+        maximums.append(amount if comparison in (EXACTLY, AT_MOST) else 0 if comparison == NONE else None)
+        for meal_id in pools[index]:
+            rules_by_meal.setdefault(meal_id, []).append(index)
+
+    fill_order = sorted((index for index, minimum in enumerate(minimums) if minimum > 0), key=lambda index: len(pools[index]))
+
+    best_chosen = []
+    best_unsatisfied = list(range(len(rules)))
+    for _ in range(max(1, attempts)):
+        chosen = []
+        chosen_set = set()
+        counts = [0] * len(rules)
+
+        def try_add(meal_id):
+            if meal_id in chosen_set:
+                return False
+            for index in rules_by_meal.get(meal_id, ()):
+                if maximums[index] is not None and counts[index] >= maximums[index]:
+                    return False
+            chosen.append(meal_id)
+            chosen_set.add(meal_id)
+            for index in rules_by_meal.get(meal_id, ()):
+                counts[index] += 1
+            return True
+
+        for index in fill_order:
+            for meal_id in random_order(pools[index], rng):
+                if counts[index] >= minimums[index] or len(chosen) >= number:
+                    break
+                try_add(meal_id)
+
+        for meal_id in random_order(candidate_ids, rng):
+            if len(chosen) >= number:
+                break
+            try_add(meal_id)
+
+        unsatisfied = [index for index in range(len(rules)) if counts[index] < minimums[index] or (maximums[index] is not None and counts[index] > maximums[index])]
+        if len(unsatisfied) < len(best_unsatisfied) or (len(unsatisfied) == len(best_unsatisfied) and len(chosen) > len(best_chosen)):
+            best_chosen = chosen
+            best_unsatisfied = unsatisfied
+        if len(best_unsatisfied) == 0 and len(best_chosen) == number:
+            break
+
+    return best_chosen, best_unsatisfied
@@ -0,0 +1,75 @@
+from flask.cli import with_appcontext
+import click
+
+from datetime import date, datetime
+
+from whatsfordinner.date_parsing import parse_date, parse_timestamp
+from whatsfordinner.extensions import db
+
+# Schema Migration
+# Tables are created with db.create_all(), which never touches existing
+# tables, so `flask migrate-schema` brings an older database up to date: it
+# creates missing tables and columns, converts the columns that used to be
+# stored as strings, and creates any missing indexes. It is safe to run again.
+# Values that cannot be parsed are reported and replaced by the fallback
+# (sleeping meals stay asleep, plans and lists are stamped with the migration
+# time, outlines get 0 meals). Only the primary database is migrated; read
+# replicas (DATABASE_REPLICA_URLS) receive the changes through replication.
+TYPED_COLUMN_MIGRATIONS = [
+    ("meal", "sleep_until", parse_date, date.max),
+    ("mealplan", "created_on", parse_timestamp, None),
+    ("mealplanoutline", "number", lambda value: int(float(value)), 0),
+    ("shoppinglist", "created_on", parse_timestamp, None)
+]
+
+@click.command("migrate-schema")
+@with_appcontext
+def migrate_schema():
+    db.create_all(bind_key=None)
+    migrated_at = datetime.utcnow()
+    dialect = db.engine.dialect
+
+    with db.engine.begin() as connection:
+        inspector = db.inspect(connection)
+        for table in db.metadata.sorted_tables:
+            existing = set(column["name"] for column in inspector.get_columns(table.name))
+            for column in table.columns:
+                if column.name not in existing:
+                    definition = f"{column.name} {column.type.compile(dialect=dialect)}"
+                    if column.server_default is not None:
+                        definition += f" DEFAULT {column.server_default.arg}" + ("" if column.nullable else " NOT NULL")
+                    connection.execute(db.text(f"ALTER TABLE {table.name} ADD COLUMN {definition}"))
+                    print(f"{table.name}.{column.name}: added")
+
+        for table_name, column_name, parse, fallback in TYPED_COLUMN_MIGRATIONS:
+            current = next(column for column in inspector.get_columns(table_name) if column["name"] == column_name)
+            if not isinstance(current["type"], db.String):
+                continue
+
+            column = db.metadata.tables[table_name].columns[column_name]
+            connection.execute(db.text(f"ALTER TABLE {table_name} ADD COLUMN {column_name}_typed {column.type.compile(dialect=dialect)}"))
+            rows = connection.execute(db.text(f"SELECT id, {column_name} FROM {table_name}")).all()
+            values = []
+            unparsed = 0
+            for id, value in rows:
+                parsed = None
+                if value not in (None, ""):
+                    try:
+                        parsed = parse(value)
+                    except (TypeError, ValueError):
+                        unparsed += 1
+                if parsed is None and (value not in (None, "") or not column.nullable):
+                    parsed = migrated_at if fallback is None else fallback
+                values.append({"id": id, "value": parsed})
+            for start in range(0, len(values), 1000):
+                connection.execute(db.text(f"UPDATE {table_name} SET {column_name}_typed = :value WHERE id = :id"), values[start:start + 1000])
+
+            connection.execute(db.text(f"ALTER TABLE {table_name} DROP COLUMN {column_name}"))
+            connection.execute(db.text(f"ALTER TABLE {table_name} RENAME COLUMN {column_name}_typed TO {column_name}"))
+            if not column.nullable and dialect.name == "postgresql":
+                connection.execute(db.text(f"ALTER TABLE {table_name} ALTER COLUMN {column_name} SET NOT NULL"))
+            print(f"{table_name}.{column_name}: converted {len(rows)} rows, {unparsed} unparseable")
+
+        for table in db.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(connection, checkfirst=True)
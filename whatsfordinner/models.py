@@ -0,0 +1,353 @@
+from sqlalchemy.dialects.postgresql import TSVECTOR
+
+from whatsfordinner.extensions import db
+
+# SQLAlchemy Tables
+categories_table = db.Table('categories_table',
+    db.Column('meal_id', db.Integer, db.ForeignKey('meal.id')),
+    db.Column('category_id', db.Integer, db.ForeignKey('category.id'))
+)
+
+mealplans_table = db.Table('mealplans_table',
+    db.Column('mealplan_id', db.Integer, db.ForeignKey('mealplan.id')),
+    db.Column('meal_id', db.Integer, db.ForeignKey('meal.id'))
+)
+
+shared_meals_table = db.Table('shared_meals_table',
+    db.Column('user_id', db.Integer, db.ForeignKey('user.id')),
+    db.Column('meal_id', db.Integer, db.ForeignKey('meal.id'))
+)
+
+shared_mealplans_table = db.Table('shared_mealplans_table',
+    db.Column('user_id', db.Integer, db.ForeignKey('user.id')),
+    db.Column('mealplan_id', db.Integer, db.ForeignKey('mealplan.id'))
+)
+
+shared_shoppinglists_table = db.Table('shared_shoppinglists_table',
+    db.Column('user_id', db.Integer, db.ForeignKey('user.id')),
+    db.Column('shoppinglist_id', db.Integer, db.ForeignKey('shoppinglist.id'))
+)
+
+outgoing_friend_requests_table = db.Table('outgoing_friend_requests_table',
+    db.Column('user_id', db.Integer, db.ForeignKey('user.id')),
+    db.Column('friend_id', db.Integer, db.ForeignKey('user.id'))
+)
+
+incoming_friend_requests_table = db.Table('incoming_friend_requests_table',
+    db.Column('user_id', db.Integer, db.ForeignKey('user.id')),
+    db.Column('friend_id', db.Integer, db.ForeignKey('user.id'))
+)
+
+friends_table = db.Table('friends_table',
+    db.Column('user_id', db.Integer, db.ForeignKey('user.id')),
+    db.Column('friend_id', db.Integer, db.ForeignKey('user.id'))
+)
+
+
+class User(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    username = db.Column(db.String, nullable=False, unique=True)
+    password = db.Column(db.String, nullable=False, unique=False)
+    email = db.Column(db.String, nullable=False, unique=False)
+    sessions = db.relationship("Session", backref="user", cascade='all, delete, delete-orphan')
+    meals = db.relationship("Meal", backref="user", cascade='all, delete, delete-orphan')
+    categories = db.relationship("Category", backref="user", cascade='all, delete, delete-orphan')
+    mealplans = db.relationship("Mealplan", backref="user", cascade='all, delete, delete-orphan')
+    mealplanoutlines = db.relationship("Mealplanoutline", backref="user", cascade='all, delete, delete-orphan')
+    shoppinglists = db.relationship("Shoppinglist", backref="user", cascade='all, delete, delete-orphan')
+    notifications = db.relationship("Notification", backref="user", cascade='all, delete, delete-orphan')
+    settings = db.relationship("Settings", backref="user", cascade='all, delete, delete-orphan')
+    shared_meals = db.relationship("Meal", secondary="shared_meals_table")
+    shared_mealplans = db.relationship("Mealplan", secondary="shared_mealplans_table")
+    shared_shoppinglists = db.relationship("Shoppinglist", secondary="shared_shoppinglists_table")
+    outgoing_friend_requests = db.relationship("User", secondary="outgoing_friend_requests_table", primaryjoin=id==outgoing_friend_requests_table.c.user_id, secondaryjoin=id==outgoing_friend_requests_table.c.friend_id)
+    incoming_friend_requests = db.relationship("User", secondary="incoming_friend_requests_table", primaryjoin=id==incoming_friend_requests_table.c.user_id, secondaryjoin=id==incoming_friend_requests_table.c.friend_id)
+    friends = db.relationship("User", secondary="friends_table", primaryjoin=id==friends_table.c.user_id, secondaryjoin=id==friends_table.c.friend_id)
+    
+    def __init__(self, username, password, email):
+        self.username = username
+        self.password = password
+        self.email = email
+
+class Session(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    token = db.Column(db.String, nullable=False, unique=True)
+    ip = db.Column(db.String, nullable=False, unique=False)
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
+    
+    def __init__(self, token, ip, user_id):
+        self.token = token
+        self.ip = ip
+        self.user_id = user_id
+
+class Settings(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    default_mealplan_outline = db.Column(db.Integer, nullable=True, unique=False)
+    autodelete_mealplans = db.Column(db.Boolean, nullable=False, unique=False)
+    autodelete_mealplans_schedule_number = db.Column(db.Integer, nullable=False, unique=False)
+    autodelete_mealplans_schedule_unit = db.Column(db.String, nullable=False, unique=False)
+    default_shoppinglist_sort = db.Column(db.String, nullable=False, unique=False)
+    autodelete_shoppinglists = db.Column(db.Boolean, nullable=False, unique=False)
+    autodelete_shoppinglists_schedule_number = db.Column(db.Integer, nullable=False, unique=False)
+    autodelete_shoppinglists_schedule_unit = db.Column(db.String, nullable=False, unique=False)
+    allow_notifications = db.Column(db.Boolean, nullable=False, unique=False)
+    allow_nonfriend_sharing = db.Column(db.Boolean, nullable=False, unique=False)
+    shoppinglist_aisle_order = db.Column(db.JSON, nullable=True, unique=False)
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
+    
+    def __init__(self, default_mealplan_outline, autodelete_mealplans, autodelete_mealplans_schedule_number, autodelete_mealplans_schedule_unit, default_shoppinglist_sort, autodelete_shoppinglists, autodelete_shoppinglists_schedule_number, autodelete_shoppinglists_schedule_unit, allow_notifications, allow_nonfriend_sharing, user_id):
+        self.default_mealplan_outline = default_mealplan_outline
+        self.autodelete_mealplans = autodelete_mealplans
+        self.autodelete_mealplans_schedule_number = autodelete_mealplans_schedule_number
+        self.autodelete_mealplans_schedule_unit = autodelete_mealplans_schedule_unit
+        self.default_shoppinglist_sort = default_shoppinglist_sort
+        self.autodelete_shoppinglists = autodelete_shoppinglists
+        self.autodelete_shoppinglists_schedule_number = autodelete_shoppinglists_schedule_number
+        self.autodelete_shoppinglists_schedule_unit = autodelete_shoppinglists_schedule_unit
+        self.allow_notifications = allow_notifications
+        self.allow_nonfriend_sharing = allow_nonfriend_sharing
+        self.user_id = user_id
+
+class Notification(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    category = db.Column(db.String, nullable=False, unique=False)
+    username = db.Column(db.String, nullable=True, unique=False)
+    name = db.Column(db.String, nullable=True, unique=False)
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
+    
+    def __init__(self, category, username, name, user_id):
+        self.category = category
+        self.username = username
+        self.name = name
+        self.user_id = user_id
+
+class Meal(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String, nullable=False, unique=False)
+    description = db.Column(db.String, nullable=True, unique=False)
+    image_url = db.Column(db.String, nullable=True, unique=False)
+    difficulty = db.Column(db.Integer, nullable=False, unique=False)
+    sleep_until = db.Column(db.Date, nullable=True, unique=False)
+    user_username = db.Column(db.String, nullable=False, unique=False)
+    owner_username = db.Column(db.String, nullable=False, unique=False)
+    last_planned_at = db.Column(db.DateTime, nullable=True, unique=False)
+    times_planned = db.Column(db.Integer, nullable=False, unique=False, server_default="0")
+    search_vector = db.Column(db.Text().with_variant(TSVECTOR(), "postgresql"), nullable=True, unique=False)
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
+    recipe = db.relationship("Recipe", backref="meal", cascade='all, delete, delete-orphan')
+    categories = db.relationship("Category", secondary="categories_table")
+    mealplans = db.relationship("Mealplan", secondary="mealplans_table")
+    shared_users = db.relationship("User", secondary="shared_meals_table")
+    
+    def __init__(self, name, description, image_url, difficulty, user_username, owner_username, user_id):
+        self.name = name
+        self.description = description
+        self.image_url = image_url
+        self.difficulty = difficulty
+        self.sleep_until = None
+        self.last_planned_at = None
+        self.times_planned = 0
+        self.user_username = user_username
+        self.owner_username = owner_username
+        self.user_id = user_id
+
+db.Index("meal_search_vector_index", Meal.search_vector, postgresql_using="gin")
+db.Index("meal_user_sleep_until_index", Meal.user_id, Meal.sleep_until)
+db.Index("meal_user_last_planned_at_index", Meal.user_id, Meal.last_planned_at)
+db.Index("mealplans_table_meal_index", mealplans_table.c.meal_id)
+
+class Category(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String, nullable=False, unique=False)
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
+    meals = db.relationship("Meal", secondary="categories_table")
+    
+    def __init__(self, name, user_id):
+        self.name = name
+        self.user_id = user_id
+
+class Recipe(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    meal_id = db.Column(db.Integer, db.ForeignKey("meal.id"), nullable=False)
+    stepsections = db.relationship("Stepsection", backref="recipe", cascade='all, delete, delete-orphan')
+    steps = db.relationship("Step", backref="recipe", cascade='all, delete, delete-orphan')
+    ingredientsections = db.relationship("Ingredientsection", backref="recipe", cascade='all, delete, delete-orphan')
+    ingredients = db.relationship("Ingredient", backref="recipe", cascade='all, delete, delete-orphan')
+    
+    def __init__(self, meal_id):
+        self.meal_id = meal_id
+
+class Stepsection(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    title = db.Column(db.String, nullable=False, unique=False)
+    recipe_id = db.Column(db.Integer, db.ForeignKey("recipe.id"), nullable=False)
+    steps = db.relationship("Step", backref="stepsection", cascade='all, delete, delete-orphan')
+    
+    def __init__(self, title, recipe_id):
+        self.title = title
+        self.recipe_id = recipe_id
+
+class Step(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    number = db.Column(db.Integer, nullable=False, unique=False)
+    text = db.Column(db.String, nullable=False, unique=False)
+    recipe_id = db.Column(db.Integer, db.ForeignKey("recipe.id"), nullable=False)
+    stepsection_id = db.Column(db.Integer, db.ForeignKey("stepsection.id"), nullable=True)
+    
+    def __init__(self, number, text, recipe_id, stepsection_id):
+        self.number = number
+        self.text = text
+        self.recipe_id = recipe_id
+        self.stepsection_id = stepsection_id
+
+class Ingredientsection(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    title = db.Column(db.String, nullable=False, unique=False)
+    recipe_id = db.Column(db.Integer, db.ForeignKey("recipe.id"), nullable=False)
+    ingredients = db.relationship("Ingredient", backref="ingredientsection", cascade='all, delete, delete-orphan')
+    
+    def __init__(self, title, recipe_id):
+        self.title = title
+        self.recipe_id = recipe_id
+
+class Ingredient(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String, nullable=False, unique=False)
+    amount = db.Column(db.String, nullable=False, unique=False)
+    unit = db.Column(db.String, nullable=True, unique=False)
+    category = db.Column(db.String, nullable=True, unique=False)
+    recipe_id = db.Column(db.Integer, db.ForeignKey("recipe.id"), nullable=False)
+    shoppingingredients = db.relationship("Shoppingingredient", backref="ingredient", cascade='all, delete, delete-orphan')
+    ingredientsection_id = db.Column(db.Integer, db.ForeignKey("ingredientsection.id"), nullable=True)
+    
+    def __init__(self, name, amount, unit, category, recipe_id, ingredientsection_id):
+        self.name = name
+        self.amount = amount
+        self.unit = unit
+        self.category = category
+        self.recipe_id = recipe_id
+        self.ingredientsection_id = ingredientsection_id
+
+class Mealplan(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String, nullable=False, unique=False)
+    created_on = db.Column(db.DateTime, nullable=False, unique=False)
+    user_username = db.Column(db.String, nullable=False, unique=False)
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
+    meals = db.relationship("Meal", secondary="mealplans_table")
+    rules = db.relationship("Rule", backref="mealplan", cascade='all, delete, delete-orphan')
+    shoppinglists = db.relationship("Shoppinglist", backref="mealplan", cascade='all, delete, delete-orphan')
+    shared_users = db.relationship("User", secondary="shared_mealplans_table")
+    
+    def __init__(self, name, created_on, user_username, user_id):
+        self.name = name
+        self.created_on = created_on
+        self.user_username = user_username
+        self.user_id = user_id
+
+db.Index("mealplan_user_created_on_index", Mealplan.user_id, Mealplan.created_on)
+
+class Mealplanoutline(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String, nullable=False, unique=False)
+    number = db.Column(db.Integer, nullable=False, unique=False)
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
+    rules = db.relationship("Rule", backref="mealplanoutline", cascade='all, delete, delete-orphan')
+    
+    def __init__(self, name, number, user_id):
+        self.name = name
+        self.number = number
+        self.user_id = user_id
+
+class Rule(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    rule_type = db.Column(db.String, nullable=False, unique=False)
+    rule = db.Column(db.String, nullable=False, unique=False)
+    amount = db.Column(db.Integer, nullable=False, unique=False)
+    value = db.Column(db.String, nullable=False, unique=False)
+    mealplan_id = db.Column(db.Integer, db.ForeignKey("mealplan.id"), nullable=True)
+    mealplanoutline_id = db.Column(db.Integer, db.ForeignKey("mealplanoutline.id"), nullable=True)
+    
+    def __init__(self, rule_type, rule, amount, value, mealplan_id, mealplanoutline_id):
+        self.rule_type = rule_type
+        self.rule = rule
+        self.amount = amount
+        self.value = value
+        self.mealplan_id = mealplan_id
+        self.mealplanoutline_id = mealplanoutline_id
+
+class Shoppinglist(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String, nullable=False, unique=False)
+    created_on = db.Column(db.DateTime, nullable=False, unique=False)
+    updates_hidden = db.Column(db.Boolean, nullable=False, unique=False)
+    is_sublist = db.Column(db.Boolean, nullable=False, unique=False)
+    user_username = db.Column(db.String, nullable=False, unique=False)
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
+    mealplan_id = db.Column(db.Integer, db.ForeignKey("mealplan.id"), nullable=True)
+    shoppingingredients = db.relationship("Shoppingingredient", backref="shoppinglist", cascade='all, delete, delete-orphan')
+    progress = db.relationship("ShoppinglistProgress", cascade='all, delete, delete-orphan')
+    shared_users = db.relationship("User", secondary="shared_shoppinglists_table")
+    
+    def __init__(self, name, created_on, updates_hidden, is_sublist, user_username, user_id, mealplan_id):
+        self.name = name
+        self.created_on = created_on
+        self.updates_hidden = updates_hidden
+        self.is_sublist = is_sublist
+        self.user_username = user_username
+        self.user_id = user_id
+        self.mealplan_id = mealplan_id
+
+db.Index("shoppinglist_user_created_on_index", Shoppinglist.user_id, Shoppinglist.created_on)
+
+class Shoppingingredient(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String, nullable=False, unique=False)
+    amount = db.Column(db.String, nullable=False, unique=False)
+    unit = db.Column(db.String, nullable=True, unique=False)
+    category = db.Column(db.String, nullable=True, unique=False)
+    obtained = db.Column(db.Boolean, nullable=False, unique=False)
+    multiplier = db.Column(db.Integer, nullable=False, unique=False)
+    meal_name = db.Column(db.String, nullable=True, unique=False)
+    shoppinglist_id = db.Column(db.Integer, db.ForeignKey("shoppinglist.id"), nullable=False)
+    ingredient_id = db.Column(db.Integer, db.ForeignKey("ingredient.id"), nullable=True)
+    
+    def __init__(self, name, amount, unit, category, multiplier, meal_name, shoppinglist_id, ingredient_id):
+        self.name = name
+        self.amount = amount
+        self.unit = unit
+        self.category = category
+        self.obtained = False
+        self.multiplier = multiplier
+        self.meal_name = meal_name
+        self.shoppinglist_id = shoppinglist_id
+        self.ingredient_id = ingredient_id
+
+db.Index("shoppingingredient_shoppinglist_category_index", Shoppingingredient.shoppinglist_id, Shoppingingredient.category, Shoppingingredient.name)
+
+class ShoppinglistProgress(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    shoppinglist_id = db.Column(db.Integer, db.ForeignKey("shoppinglist.id"), nullable=False)
+    category = db.Column(db.String, nullable=False, unique=False)
+    total = db.Column(db.Integer, nullable=False, unique=False)
+    obtained = db.Column(db.Integer, nullable=False, unique=False)
+    __table_args__ = (db.UniqueConstraint("shoppinglist_id", "category"),)
+    
+    def __init__(self, shoppinglist_id, category, total, obtained):
+        self.shoppinglist_id = shoppinglist_id
+        self.category = category
+        self.total = total
+        self.obtained = obtained
+
+class EventLog(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    room = db.Column(db.String, nullable=False, unique=False, index=True)
+    seq = db.Column(db.Integer, nullable=False, unique=False, index=True)
+    event = db.Column(db.String, nullable=False, unique=False)
+    payload = db.Column(db.Text, nullable=False, unique=False)
+    
+    def __init__(self, room, seq, event, payload):
+        self.room = room
+        self.seq = seq
+        self.event = event
+        self.payload = payload
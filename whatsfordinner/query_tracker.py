@@ -0,0 +1,48 @@
+class NPlusOneError(Exception):
+    pass
+
+
+# Records the statements run during one request. The same SQL executed with
+# NPLUSONE_THRESHOLD or more different parameter sets is almost always a
+# lazy load inside a loop, so those statements are reported as N+1 queries.
+class QueryTracker:
+    def __init__(self, threshold):
+        self.threshold = threshold
+        self.statements = {}
+
+    def record(self, statement, parameters, relationship=None):
+        entry = self.statements.get(statement)
+        if entry is None:
+            entry = self.statements[statement] = {
+                "count": 0,
+                "parameters": set(),
+                "relationships": set()
+            }
+        entry["count"] += 1
+        if relationship is not None:
+            entry["relationships"].add(relationship)
+
+        # True exactly once per statement, when it first crosses the threshold.
+        key = repr(parameters)
+        if key in entry["parameters"]:
+            return False
+        entry["parameters"].add(key)
+        return len(entry["parameters"]) == self.threshold
+
+    def repeated(self):
+        return [
+            {
+                "statement": statement,
+                "count": entry["count"],
+                "distinct_parameters": len(entry["parameters"]),
+                "relationships": sorted(entry["relationships"])
+            }
+            for statement, entry in self.statements.items()
+            if len(entry["parameters"]) >= self.threshold
+        ]
+
+
+def describe_repeated(route, repeated):
+    relationships = ", ".join(repeated["relationships"]) or "unknown relationship"
+    statement = " ".join(repeated["statement"].split())
+    return f"N+1 query on {route} via {relationships}: {repeated['count']} executions with {repeated['distinct_parameters']} parameter sets: {statement}"
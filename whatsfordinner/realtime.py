@@ -0,0 +1,292 @@
+from flask import current_app, g, has_request_context
+
+import json
+import time
+import threading
+from collections import deque, OrderedDict
+
+from whatsfordinner.extensions import db
+from whatsfordinner.models import EventLog
+from whatsfordinner.instrumentation import socket_emit_seconds, add_request_time
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# Socket.IO Event Log
+# Every broadcast is stamped with a per-room sequence number so reconnecting
+# clients can ask for just the events they missed. Recent events are kept in
+# memory; older ones are read back from the event_log table until they are
+# pruned past EVENT_LOG_DB_SIZE. Sequence numbers are assigned by the worker
+# process, which matches the single eventlet worker in the Procfile. An app
+# created without Socket.IO (see serverless.py) has nobody to broadcast to, so
+# it skips both the log and the emit.
+# Events emitted during an HTTP request are held on g until the handler has
+# returned, then logged in one INSERT and emitted. A request that fails with a
+# server error logs and emits none of them. Events from socket handlers and
+# background tasks are logged and emitted straight away.
+BROADCAST_ROOM = "broadcast"
+
+event_log_lock = threading.Lock()
+event_log_sequences = {}
+event_log_buffers = {}
+
+def get_socketio():
+    return current_app.extensions.get("socketio")
+
+# The event log is read and written on its own connection, never through the
+# request's session, so logging an event neither flushes nor commits whatever
+# the caller has pending.
+def read_event_log_seq(room):
+    with db.engine.connect() as connection:
+        return connection.execute(db.select(db.func.max(EventLog.seq)).where(EventLog.room == room)).scalar() or 0
+
+def load_event_log(room):
+    if room not in event_log_sequences:
+        event_log_sequences[room] = read_event_log_seq(room)
+        event_log_buffers[room] = deque(maxlen=current_app.config["EVENT_LOG_BUFFER_SIZE"])
+
+def emit_event(event, payload, room=None):
+    if get_socketio() is None:
+        return
+
+    pending_events = g.get("pending_events") if has_request_context() else None
+    if pending_events is not None:
+        pending_events.append((event, payload, room))
+    else:
+        publish_events([(event, payload, room)])
+
+def start_pending_events():
+    g.pending_events = []
+
+def publish_pending_events(response):
+    pending_events = g.pop("pending_events", None)
+    if pending_events and response.status_code < 500:
+        publish_events(pending_events)
+    return response
+
+def publish_events(events):
+    entries = []
+    with event_log_lock:
+        for event, payload, room in events:
+            log_room = room or BROADCAST_ROOM
+            load_event_log(log_room)
+            event_log_sequences[log_room] += 1
+            seq = event_log_sequences[log_room]
+            payload = dict(payload, seq=seq)
+            event_log_buffers[log_room].append((seq, event, payload))
+            entries.append((log_room, seq, event, payload))
+
+    write_event_log(entries)
+    for (event, _, room), (_, _, _, payload) in zip(events, entries):
+        send_event(event, payload, room)
+
+# The rows are written in their own transaction after the lock is released. A
+# failed write only leaves a gap, which turns a replay from the table into a
+# resync.
+def write_event_log(entries):
+    pruned = {room: seq for room, seq, event, payload in entries if seq % 100 == 0}
+    try:
+        with db.engine.begin() as connection:
+            connection.execute(EventLog.__table__.insert(), [{
+                "room": room,
+                "seq": seq,
+                "event": event,
+                "payload": json.dumps(payload)
+            } for room, seq, event, payload in entries])
+            for room, seq in pruned.items():
+                connection.execute(EventLog.__table__.delete().where(EventLog.room == room, EventLog.seq <= seq - current_app.config["EVENT_LOG_DB_SIZE"]))
+    except Exception as error:
+        current_app.logger.error(f"Event log write failed: {error}")
+
+# Connections that negotiated MessagePack receive each payload as a single
+# binary attachment instead of JSON; everyone else keeps the JSON default.
+MSGPACK_ROOM = "serializer:msgpack"
+msgpack_sids = set()
+
+def send_event(event, payload, room=None):
+    socketio = get_socketio()
+    started = time.perf_counter()
+    try:
+        if len(msgpack_sids) == 0 and len(slow_sids) == 0:
+            socketio.emit(event, payload, to=room)
+            return
+
+        slow = set(slow_sids)
+        socketio.emit(event, payload, to=room, skip_sid=list(msgpack_sids | slow))
+
+        fast_msgpack_sids = msgpack_sids - slow
+        if len(fast_msgpack_sids) > 0:
+            packed_payload = msgpack.packb(payload, use_bin_type=True)
+            if room is None:
+                socketio.emit(event, packed_payload, to=MSGPACK_ROOM, skip_sid=list(slow))
+            else:
+                for sid in fast_msgpack_sids:
+                    if room in socketio.server.rooms(sid):
+                        socketio.emit(event, packed_payload, to=sid)
+
+        for sid in slow:
+            if room is None or room in socketio.server.rooms(sid):
+                queue_slow_event(sid, event, payload)
+    finally:
+        record_emit_time(event, started)
+
+def send_event_to_sid(sid, event, payload):
+    socketio = get_socketio()
+    started = time.perf_counter()
+    if sid in msgpack_sids:
+        socketio.emit(event, msgpack.packb(payload, use_bin_type=True), to=sid)
+    else:
+        socketio.emit(event, payload, to=sid)
+    record_emit_time(event, started)
+
+def record_emit_time(event, started):
+    elapsed = time.perf_counter() - started
+    socket_emit_seconds.observe((event,), elapsed)
+    add_request_time("socket_emit", elapsed)
+
+# Backpressure
+# A connection whose engine.io transport queue grows past
+# SOCKET_QUEUE_HIGH_WATER stops receiving broadcasts directly. Its events are
+# held in a pending queue where a newer update for the same entity replaces
+# the older one, and once more than SOCKET_QUEUE_MAX_PENDING entities are
+# waiting the queue is dropped and the client is sent a single resync event.
+connected_sids = set()
+slow_sids = set()
+slow_queues = {}
+resync_sids = set()
+backpressure_lock = threading.Lock()
+backpressure_stats = {
+    "collapsed": 0,
+    "dropped": 0,
+    "resyncs": 0
+}
+backpressure_monitor = {
+    "running": False
+}
+
+def get_transport_queue_size(sid):
+    socketio = get_socketio()
+    try:
+        eio_sid = socketio.server.manager.eio_sid_from_sid(sid, "/")
+        return socketio.server.eio.sockets[eio_sid].queue.qsize()
+    except (AttributeError, KeyError, TypeError, NotImplementedError):
+        return 0
+
+def get_event_entity_key(event, payload):
+    data = payload.get("data")
+    if payload.get("type") in ("update", "delete") and isinstance(data, dict) and data.get("id") is not None:
+        return (event, data["id"])
+    return (event, "seq", payload.get("seq"))
+
+def queue_slow_event(sid, event, payload):
+    with backpressure_lock:
+        if sid in resync_sids:
+            backpressure_stats["dropped"] += 1
+            return
+
+        queue = slow_queues.setdefault(sid, OrderedDict())
+        key = get_event_entity_key(event, payload)
+        if key in queue:
+            del queue[key]
+            backpressure_stats["collapsed"] += 1
+        queue[key] = (event, payload)
+
+        if len(queue) > current_app.config["SOCKET_QUEUE_MAX_PENDING"]:
+            backpressure_stats["dropped"] += len(queue)
+            backpressure_stats["resyncs"] += 1
+            queue.clear()
+            resync_sids.add(sid)
+
+def drain_slow_connection(sid):
+    with backpressure_lock:
+        queue = slow_queues.get(sid)
+        needs_resync = sid in resync_sids
+        resync_sids.discard(sid)
+        events = list(queue.values()) if queue is not None else []
+        if queue is not None:
+            queue.clear()
+        if not needs_resync and len(events) == 0:
+            slow_sids.discard(sid)
+            slow_queues.pop(sid, None)
+            return
+
+    if needs_resync:
+        send_event_to_sid(sid, "resync", {
+            "data": {
+                "room": BROADCAST_ROOM,
+                "seq": get_event_seq(BROADCAST_ROOM)
+            },
+            "type": "resync"
+        })
+    for event, payload in events:
+        send_event_to_sid(sid, event, payload)
+
+def check_backpressure(high_water):
+    for sid in list(connected_sids):
+        queue_size = get_transport_queue_size(sid)
+        if sid not in slow_sids:
+            if queue_size > high_water:
+                slow_sids.add(sid)
+        elif queue_size <= high_water // 2:
+            drain_slow_connection(sid)
+
+# Runs in a background task, outside any request, so each pass gets its own
+# app context. If a pass fails the monitor stops but clears its flag, so the
+# next connection starts it again instead of backpressure silently staying off.
+def monitor_backpressure(app):
+    socketio = app.extensions["socketio"]
+    high_water = app.config["SOCKET_QUEUE_HIGH_WATER"]
+    try:
+        while len(connected_sids) > 0:
+            with app.app_context():
+                check_backpressure(high_water)
+            socketio.sleep(app.config["SOCKET_QUEUE_CHECK_INTERVAL"])
+    except Exception as error:
+        app.logger.error(f"Backpressure monitor failed: {error}")
+    finally:
+        backpressure_monitor["running"] = False
+
+def start_backpressure_monitor():
+    if not backpressure_monitor["running"]:
+        backpressure_monitor["running"] = True
+        get_socketio().start_background_task(monitor_backpressure, current_app._get_current_object())
+
+def remove_backpressure_state(sid):
+    with backpressure_lock:
+        connected_sids.discard(sid)
+        slow_sids.discard(sid)
+        resync_sids.discard(sid)
+        pending = slow_queues.pop(sid, None)
+        if pending is not None:
+            backpressure_stats["dropped"] += len(pending)
+
+# Only the broadcast room and rooms that have been emitted to are kept in
+# memory; other rooms are looked up without caching, so clients asking about
+# rooms nobody emits to cannot grow the sequences and buffers.
+def get_event_log_state(room):
+    with event_log_lock:
+        if room == BROADCAST_ROOM or room in event_log_sequences:
+            load_event_log(room)
+            return event_log_sequences[room], list(event_log_buffers[room])
+    return read_event_log_seq(room), []
+
+def get_event_seq(room):
+    return get_event_log_state(room)[0]
+
+def get_missed_events(room, last_seq):
+    current_seq, buffer = get_event_log_state(room)
+
+    if last_seq >= current_seq:
+        return current_seq, []
+    if current_seq - last_seq > current_app.config["EVENT_LOG_MAX_REPLAY"]:
+        return current_seq, None
+
+    if len(buffer) > 0 and buffer[0][0] <= last_seq + 1:
+        return current_seq, [entry for entry in buffer if entry[0] > last_seq]
+
+    records = db.session.query(EventLog).filter(EventLog.room == room).filter(EventLog.seq > last_seq).filter(EventLog.seq <= current_seq).order_by(EventLog.seq).all()
+    if len(records) != current_seq - last_seq:
+        return current_seq, None
+    return current_seq, [(record.seq, record.event, json.loads(record.payload)) for record in records]
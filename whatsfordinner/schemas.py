@@ -0,0 +1,143 @@
+from flask_marshmallow import base_fields
+
+from whatsfordinner.extensions import ma
+from whatsfordinner.instrumentation import TimedSchema
+from whatsfordinner.shoppinglist_progress import get_shoppinglist_progress
+
+# Marshmallow Schemas
+class ShoppingingredientSchema(TimedSchema):
+    class Meta:
+        fields = ("id", "name", "amount", "unit", "category", "obtained", "multiplier", "meal_name", "shoppinglist_id", "ingredient_id")
+
+shoppingingredient_schema = ShoppingingredientSchema()
+multiple_shoppingingredient_schema = ShoppingingredientSchema(many=True)
+
+class ShoppinglistSchema(TimedSchema):
+    class Meta:
+        fields = ("id", "name", "created_on", "updates_hidden", "is_sublist", "user_username", "user_id", "mealplan_id", "shoppingingredients", "progress")
+    shoppingingredients = ma.Nested(multiple_shoppingingredient_schema)
+    progress = base_fields.Function(lambda fields: get_shoppinglist_progress(fields.progress))
+
+shoppinglist_schema = ShoppinglistSchema(exclude=("progress",))
+multiple_shoppinglist_schema = ShoppinglistSchema(many=True, exclude=("progress",))
+shoppinglist_summary_schema = ShoppinglistSchema(exclude=("shoppingingredients",))
+multiple_shoppinglist_summary_schema = ShoppinglistSchema(many=True, exclude=("shoppingingredients",))
+shoppinglist_header_schema = ShoppinglistSchema(exclude=("shoppingingredients", "progress"))
+
+class RuleSchema(TimedSchema):
+    class Meta:
+        fields = ("id", "rule_type", "rule", "amount", "value", "mealplan_id", "mealplanoutline_id")
+
+rule_schema = RuleSchema()
+multiple_rule_schema = RuleSchema(many=True)
+
+class MealplanoutlineSchema(TimedSchema):
+    class Meta:
+        fields = ("id", "name", "number", "user_id", "rules")
+    rules = ma.Nested(multiple_rule_schema)
+
+mealplanoutline_schema = MealplanoutlineSchema()
+multiple_mealplanoutline_schema = MealplanoutlineSchema(many=True)
+
+class IngredientSchema(TimedSchema):
+    class Meta:
+        fields = ("id", "name", "amount", "unit", "category", "recipe_id", "shoppingingredients", "ingredientsection_id")
+    shoppingingredients = ma.Nested(multiple_shoppingingredient_schema)
+
+ingredient_schema = IngredientSchema()
+multiple_ingredient_schema = IngredientSchema(many=True)
+
+class IngredientsectionSchema(TimedSchema):
+    class Meta:
+        fields = ("id", "title", "recipe_id", "ingredients")
+    ingredients = ma.Nested(multiple_ingredient_schema)
+
+ingredientsection_schema = IngredientsectionSchema()
+multiple_ingredientsection_schema = IngredientsectionSchema(many=True)
+
+class StepSchema(TimedSchema):
+    class Meta:
+        fields = ("id", "number", "text", "recipe_id", "stepsection_id")
+
+step_schema = StepSchema()
+multiple_step_schema = StepSchema(many=True)
+
+class StepsectionSchema(TimedSchema):
+    class Meta:
+        fields = ("id", "title", "recipe_id", "steps")
+    steps = ma.Nested(multiple_step_schema)
+
+stepsection_schema = StepsectionSchema()
+multiple_stepsection_schema = StepsectionSchema(many=True)
+
+class RecipeSchema(TimedSchema):
+    class Meta:
+        fields = ("id", "meal_id", "stepsections", "steps", "ingredientsections", "ingredients")
+    stepsections = ma.Nested(multiple_stepsection_schema)
+    steps = ma.Nested(multiple_step_schema)
+    ingredientsections = ma.Nested(multiple_ingredientsection_schema)
+    ingredients = ma.Nested(multiple_ingredient_schema)
+
+recipe_schema = RecipeSchema()
+multiple_recipe_schema = RecipeSchema(many=True)
+
+class CategorySchema(TimedSchema):
+    class Meta:
+        fields = ("id", "name", "user_id")
+
+category_schema = CategorySchema()
+multiple_category_schema = CategorySchema(many=True)
+
+class MealSchema(TimedSchema):
+    class Meta:
+        fields = ("id", "name", "description", "image_url", "difficulty", "sleep_until", "last_planned_at", "times_planned", "categories", "user_username", "owner_username", "user_id", "recipe")
+    categories = ma.Nested(multiple_category_schema)
+    recipe = base_fields.Function(lambda fields: recipe_schema.dump(fields.recipe[0] if len(fields.recipe) > 0 else None))
+
+meal_schema = MealSchema()
+multiple_meal_schema = MealSchema(many=True)
+
+class MealplanSchema(TimedSchema):
+    class Meta:
+        fields = ("id", "name", "created_on", "meals", "rules", "user_username", "user_id", "shoppinglist", "sub_shoppinglist")
+    meals = ma.Nested(multiple_meal_schema)
+    rules = ma.Nested(multiple_rule_schema)
+    shoppinglist = base_fields.Function(lambda fields: shoppinglist_schema.dump(list(filter(lambda shoppinglist: not shoppinglist.is_sublist, fields.shoppinglists))[0] if len(fields.shoppinglists) > 0 else None))
+    sub_shoppinglist = base_fields.Function(lambda fields: shoppinglist_schema.dump(list(filter(lambda shoppinglist: shoppinglist.is_sublist, fields.shoppinglists))[0] if len(fields.shoppinglists) > 1 else None))
+
+mealplan_schema = MealplanSchema()
+multiple_mealplan_schema = MealplanSchema(many=True)
+
+class NotificationSchema(TimedSchema):
+    class Meta:
+        fields = ("id", "category", "username", "name", "user_id")
+
+notification_schema = NotificationSchema()
+multiple_notification_schema = NotificationSchema(many=True)
+
+class SettingsSchema(TimedSchema):
+    class Meta:
+        fields = ("id", "default_mealplan_outline", "autodelete_mealplans", "autodelete_mealplans_schedule_number", "autodelete_mealplans_schedule_unit", "default_shoppinglist_sort", "autodelete_shoppinglists", "autodelete_shoppinglists_schedule_number", "autodelete_shoppinglists_schedule_unit", "allow_notifications", "allow_nonfriend_sharing", "shoppinglist_aisle_order", "user_id")
+
+settings_schema = SettingsSchema()
+multiple_settings_schema = SettingsSchema(many=True)
+
+class UserSchema(TimedSchema):
+    class Meta:
+        fields = ("id", "username", "email", "meals", "categories", "mealplans", "mealplanoutlines", "shoppinglists", "notifications", "settings", "shared_meals", "shared_mealplans", "shared_shoppinglists", "outgoing_friend_requests", "incoming_friend_requests", "friends")
+    meals = ma.Nested(multiple_meal_schema)
+    categories = ma.Nested(multiple_category_schema)
+    mealplans = ma.Nested(multiple_mealplan_schema)
+    mealplanoutlines = ma.Nested(multiple_mealplanoutline_schema)
+    shoppinglists = ma.Nested(multiple_shoppinglist_schema)
+    notifications = ma.Nested(multiple_notification_schema)
+    settings = base_fields.Function(lambda fields: settings_schema.dump(fields.settings[0]))
+    shared_meals = ma.Nested(multiple_meal_schema)
+    shared_mealplans = ma.Nested(multiple_mealplan_schema)
+    shared_shoppinglists = ma.Nested(multiple_shoppinglist_schema)
+    outgoing_friend_requests = base_fields.Function(lambda fields: list(map(lambda friend: { "user_id": friend.id, "username": friend.username }, fields.outgoing_friend_requests)))
+    incoming_friend_requests = base_fields.Function(lambda fields: list(map(lambda friend: { "user_id": friend.id, "username": friend.username }, fields.incoming_friend_requests)))
+    friends = base_fields.Function(lambda fields: list(map(lambda friend: { "user_id": friend.id, "username": friend.username }, fields.friends)))
+
+user_schema = UserSchema()
+multiple_user_schema = UserSchema(many=True)
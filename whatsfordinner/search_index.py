@@ -0,0 +1,73 @@
+import re
+
+# Same relative weights Postgres uses for ts_rank's A/B/C/D labels.
+WEIGHTS = {
+    "A": 1.0,
+    "B": 0.4,
+    "C": 0.2,
+    "D": 0.1
+}
+
+TOKEN_PATTERN = re.compile(r"[^\W_]+", re.UNICODE)
+STOP_WORDS = {"a", "an", "and", "the", "of", "to", "in", "with", "for", "on", "or", "at", "by"}
+
+
+def normalize_token(token):
+    token = token.lower()
+    if len(token) > 4 and token.endswith("ies"):
+        return token[:-3] + "y"
+    if len(token) > 3 and token.endswith("es") and token[-3] in "sxz":
+        return token[:-2]
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def tokenize(text):
+    return [normalize_token(token) for token in TOKEN_PATTERN.findall(text or "") if token.lower() not in STOP_WORDS]
+
+
+# In-process stand-in for the Postgres tsvector index, used when the database
+# has no full-text search. Documents are {weight label: text} per meal and a
+# meal matches when it contains every query term.
+class InvertedIndex:
+    def __init__(self):
+        self.postings = {}
+        self.documents = {}
+
+    def set_document(self, meal_id, fields):
+        self.remove(meal_id)
+        scores = {}
+        for weight, text in fields.items():
+            for token in tokenize(text):
+                scores[token] = scores.get(token, 0) + WEIGHTS[weight]
+        self.documents[meal_id] = scores
+        for token, score in scores.items():
+            self.postings.setdefault(token, {})[meal_id] = score
+
+    def remove(self, meal_id):
+        scores = self.documents.pop(meal_id, None)
+        if scores is None:
+            return
+        for token in scores:
+            postings = self.postings.get(token)
+            if postings is not None:
+                postings.pop(meal_id, None)
+                if len(postings) == 0:
+                    del self.postings[token]
+
+    def search(self, query, allowed_ids=None):
+        terms = list(dict.fromkeys(tokenize(query)))
+        if len(terms) == 0:
+            return []
+
+        term_postings = sorted((self.postings.get(term, {}) for term in terms), key=len)
+        matches = set(term_postings[0])
+        for postings in term_postings[1:]:
+            matches &= postings.keys()
+        if allowed_ids is not None:
+            matches &= allowed_ids
+
+        results = [(meal_id, sum(postings[meal_id] for postings in term_postings)) for meal_id in matches]
+        results.sort(key=lambda result: (-result[1], result[0]))
+        return results
@@ -0,0 +1,91 @@
+from flask.cli import with_appcontext
+import click
+
+from whatsfordinner.extensions import db
+from whatsfordinner.models import Shoppinglist, Shoppingingredient, ShoppinglistProgress
+
+# Shoppinglist Progress
+# shoppinglist_progress keeps total/obtained counts per list and category so
+# list overviews can show progress without loading every shoppingingredient.
+# Counts are adjusted inside the same transaction as the write: ORM changes
+# through the after_flush listener below, the hot shoppinglist bulk UPDATE and
+# autodelete explicitly. `flask rebuild-shoppinglist-progress` recounts them.
+SHOPPINGLIST_PROGRESS_UPSERT = db.text("""
+    INSERT INTO shoppinglist_progress (shoppinglist_id, category, total, obtained)
+    VALUES (:shoppinglist_id, :category, :total, :obtained)
+    ON CONFLICT (shoppinglist_id, category) DO UPDATE SET
+        total = shoppinglist_progress.total + excluded.total,
+        obtained = shoppinglist_progress.obtained + excluded.obtained
+""")
+
+def add_progress_delta(deltas, shoppinglist_id, category, total, obtained):
+    if shoppinglist_id is None:
+        return
+    delta = deltas.setdefault((shoppinglist_id, category or ""), [0, 0])
+    delta[0] += total
+    delta[1] += obtained
+
+def apply_progress_deltas(connection, deltas):
+    values = [{
+        "shoppinglist_id": shoppinglist_id,
+        "category": category,
+        "total": total,
+        "obtained": obtained
+    } for (shoppinglist_id, category), (total, obtained) in deltas.items() if total != 0 or obtained != 0]
+    if len(values) > 0:
+        connection.execute(SHOPPINGLIST_PROGRESS_UPSERT, values)
+
+def get_committed_value(record, attribute):
+    history = db.inspect(record).attrs[attribute].history
+    if history.deleted:
+        return history.deleted[0]
+    if history.added and not history.unchanged:
+        return None
+    return getattr(record, attribute)
+
+@db.event.listens_for(db.session, "after_flush")
+def track_shoppinglist_progress(session, flush_context):
+    deltas = {}
+    for record in session.new:
+        if isinstance(record, Shoppingingredient):
+            add_progress_delta(deltas, record.shoppinglist_id, record.category, 1, 1 if record.obtained else 0)
+    for record in session.deleted:
+        if isinstance(record, Shoppingingredient):
+            add_progress_delta(deltas, get_committed_value(record, "shoppinglist_id"), get_committed_value(record, "category"), -1, -1 if get_committed_value(record, "obtained") else 0)
+    for record in session.dirty:
+        if isinstance(record, Shoppingingredient) and session.is_modified(record):
+            old = (get_committed_value(record, "shoppinglist_id"), get_committed_value(record, "category"), bool(get_committed_value(record, "obtained")))
+            new = (record.shoppinglist_id, record.category, bool(record.obtained))
+            if old != new:
+                add_progress_delta(deltas, old[0], old[1], -1, -1 if old[2] else 0)
+                add_progress_delta(deltas, new[0], new[1], 1, 1 if new[2] else 0)
+
+    deleted_shoppinglists = set(record.id for record in session.deleted if isinstance(record, Shoppinglist))
+    deltas = {key: delta for key, delta in deltas.items() if key[0] not in deleted_shoppinglists}
+    if len(deltas) > 0:
+        apply_progress_deltas(session.connection(), deltas)
+
+def get_shoppinglist_progress(rows):
+    progress = {
+        "total": 0,
+        "obtained": 0,
+        "categories": {}
+    }
+    for row in rows:
+        if row.total <= 0:
+            continue
+        progress["total"] += row.total
+        progress["obtained"] += row.obtained
+        progress["categories"][row.category] = {
+            "total": row.total,
+            "obtained": row.obtained
+        }
+    return progress
+
+@click.command("rebuild-shoppinglist-progress")
+@with_appcontext
+def rebuild_shoppinglist_progress():
+    db.session.query(ShoppinglistProgress).delete(synchronize_session=False)
+    rows = db.session.query(Shoppingingredient.shoppinglist_id, db.func.coalesce(Shoppingingredient.category, ""), db.func.count(), db.func.sum(db.case((Shoppingingredient.obtained == True, 1), else_=0))).group_by(Shoppingingredient.shoppinglist_id, db.func.coalesce(Shoppingingredient.category, "")).all()
+    apply_progress_deltas(db.session.connection(), {(shoppinglist_id, category): [total, obtained] for shoppinglist_id, category, total, obtained in rows})
+    db.session.commit()
@@ -0,0 +1,207 @@
+from flask import request
+from flask_socketio import join_room
+
+from whatsfordinner.extensions import db
+from whatsfordinner.models import Shoppingingredient
+from whatsfordinner.schemas import shoppingingredient_schema
+from whatsfordinner.realtime import BROADCAST_ROOM, get_socketio, MSGPACK_ROOM, msgpack_sids, send_event, connected_sids, start_backpressure_monitor, remove_backpressure_state, get_event_seq, get_missed_events
+from whatsfordinner.hot_shoppinglists import toggle_hot_shoppingingredient, is_hot_toggle
+from whatsfordinner.auth import check_authorization
+from whatsfordinner.blueprints.shoppinglists import update_shoppingingredient_record, delete_shoppingingredient_record
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# Socket.IO Events
+# Only imported by create_app when Socket.IO is enabled, so serverless
+# deployments never load flask_socketio.
+authorized_sids = set()
+
+def socket_connect(auth=None):
+    if not isinstance(auth, dict):
+        auth = {}
+
+    connected_sids.add(request.sid)
+    start_backpressure_monitor()
+
+    if check_authorization(auth) or check_authorization(request.authorization):
+        authorized_sids.add(request.sid)
+
+    serializer = auth.get("serializer") or request.args.get("serializer")
+    if serializer == "msgpack" and msgpack is not None:
+        msgpack_sids.add(request.sid)
+        join_room(MSGPACK_ROOM)
+    else:
+        serializer = "json"
+
+    get_socketio().emit("connection-settings", {
+        "data": {
+            "serializer": serializer
+        }
+    }, to=request.sid)
+
+def socket_disconnect(*args):
+    authorized_sids.discard(request.sid)
+    msgpack_sids.discard(request.sid)
+    remove_backpressure_state(request.sid)
+
+def get_socket_shoppingingredient(data):
+    if request.sid not in authorized_sids:
+        return None, {
+            "status": 403,
+            "message": "Unauthorized",
+            "data": {}
+        }
+    if not isinstance(data, dict):
+        return None, {
+            "status": 400,
+            "message": "Error: Data must be sent as JSON.",
+            "data": {}
+        }
+    if data.get("obtained") is not None and not isinstance(data.get("obtained"), bool):
+        return None, {
+            "status": 400,
+            "message": "Error: Obtained must be true or false.",
+            "data": {}
+        }
+
+    record = db.session.query(Shoppingingredient).filter(Shoppingingredient.id == data.get("id")).first()
+    if record is None:
+        return None, {
+            "status": 400,
+            "message": "Error: Shoppingingredient does not exist.",
+            "data": {}
+        }
+    return record, None
+
+# A client can resume the broadcast room or a room its connection has joined.
+def resume_event(data):
+    if request.sid not in authorized_sids:
+        return {
+            "status": 403,
+            "message": "Unauthorized",
+            "data": {}
+        }
+    if not isinstance(data, dict):
+        return {
+            "status": 400,
+            "message": "Error: Data must be sent as JSON.",
+            "data": {}
+        }
+
+    room = data.get("room") or BROADCAST_ROOM
+    if not isinstance(room, str) or (room != BROADCAST_ROOM and room not in get_socketio().server.rooms(request.sid)):
+        return {
+            "status": 400,
+            "message": "Error: Room does not exist.",
+            "data": {}
+        }
+
+    last_seq = data.get("last_seq")
+    if last_seq is None:
+        return {
+            "status": 200,
+            "message": "Event Log Position",
+            "data": {
+                "room": room,
+                "seq": get_event_seq(room),
+                "replayed": 0,
+                "resync": False
+            }
+        }
+    try:
+        last_seq = int(last_seq)
+    except (TypeError, ValueError):
+        return {
+            "status": 400,
+            "message": "Error: last_seq must be a number.",
+            "data": {}
+        }
+
+    current_seq, events = get_missed_events(room, last_seq)
+    if events is None:
+        return {
+            "status": 200,
+            "message": "Resync Required",
+            "data": {
+                "room": room,
+                "seq": current_seq,
+                "replayed": 0,
+                "resync": True
+            }
+        }
+
+    for seq, event, payload in events:
+        send_event(event, payload, request.sid)
+
+    return {
+        "status": 200,
+        "message": "Events Replayed",
+        "data": {
+            "room": room,
+            "seq": current_seq,
+            "replayed": len(events),
+            "resync": False
+        }
+    }
+
+def toggle_shoppingingredient_event(data):
+    if request.sid in authorized_sids and is_hot_toggle(data):
+        item = toggle_hot_shoppingingredient(data.get("id"), data.get("obtained"))
+        if item is not None:
+            return {
+                "status": 200,
+                "message": "Shoppingingredient Updated",
+                "data": item
+            }
+
+    record, error = get_socket_shoppingingredient(data)
+    if error is not None:
+        return error
+
+    obtained = data.get("obtained")
+    update_shoppingingredient_record(record, {
+        "obtained": not record.obtained if obtained is None else obtained
+    })
+
+    return {
+        "status": 200,
+        "message": "Shoppingingredient Updated",
+        "data": shoppingingredient_schema.dump(record)
+    }
+
+def update_shoppingingredient_event(data):
+    record, error = get_socket_shoppingingredient(data)
+    if error is not None:
+        return error
+
+    update_shoppingingredient_record(record, data)
+
+    return {
+        "status": 200,
+        "message": "Shoppingingredient Updated",
+        "data": shoppingingredient_schema.dump(record)
+    }
+
+def delete_shoppingingredient_event(data):
+    record, error = get_socket_shoppingingredient(data)
+    if error is not None:
+        return error
+
+    delete_shoppingingredient_record(record)
+
+    return {
+        "status": 200,
+        "message": "Shoppingingredient Deleted",
+        "data": shoppingingredient_schema.dump(record)
+    }
+
+def register_socket_events(socketio):
+    socketio.on_event("connect", socket_connect)
+    socketio.on_event("disconnect", socket_disconnect)
+    socketio.on_event("resume", resume_event)
+    socketio.on_event("shoppingingredient:toggle", toggle_shoppingingredient_event)
+    socketio.on_event("shoppingingredient:update", update_shoppingingredient_event)
+    socketio.on_event("shoppingingredient:delete", delete_shoppingingredient_event)